@@ -0,0 +1,7 @@
+# Aufruf als python3 -m Klassenpakete (siehe kommandozeile.py)
+
+import sys
+
+from Klassenpakete.kommandozeile import main
+
+sys.exit(main())
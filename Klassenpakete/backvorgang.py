@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from datetime import datetime
+from functools import cached_property
 from typing import Any
 
 
@@ -41,13 +43,28 @@ def _normalize_number(value: float) -> int | float:
     return round(float(value), 3)
 
 
-def _merge_extra(result: dict[str, Any], extra_fields: dict[str, Any]) -> None:
+def _json_kopie(value: Any) -> Any:
+    # Freie JSON-Strukturen entkoppeln, damit Objekte keine Rohdaten (z. B. aus dem Cache) teilen
+    if isinstance(value, dict):
+        return {key: _json_kopie(eintrag) for key, eintrag in value.items()}
+    if isinstance(value, list):
+        return [_json_kopie(eintrag) for eintrag in value]
+    return value
+
+
+def _text_or_none(value: Any) -> str | None:
+    return str(value) if isinstance(value, str) else None
+
+
+def _merge_extra(result: dict[str, Any], extra_fields: dict[str, Any] | None) -> None:
+    if not extra_fields:
+        return
     for key, value in extra_fields.items():
         if key not in result:
             result[key] = value
 
 
-@dataclass
+@dataclass(slots=True)
 class RezeptSnapshot:
     name: str = ""
     hydration_percent: float | None = None
@@ -66,7 +83,7 @@ class RezeptSnapshot:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class BackZiel:
     loaf_count: int = 1
     target_dough_weight_g: float = 0.0
@@ -85,26 +102,27 @@ class BackZiel:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ZutatenVerbrauch:
     mehl_id: str
     planned_g: float = 0.0
     actual_g: float = 0.0
     stock_deducted_g: float = 0.0
-    extra_fields: dict[str, Any] = field(default_factory=dict)
+    # Unbekannte JSON-Schlüssel; None solange es keine gibt (spart ein dict je Objekt)
+    extra_fields: dict[str, Any] | None = None
 
     @classmethod
     def from_dict(cls, daten: dict[str, Any]) -> "ZutatenVerbrauch":
         known_keys = {"mehl_id", "planned_g", "actual_g", "stock_deducted_g"}
-        extra_fields = {k: v for k, v in daten.items() if k not in known_keys}
+        extra_fields = {k: _json_kopie(v) for k, v in daten.items() if k not in known_keys}
 
-        mehl_id_roh = daten.get("mehl_id", daten.get("ingredient_id", ""))
+        # Früheres "ingredient_id" stellt die Migration (schema_version 2) um
         return cls(
-            mehl_id=str(mehl_id_roh).strip(),
+            mehl_id=str(daten.get("mehl_id", "")).strip(),
             planned_g=_to_float(daten.get("planned_g", 0)),
             actual_g=_to_float(daten.get("actual_g", 0)),
             stock_deducted_g=_to_float(daten.get("stock_deducted_g", 0)),
-            extra_fields=extra_fields,
+            extra_fields=extra_fields or None,
         )
 
     def to_dict(self) -> dict[str, Any]:
@@ -118,7 +136,7 @@ class ZutatenVerbrauch:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class SchrittDurchlauf:
     key: str
     planned_duration_min: int
@@ -128,7 +146,7 @@ class SchrittDurchlauf:
     avg_temp_c: float | None = None
     note: str = ""
     label: str | None = None
-    extra_fields: dict[str, Any] = field(default_factory=dict)
+    extra_fields: dict[str, Any] | None = None
 
     @classmethod
     def from_dict(cls, daten: dict[str, Any]) -> "SchrittDurchlauf":
@@ -142,7 +160,7 @@ class SchrittDurchlauf:
             "avg_temp_c",
             "note",
         }
-        extra_fields = {k: v for k, v in daten.items() if k not in known_keys}
+        extra_fields = {k: _json_kopie(v) for k, v in daten.items() if k not in known_keys}
 
         return cls(
             key=str(daten.get("key", "")).strip(),
@@ -165,7 +183,7 @@ class SchrittDurchlauf:
             ),
             avg_temp_c=_to_float_or_none(daten.get("avg_temp_c")),
             note=str(daten.get("note", "")).strip(),
-            extra_fields=extra_fields,
+            extra_fields=extra_fields or None,
         )
 
     def to_dict(self) -> dict[str, Any]:
@@ -178,26 +196,26 @@ class SchrittDurchlauf:
             "avg_temp_c": self.avg_temp_c,
             "note": self.note,
         }
-        if self.label is not None or "label" in self.extra_fields:
+        if self.label is not None or "label" in (self.extra_fields or {}):
             result["label"] = self.label
 
         _merge_extra(result, self.extra_fields)
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class BackErgebnis:
     rating: int | None = None
     crumb: str = ""
     crust: str = ""
     volume: str = ""
     taste_note: str = ""
-    extra_fields: dict[str, Any] = field(default_factory=dict)
+    extra_fields: dict[str, Any] | None = None
 
     @classmethod
     def from_dict(cls, daten: dict[str, Any]) -> "BackErgebnis":
         known_keys = {"rating", "crumb", "crust", "volume", "taste_note"}
-        extra_fields = {k: v for k, v in daten.items() if k not in known_keys}
+        extra_fields = {k: _json_kopie(v) for k, v in daten.items() if k not in known_keys}
 
         rating = _to_int(daten.get("rating")) if daten.get("rating") is not None else None
         return cls(
@@ -206,7 +224,7 @@ class BackErgebnis:
             crust=str(daten.get("crust", "")).strip(),
             volume=str(daten.get("volume", "")).strip(),
             taste_note=str(daten.get("taste_note", "")).strip(),
-            extra_fields=extra_fields,
+            extra_fields=extra_fields or None,
         )
 
     def to_dict(self) -> dict[str, Any]:
@@ -221,7 +239,7 @@ class BackErgebnis:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class Backvorgang:
     id: str
     recipe_id: str
@@ -243,7 +261,7 @@ class Backvorgang:
     custom: dict[str, Any] = field(default_factory=dict)
     created_at: str | None = None
     updated_at: str | None = None
-    extra_fields: dict[str, Any] = field(default_factory=dict)
+    extra_fields: dict[str, Any] | None = None
 
     @classmethod
     def from_dict(cls, daten: dict[str, Any]) -> "Backvorgang":
@@ -269,7 +287,7 @@ class Backvorgang:
             "created_at",
             "updated_at",
         }
-        extra_fields = {k: v for k, v in daten.items() if k not in known_keys}
+        extra_fields = {k: _json_kopie(v) for k, v in daten.items() if k not in known_keys}
 
         return cls(
             id=str(daten.get("id", "")).strip(),
@@ -278,8 +296,8 @@ class Backvorgang:
             recipe_snapshot=RezeptSnapshot.from_dict(_as_dict(daten.get("recipe_snapshot"))),
             status=str(daten.get("status", "planned")).strip() or "planned",
             planned_bake_date=str(daten.get("planned_bake_date", "")).strip(),
-            started_at=str(daten.get("started_at")) if isinstance(daten.get("started_at"), str) else None,
-            ended_at=str(daten.get("ended_at")) if isinstance(daten.get("ended_at"), str) else None,
+            started_at=_text_or_none(daten.get("started_at")),
+            ended_at=_text_or_none(daten.get("ended_at")),
             scale_factor=_to_float(daten.get("scale_factor", 1.0), 1.0),
             target=BackZiel.from_dict(_as_dict(daten.get("target"))),
             ingredient_usage=[
@@ -293,18 +311,18 @@ class Backvorgang:
                 if isinstance(eintrag, dict)
             ],
             measurements=[
-                eintrag
+                _json_kopie(eintrag)
                 for eintrag in _as_list(daten.get("measurements"))
                 if isinstance(eintrag, dict)
             ],
             outcome=BackErgebnis.from_dict(_as_dict(daten.get("outcome"))),
             issues=[str(issue) for issue in _as_list(daten.get("issues"))],
             notes=str(daten.get("notes", "")).strip(),
-            attachments=list(_as_list(daten.get("attachments"))),
-            custom=_as_dict(daten.get("custom")),
-            created_at=str(daten.get("created_at")) if isinstance(daten.get("created_at"), str) else None,
-            updated_at=str(daten.get("updated_at")) if isinstance(daten.get("updated_at"), str) else None,
-            extra_fields=extra_fields,
+            attachments=_json_kopie(_as_list(daten.get("attachments"))),
+            custom=_json_kopie(_as_dict(daten.get("custom"))),
+            created_at=_text_or_none(daten.get("created_at")),
+            updated_at=_text_or_none(daten.get("updated_at")),
+            extra_fields=extra_fields or None,
         )
 
     def to_dict(self) -> dict[str, Any]:
@@ -333,3 +351,242 @@ class Backvorgang:
 
         _merge_extra(result, self.extra_fields)
         return result
+
+    def anzahl_offene_schritte(self) -> int:
+        return sum(
+            1
+            for schritt in self.step_runs
+            if schritt.actual_end_at is None and schritt.actual_duration_min is None
+        )
+
+
+class BackvorgangAnsicht:
+    """
+    Schreibgeschützte Sicht auf einen gespeicherten Backvorgang für Listen.
+
+    Hält nur die Rohdaten; einfache Felder werden beim Zugriff gelesen,
+    verschachtelte Objekte erst beim ersten Zugriff erzeugt.
+    Zum Bearbeiten vollstaendig() bzw. das Repository verwenden.
+    """
+
+    def __init__(self, daten: dict[str, Any]) -> None:
+        # Rohdaten werden nicht kopiert (z. B. aus dem Cache) und dürfen nicht verändert werden
+        self._daten: dict[str, Any] = daten
+
+    @classmethod
+    def from_dict(cls, daten: dict[str, Any]) -> "BackvorgangAnsicht":
+        return cls(daten)
+
+    def to_dict(self) -> dict[str, Any]:
+        # Gleiche Normalisierung wie beim vollständigen Objekt
+        return self.vollstaendig().to_dict()
+
+    def vollstaendig(self) -> Backvorgang:
+        return Backvorgang.from_dict(self._daten)
+
+    @property
+    def id(self) -> str:
+        return str(self._daten.get("id", "")).strip()
+
+    @property
+    def recipe_id(self) -> str:
+        return str(self._daten.get("recipe_id", "")).strip()
+
+    @property
+    def status(self) -> str:
+        return str(self._daten.get("status", "planned")).strip() or "planned"
+
+    @property
+    def planned_bake_date(self) -> str:
+        return str(self._daten.get("planned_bake_date", "")).strip()
+
+    @property
+    def started_at(self) -> str | None:
+        return _text_or_none(self._daten.get("started_at"))
+
+    @property
+    def ended_at(self) -> str | None:
+        return _text_or_none(self._daten.get("ended_at"))
+
+    @property
+    def created_at(self) -> str | None:
+        return _text_or_none(self._daten.get("created_at"))
+
+    @property
+    def updated_at(self) -> str | None:
+        return _text_or_none(self._daten.get("updated_at"))
+
+    @cached_property
+    def recipe_snapshot(self) -> RezeptSnapshot:
+        return RezeptSnapshot.from_dict(_as_dict(self._daten.get("recipe_snapshot")))
+
+    @cached_property
+    def target(self) -> BackZiel:
+        return BackZiel.from_dict(_as_dict(self._daten.get("target")))
+
+    @cached_property
+    def ingredient_usage(self) -> list[ZutatenVerbrauch]:
+        return [
+            ZutatenVerbrauch.from_dict(eintrag)
+            for eintrag in _as_list(self._daten.get("ingredient_usage"))
+            if isinstance(eintrag, dict)
+        ]
+
+    @cached_property
+    def step_runs(self) -> list[SchrittDurchlauf]:
+        return [
+            SchrittDurchlauf.from_dict(eintrag)
+            for eintrag in _as_list(self._daten.get("step_runs"))
+            if isinstance(eintrag, dict)
+        ]
+
+    @cached_property
+    def outcome(self) -> BackErgebnis:
+        return BackErgebnis.from_dict(_as_dict(self._daten.get("outcome")))
+
+    def anzahl_schritte(self) -> int:
+        return sum(
+            1 for eintrag in _as_list(self._daten.get("step_runs")) if isinstance(eintrag, dict)
+        )
+
+    def anzahl_offene_schritte(self) -> int:
+        # Direkt auf den Rohdaten, ohne SchrittDurchlauf-Objekte zu erzeugen
+        return sum(
+            1
+            for eintrag in _as_list(self._daten.get("step_runs"))
+            if isinstance(eintrag, dict)
+            and _text_or_none(eintrag.get("actual_end_at")) is None
+            and eintrag.get("actual_duration_min") is None
+        )
+
+
+def backvorgang_monat(daten: dict[str, Any]) -> str:
+    """
+    Shard (Monat "JJJJ-MM") eines gespeicherten Backvorgangs: aus created_at,
+    sonst aus der id (bv_JJJJ_MM_TT_NNN) oder dem geplanten Backdatum.
+    """
+    erstellt = _text_or_none(daten.get("created_at")) or ""
+    if len(erstellt) >= 7 and erstellt[:4].isdigit() and erstellt[5:7].isdigit():
+        return f"{erstellt[:4]}-{erstellt[5:7]}"
+
+    teile = str(daten.get("id", "")).split("_")
+    if len(teile) >= 3 and teile[1].isdigit() and teile[2].isdigit():
+        return f"{teile[1]}-{teile[2]}"
+
+    geplant = str(daten.get("planned_bake_date", ""))
+    if len(geplant) >= 7 and geplant[:4].isdigit() and geplant[5:7].isdigit():
+        return f"{geplant[:4]}-{geplant[5:7]}"
+    return "ohne_datum"
+
+
+# Beendete Backvorgänge; alle anderen (planned, running, paused) bleiben in den aktiven Shards
+ABGESCHLOSSENE_STATUS: tuple[str, ...] = ("completed", "aborted")
+
+
+def backvorgang_archivierbar(eintrag: BackvorgangIndexEintrag, grenze: datetime) -> bool:
+    """
+    True für beendete Backvorgänge, deren Ende (ohne ended_at: created_at)
+    vor der Grenze liegt. grenze muss eine Zeitzone haben.
+    """
+    if eintrag.status not in ABGESCHLOSSENE_STATUS:
+        return False
+    text = eintrag.ended_at or eintrag.created_at
+    if not text:
+        return False
+    try:
+        zeitpunkt = datetime.fromisoformat(text)
+    except ValueError:
+        return False
+    if zeitpunkt.tzinfo is None:
+        zeitpunkt = zeitpunkt.astimezone()
+    return zeitpunkt < grenze
+
+
+@dataclass(slots=True)
+class BackvorgangIndexEintrag:
+    """
+    Eintrag im Manifest der Backhistorie: alles, was Übersichtslisten brauchen,
+    ohne den Backvorgang selbst zu lesen. revision steigt mit jeder Änderung.
+    """
+
+    id: str
+    shard: str = ""
+    revision: int = 0
+    status: str = "planned"
+    recipe_id: str = ""
+    recipe_name: str = ""
+    created_at: str | None = None
+    planned_bake_date: str = ""
+    started_at: str | None = None
+    ended_at: str | None = None
+    rating: int | None = None
+    schritte: int = 0
+    offene_schritte: int = 0
+
+    @classmethod
+    def aus_eintrag(
+        cls, daten: dict[str, Any], shard: str = "", revision: int = 0
+    ) -> "BackvorgangIndexEintrag":
+        return cls.aus_ansicht(BackvorgangAnsicht(daten), shard, revision)
+
+    @classmethod
+    def aus_ansicht(
+        cls, ansicht: BackvorgangAnsicht, shard: str = "", revision: int = 0
+    ) -> "BackvorgangIndexEintrag":
+        return cls(
+            id=ansicht.id,
+            shard=shard,
+            revision=revision,
+            status=ansicht.status,
+            recipe_id=ansicht.recipe_id,
+            recipe_name=ansicht.recipe_snapshot.name,
+            created_at=ansicht.created_at,
+            planned_bake_date=ansicht.planned_bake_date,
+            started_at=ansicht.started_at,
+            ended_at=ansicht.ended_at,
+            rating=ansicht.outcome.rating,
+            schritte=ansicht.anzahl_schritte(),
+            offene_schritte=ansicht.anzahl_offene_schritte(),
+        )
+
+    @classmethod
+    def from_dict(cls, daten: dict[str, Any]) -> "BackvorgangIndexEintrag":
+        rating = daten.get("rating")
+        return cls(
+            id=str(daten.get("id", "")),
+            shard=str(daten.get("shard", "")),
+            revision=_to_int(daten.get("revision", 0)),
+            status=str(daten.get("status", "planned")),
+            recipe_id=str(daten.get("recipe_id", "")),
+            recipe_name=str(daten.get("recipe_name", "")),
+            created_at=_text_or_none(daten.get("created_at")),
+            planned_bake_date=str(daten.get("planned_bake_date", "")),
+            started_at=_text_or_none(daten.get("started_at")),
+            ended_at=_text_or_none(daten.get("ended_at")),
+            rating=_to_int(rating) if rating is not None else None,
+            schritte=_to_int(daten.get("schritte", 0)),
+            offene_schritte=_to_int(daten.get("offene_schritte", 0)),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "shard": self.shard,
+            "revision": self.revision,
+            "status": self.status,
+            "recipe_id": self.recipe_id,
+            "recipe_name": self.recipe_name,
+            "created_at": self.created_at,
+            "planned_bake_date": self.planned_bake_date,
+            "started_at": self.started_at,
+            "ended_at": self.ended_at,
+            "rating": self.rating,
+            "schritte": self.schritte,
+            "offene_schritte": self.offene_schritte,
+        }
+
+    def anzahl_schritte(self) -> int:
+        return self.schritte
+
+    def anzahl_offene_schritte(self) -> int:
+        return self.offene_schritte
@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import re
-import time
 from datetime import datetime
 
 from rich.console import Group
@@ -9,17 +7,22 @@ from rich.panel import Panel
 from rich.table import Table
 
 from Klassenpakete.backvorgang import (
-    BackErgebnis,
     Backvorgang,
-    BackZiel,
-    RezeptSnapshot,
+    BackvorgangIndexEintrag,
     SchrittDurchlauf,
     ZutatenVerbrauch,
 )
 from Klassenpakete.brot_rezept import BrotRezept
-from Klassenpakete.json_manager import JsonManager
-from Klassenpakete.mehl import Mehl
 from Klassenpakete.menu import Menu
+from Klassenpakete.repository import (
+    BackvorgangRepository,
+    RezeptRepository,
+    backvorgang_repository,
+    rezept_repository,
+)
+from Klassenpakete.schritt_timer import SchrittTimer
+from Klassenpakete.services import BackvorgangService, RezeptService
+from Klassenpakete.timer_planer import LaufenderTimer, TimerPlaner
 from Klassenpakete.ui_layout import (
     HIGHLIGHT_STYLE,
     MAX_ZEILEN_KOMPAKT,
@@ -38,18 +41,26 @@ class BackvorgangMenu:
     - Rezept waehlen
     - Backvorgang anlegen
     - Gefuehrtes Schritt-Tracking optional durchlaufen
+    - Mehrere Backvorgaenge parallel mit gemeinsamer Timer-Uebersicht verfolgen
     """
 
     def __init__(self) -> None:
         self.menuePunkte: list[str] = [
             "Neuen Backvorgang anlegen",
             "Laufenden oder pausierten Backvorgang fortsetzen",
+            "Mehrere Backvorgaenge parallel verfolgen",
             "Zurueck",
         ]
         self.menu: Menu = Menu(menuePunkte=self.menuePunkte)
-        self.rezeptManager: JsonManager = JsonManager("daten/brote.json")
-        self.backvorgangManager: JsonManager = JsonManager("daten/backvorgaenge.json")
-        self.mehlManager: JsonManager = JsonManager("daten/mehle.json")
+        self.rezeptRepository: RezeptRepository = rezept_repository()
+        self.backvorgangRepository: BackvorgangRepository = backvorgang_repository()
+        self.rezeptService: RezeptService = RezeptService(self.rezeptRepository)
+        self.backvorgangService: BackvorgangService = BackvorgangService(
+            self.backvorgangRepository,
+            rezeptService=self.rezeptService,
+        )
+        # Erst beim Oeffnen der Timer-Uebersicht laden (liest daten/timer.json)
+        self.timerPlaner: TimerPlaner | None = None
 
     def starten(self, navigation, renderer) -> None:
         self.renderer = renderer
@@ -72,15 +83,13 @@ class BackvorgangMenu:
                 ausgewaehlterPunkt == "Laufenden oder pausierten Backvorgang fortsetzen"
             ):
                 self.laufenden_backvorgang_fortsetzen(navigation)
+            elif ausgewaehlterPunkt == "Mehrere Backvorgaenge parallel verfolgen":
+                self.parallele_backvorgaenge_verfolgen(navigation)
             elif ausgewaehlterPunkt == "Zurueck":
                 return
 
     def neuen_backvorgang_anlegen(self, navigation) -> None:
-        rezepte: list[BrotRezept] = [
-            rezept
-            for rezept in self.rezeptManager.laden(BrotRezept)
-            if rezept.status != "archived"
-        ]
+        rezepte: list[BrotRezept] = self.rezeptService.aktive_rezepte()
 
         if not rezepte:
             with self.renderer.suspended():
@@ -99,13 +108,14 @@ class BackvorgangMenu:
             datum_eingabe = input(f"Geplantes Backdatum [{datum_default}]: ").strip()
         planned_bake_date = datum_eingabe or datum_default
 
-        bestehende_backvorgaenge = self.backvorgangManager.laden(Backvorgang)
-        neuer_backvorgang = self._baue_backvorgang(
+        neuer_backvorgang = self.backvorgangService.baue_backvorgang(
             rezept=rezept,
             scale_factor=scale_factor,
             planned_bake_date=planned_bake_date,
-            bestehende_backvorgaenge=bestehende_backvorgaenge,
         )
+        zeitstempel = self._jetzt_iso()
+        neuer_backvorgang.created_at = zeitstempel
+        neuer_backvorgang.updated_at = zeitstempel
 
         with self.renderer.suspended():
             zutaten_bearbeiten = (
@@ -126,12 +136,7 @@ class BackvorgangMenu:
         if tracking_starten in ("", "j", "ja", "y", "yes"):
             self._fuehre_schritt_tracking_durch(neuer_backvorgang)
 
-        zeitstempel = self._jetzt_iso()
-        neuer_backvorgang.created_at = zeitstempel
-        neuer_backvorgang.updated_at = zeitstempel
-
-        bestehende_backvorgaenge.append(neuer_backvorgang)
-        self.backvorgangManager.speichern(bestehende_backvorgaenge)
+        self.backvorgangService.speichern(neuer_backvorgang)
 
         with self.renderer.suspended():
             print("\nBackvorgang gespeichert.")
@@ -140,12 +145,12 @@ class BackvorgangMenu:
             input("ENTER druecken, um zurueckzukehren...")
 
     def laufenden_backvorgang_fortsetzen(self, navigation) -> None:
-        backvorgaenge = self.backvorgangManager.laden(Backvorgang)
         laufende = [
             eintrag
-            for eintrag in backvorgaenge
-            if eintrag.status in ("running", "paused", "planned")
-            and len(eintrag.step_runs) > 0
+            for eintrag in self.backvorgangRepository.uebersicht(
+                "running", "paused", "planned"
+            )
+            if eintrag.anzahl_schritte() > 0
         ]
 
         if not laufende:
@@ -180,10 +185,13 @@ class BackvorgangMenu:
 
         auswahl = self.renderer.render_loop(render, navigation, input_handler)
 
-        if not isinstance(auswahl, Backvorgang):
+        if not isinstance(auswahl, BackvorgangIndexEintrag):
             return
 
-        backvorgang = auswahl
+        # Erst jetzt den bearbeitbaren Backvorgang aus dem Repository holen
+        backvorgang = self.backvorgangRepository.get(auswahl.id)
+        if backvorgang is None:
+            return
         with self.renderer.suspended():
             zutaten_bearbeiten = (
                 input("Zutaten fuer diesen Backvorgang bearbeiten? (j/n) [n]: ")
@@ -194,8 +202,7 @@ class BackvorgangMenu:
             self._zutaten_editor_starten(backvorgang)
 
         self._fuehre_schritt_tracking_durch(backvorgang)
-        backvorgang.updated_at = self._jetzt_iso()
-        self.backvorgangManager.speichern(backvorgaenge)
+        self.backvorgangService.speichern(backvorgang)
 
         with self.renderer.suspended():
             print("\nBackvorgang aktualisiert.")
@@ -203,9 +210,245 @@ class BackvorgangMenu:
             print(f"Status: {backvorgang.status}")
             input("ENTER druecken, um zurueckzukehren...")
 
+    def parallele_backvorgaenge_verfolgen(self, navigation) -> None:
+        """
+        Gemeinsame Timer-Uebersicht fuer alle laufenden Backvorgaenge. Faellige
+        Schritte loesen die Glocke aus; gewartet wird blockierend bis zur
+        naechsten sichtbaren Aenderung oder Taste.
+        """
+        if self.timerPlaner is None:
+            self.timerPlaner = TimerPlaner()
+        planer = self.timerPlaner
+        self._gleiche_timer_ab(planer)
+
+        aktueller_index = 0
+        hinweis = ""
+        angezeigt: tuple | None = None
+
+        with navigation.eingabe_sitzung():
+            while True:
+                for timer in planer.faellige():
+                    self.renderer.console.bell()
+                    hinweis = f"Faellig: {timer.label}"
+
+                timer_liste = planer.alle()
+                if timer_liste:
+                    aktueller_index = min(aktueller_index, len(timer_liste) - 1)
+                anzeige = (
+                    tuple((timer.id, planer.restsekunden(timer)) for timer in timer_liste),
+                    aktueller_index,
+                    hinweis,
+                )
+                if anzeige != angezeigt:
+                    self.renderer.update(
+                        self._baue_timer_uebersicht(
+                            planer, timer_liste, aktueller_index, hinweis
+                        )
+                    )
+                    angezeigt = anzeige
+
+                wartezeit = planer.sekunden_bis_zum_naechsten_ereignis()
+                if wartezeit is None:
+                    taste = navigation.lese_taste()
+                else:
+                    taste = navigation.lese_taste_mit_timeout(wartezeit)
+                if taste is None:
+                    continue
+
+                if taste in ("BACK", "ESC"):
+                    return
+                if taste == "UP" and timer_liste:
+                    aktueller_index = (aktueller_index - 1) % len(timer_liste)
+                elif taste == "DOWN" and timer_liste:
+                    aktueller_index = (aktueller_index + 1) % len(timer_liste)
+                elif taste == "n":
+                    self._parallel_schritt_starten(planer, navigation)
+                    angezeigt = None
+                elif taste == "ENTER" and timer_liste:
+                    self._parallel_schritt_abschliessen(planer, timer_liste[aktueller_index])
+                    hinweis = ""
+                    angezeigt = None
+                elif taste == "p" and timer_liste:
+                    self._parallel_pausieren(planer, timer_liste[aktueller_index])
+                    angezeigt = None
+
+    def _gleiche_timer_ab(self, planer: TimerPlaner) -> None:
+        laufende = [
+            self.backvorgangRepository.get(eintrag.id)
+            for eintrag in self.backvorgangRepository.uebersicht("running")
+        ]
+        planer.abgleichen([backvorgang for backvorgang in laufende if backvorgang])
+
+    def _parallel_schritt_starten(self, planer: TimerPlaner, navigation) -> None:
+        mit_timer = {timer.backvorgang_id for timer in planer.alle()}
+        kandidaten = [
+            eintrag
+            for eintrag in self.backvorgangRepository.uebersicht(
+                "running", "paused", "planned"
+            )
+            if eintrag.anzahl_offene_schritte() > 0 and eintrag.id not in mit_timer
+        ]
+        if not kandidaten:
+            with self.renderer.suspended():
+                print("\nKein weiterer Backvorgang mit offenen Schritten.")
+                input("ENTER druecken, um zurueckzukehren...")
+            return
+
+        eintraege = [
+            f"{eintrag.recipe_name or eintrag.recipe_id} | {eintrag.id} | "
+            f"{eintrag.status}"
+            for eintrag in kandidaten
+        ]
+        auswahl = Menu(eintraege).anzeigen(navigation, self.renderer)
+        if not isinstance(auswahl, int):
+            return
+
+        backvorgang = self.backvorgangRepository.get(kandidaten[auswahl].id)
+        if backvorgang is None:
+            return
+        self._starte_geplanten_schritt(planer, backvorgang)
+
+    def _starte_geplanten_schritt(
+        self, planer: TimerPlaner, backvorgang: Backvorgang
+    ) -> None:
+        schritt = self.backvorgangService.finde_schritt(backvorgang)
+        if schritt is None:
+            return
+        self.backvorgangService.starte_schritt(backvorgang, schritt)
+        # Start sofort sichern, damit der Timer einen Neustart uebersteht
+        self.backvorgangService.speichern(backvorgang)
+        planer.planen(backvorgang, schritt)
+
+    def _parallel_schritt_abschliessen(
+        self, planer: TimerPlaner, timer: LaufenderTimer
+    ) -> None:
+        backvorgang = self.backvorgangRepository.get(timer.backvorgang_id)
+        schritt = (
+            self.backvorgangService.finde_schritt(backvorgang, timer.schritt_key)
+            if backvorgang is not None
+            else None
+        )
+        if backvorgang is None or schritt is None:
+            planer.entfernen(timer.id)
+            return
+
+        with self.renderer.suspended():
+            print(f"\n{timer.label}")
+            temp_roh = input("Durchschnittstemperatur in C (optional): ").strip()
+            note = input("Notiz zu diesem Schritt (optional): ").strip()
+
+        self.backvorgangService.schliesse_schritt_ab(
+            backvorgang,
+            schritt,
+            avg_temp_c=self._parse_float_oder_none(temp_roh),
+            note=note,
+        )
+        self.backvorgangService.speichern(backvorgang)
+        planer.entfernen(timer.id)
+
+        naechster = self.backvorgangService.finde_schritt(backvorgang)
+        if naechster is not None:
+            with self.renderer.suspended():
+                weiter = (
+                    input(
+                        f"Naechsten Schritt '{naechster.label or naechster.key}' "
+                        "jetzt starten? (j/n) [j]: "
+                    )
+                    .strip()
+                    .lower()
+                )
+            if weiter in ("", "j", "ja", "y", "yes"):
+                self._starte_geplanten_schritt(planer, backvorgang)
+            return
+
+        with self.renderer.suspended():
+            abschliessen = (
+                input(
+                    "Keine offenen Schritte mehr. Backvorgang als completed abschliessen? (j/n) [j]: "
+                )
+                .strip()
+                .lower()
+            )
+        if abschliessen in ("", "j", "ja", "y", "yes"):
+            self._finalisiere_backvorgang(backvorgang)
+            self.backvorgangService.speichern(backvorgang)
+
+    def _parallel_pausieren(self, planer: TimerPlaner, timer: LaufenderTimer) -> None:
+        backvorgang = self.backvorgangRepository.get(timer.backvorgang_id)
+        if backvorgang is not None:
+            self.backvorgangService.pausieren(backvorgang)
+            self.backvorgangService.speichern(backvorgang)
+        planer.entfernen(timer.id)
+
+    def _baue_timer_uebersicht(
+        self,
+        planer: TimerPlaner,
+        timer_liste: list[LaufenderTimer],
+        highlight_index: int,
+        hinweis: str,
+    ) -> Group:
+        tabelle = baue_standard_tabelle(
+            titel=f"Parallele Backvorgaenge | {len(timer_liste)} Timer",
+            caption=(
+                "↑ ↓ Auswahl | ENTER Schritt beenden | n Schritt starten | "
+                "p pausieren | BACK Zurueck"
+            ),
+        )
+        tabelle.add_column("Nr.", style="bold cyan", justify="right", width=4)
+        tabelle.add_column(
+            "Backvorgang | Schritt",
+            style="bold white",
+            no_wrap=True,
+            overflow="ellipsis",
+            max_width=36,
+        )
+        tabelle.add_column("Restzeit", style="yellow", justify="right", width=9)
+        tabelle.add_column("Status", style="magenta", no_wrap=True, width=10)
+
+        if not timer_liste:
+            tabelle.add_row("-", "Keine laufenden Schritte (n = starten)", "-", "-")
+
+        fenster, hat_oben, hat_unten = sichtfenster_indizes(
+            anzahl_zeilen=len(timer_liste),
+            aktiver_index=highlight_index,
+            max_zeilen=MAX_ZEILEN_STANDARD,
+        )
+        if hat_oben:
+            tabelle.add_row("...", "...", "...", "...", style="dim")
+
+        for index in fenster:
+            timer = timer_liste[index]
+            rest = planer.restsekunden(timer)
+            stunden, minuten = divmod(rest // 60, 60)
+            status = (
+                "[bold red]faellig[/bold red]" if rest <= 0 else "[green]laeuft[/green]"
+            )
+            tabelle.add_row(
+                str(index + 1),
+                kuerze_text(timer.label, 36),
+                f"{stunden:d}:{minuten:02d}:{rest % 60:02d}",
+                status,
+                style=HIGHLIGHT_STYLE if index == highlight_index else "",
+            )
+
+        if hat_unten:
+            tabelle.add_row("...", "...", "...", "...", style="dim")
+
+        naechster = planer.naechster()
+        text = hinweis or (
+            f"Als Naechstes: {naechster.label}" if naechster is not None else "Kein Alarm offen."
+        )
+        footer = Panel(
+            text,
+            title="[bold bright_white]Timer-Status[/bold bright_white]",
+            border_style="red" if hinweis else "green",
+            width=TERMINAL_ZIEL_BREITE,
+        )
+        return Group(tabelle, footer)
+
     def _baue_fortsetzen_tabelle(
         self,
-        backvorgaenge: list[Backvorgang],
+        backvorgaenge: list[BackvorgangIndexEintrag],
         highlight_index: int | None = None,
     ) -> Table:
         tabelle = baue_standard_tabelle(
@@ -264,7 +507,7 @@ class BackvorgangMenu:
 
         for index in sichtbare:
             eintrag = backvorgaenge[index]
-            rezept_name = eintrag.recipe_snapshot.name or eintrag.recipe_id
+            rezept_name = eintrag.recipe_name or eintrag.recipe_id
             start = eintrag.started_at or "-"
             row_style = HIGHLIGHT_STYLE if highlight_index == index else ""
             tabelle.add_row(
@@ -317,108 +560,6 @@ class BackvorgangMenu:
 
         return wert
 
-    def _baue_backvorgang(
-        self,
-        rezept: BrotRezept,
-        scale_factor: float,
-        planned_bake_date: str,
-        bestehende_backvorgaenge: list[Backvorgang],
-    ) -> Backvorgang:
-        ingredient_usage: list[ZutatenVerbrauch] = [
-            ZutatenVerbrauch(
-                mehl_id=anteil.mehl_id,
-                planned_g=round(anteil.amount_g * scale_factor, 3),
-                actual_g=0.0,
-                stock_deducted_g=0.0,
-            )
-            for anteil in rezept.formula.flours
-        ]
-        gesamt_mehl_g = self._berechne_gesamt_mehlmenge_g(rezept, scale_factor)
-        wasser_aus_hydration_g = self._berechne_wasser_aus_hydration_g(
-            rezept,
-            scale_factor,
-            gesamt_mehl_g,
-        )
-        if wasser_aus_hydration_g > 0:
-            ingredient_usage.append(
-                ZutatenVerbrauch(
-                    mehl_id="wasser",
-                    planned_g=wasser_aus_hydration_g,
-                    actual_g=0.0,
-                    stock_deducted_g=0.0,
-                )
-            )
-
-        step_runs: list[SchrittDurchlauf] = [
-            SchrittDurchlauf(
-                key=schritt.key,
-                label=schritt.label,
-                planned_duration_min=schritt.duration_min,
-                actual_start_at=None,
-                actual_end_at=None,
-                actual_duration_min=None,
-                avg_temp_c=None,
-                note="",
-            )
-            for schritt in rezept.process_template
-        ]
-
-        loaf_count = max(
-            1, int(round(rezept.yield_data.loaf_count_default * scale_factor))
-        )
-        zielgewicht = round(rezept.yield_data.target_dough_weight_g * scale_factor, 3)
-
-        return Backvorgang(
-            id=self._generiere_backvorgang_id(bestehende_backvorgaenge),
-            recipe_id=rezept.id,
-            recipe_version=rezept.version,
-            recipe_snapshot=RezeptSnapshot(
-                name=rezept.name,
-                hydration_percent=rezept.targets.hydration_percent,
-            ),
-            status="planned",
-            planned_bake_date=planned_bake_date,
-            started_at=None,
-            ended_at=None,
-            scale_factor=scale_factor,
-            target=BackZiel(loaf_count=loaf_count, target_dough_weight_g=zielgewicht),
-            ingredient_usage=ingredient_usage,
-            step_runs=step_runs,
-            measurements=[],
-            outcome=BackErgebnis(),
-            issues=[],
-            notes="",
-            attachments=[],
-            custom={
-                "hydration_percent_used": rezept.targets.hydration_percent,
-                "flour_total_planned_g": gesamt_mehl_g,
-                "hydration_water_planned_g": wasser_aus_hydration_g,
-            },
-        )
-
-    def _berechne_gesamt_mehlmenge_g(
-        self,
-        rezept: BrotRezept,
-        scale_factor: float,
-    ) -> float:
-        return round(
-            sum(max(0.0, anteil.amount_g) * scale_factor for anteil in rezept.formula.flours),
-            3,
-        )
-
-    def _berechne_wasser_aus_hydration_g(
-        self,
-        rezept: BrotRezept,
-        scale_factor: float,
-        gesamt_mehl_g: float,
-    ) -> float:
-        hydration = rezept.targets.hydration_percent
-        if hydration > 0 and gesamt_mehl_g > 0:
-            return round(gesamt_mehl_g * (hydration / 100.0), 3)
-
-        # Fallback fuer Rezepte ohne valide Hydration
-        return round(max(0.0, rezept.formula.water_g) * scale_factor, 3)
-
     def _fuehre_schritt_tracking_durch(self, backvorgang: Backvorgang) -> None:
         if not backvorgang.step_runs:
             with self.renderer.suspended():
@@ -436,11 +577,7 @@ class BackvorgangMenu:
         if hilfe_anzeigen in ("", "j", "ja", "y", "yes"):
             self._zeige_rezept_uebersicht(backvorgang, rezept)
 
-        offene_schritte = [
-            schritt
-            for schritt in backvorgang.step_runs
-            if schritt.actual_end_at is None and schritt.actual_duration_min is None
-        ]
+        offene_schritte = self.backvorgangService.offene_schritte(backvorgang)
 
         if not offene_schritte:
             with self.renderer.suspended():
@@ -456,7 +593,12 @@ class BackvorgangMenu:
             return
 
         for index, schritt in enumerate(offene_schritte, start=1):
-            while True:
+            # Nach Absturz oder Neustart laeuft der Schritt schon: Timer ab
+            # actual_start_at fortsetzen statt neu zu starten
+            laeuft_bereits = (
+                backvorgang.status == "running" and schritt.actual_start_at is not None
+            )
+            while not laeuft_bereits:
                 with self.renderer.suspended():
                     print("\n" + "-" * 60)
                     print(f"\nSchritt {index}/{len(offene_schritte)}")
@@ -471,21 +613,24 @@ class BackvorgangMenu:
                     break
 
                 if aktion == "p":
-                    if backvorgang.started_at is not None:
-                        backvorgang.status = "paused"
-                    else:
-                        backvorgang.status = "planned"
+                    self.backvorgangService.pausieren(backvorgang)
                     return
 
                 with self.renderer.suspended():
                     print("Ungueltige Eingabe. Bitte nur ENTER oder p verwenden.")
                     input("ENTER fuer erneute Eingabe...")
 
-            start_dt = datetime.now().astimezone()
-            if backvorgang.started_at is None:
-                backvorgang.started_at = start_dt.isoformat(timespec="seconds")
-            backvorgang.status = "running"
-            schritt.actual_start_at = start_dt.isoformat(timespec="seconds")
+            if laeuft_bereits:
+                with self.renderer.suspended():
+                    print("\n" + "-" * 60)
+                    print(f"\nSchritt {index}/{len(offene_schritte)}")
+                    print(f"{schritt.label or schritt.key} ({schritt.key})")
+                    print(f"Laeuft seit {schritt.actual_start_at}, Timer wird fortgesetzt.")
+                    input("ENTER fuer den Timer...")
+            else:
+                self.backvorgangService.starte_schritt(backvorgang, schritt)
+                # Start sofort sichern, sonst ist er nach einem Absturz verloren
+                self.backvorgangService.speichern(backvorgang)
 
             with self.renderer.suspended():
                 self.renderer.console.clear()
@@ -501,18 +646,21 @@ class BackvorgangMenu:
                 return
 
             ende_dt = datetime.now().astimezone()
-            schritt.actual_end_at = ende_dt.isoformat(timespec="seconds")
-
-            dauer_min = int(round((ende_dt - start_dt).total_seconds() / 60))
-            schritt.actual_duration_min = max(1, dauer_min)
 
             with self.renderer.suspended():
                 temp_roh = input("Durchschnittstemperatur in C (optional): ").strip()
                 note = input("Notiz zu diesem Schritt (optional): ").strip()
 
-            schritt.avg_temp_c = self._parse_float_oder_none(temp_roh)
-            if note:
-                schritt.note = note
+            self.backvorgangService.schliesse_schritt_ab(
+                backvorgang,
+                schritt,
+                ende=ende_dt,
+                avg_temp_c=self._parse_float_oder_none(temp_roh),
+                note=note,
+            )
+
+            # Jeden abgeschlossenen Schritt sofort sichern (im Journal nur die Aenderung)
+            self.backvorgangService.speichern(backvorgang)
 
         self._finalisiere_backvorgang(backvorgang)
 
@@ -672,7 +820,7 @@ class BackvorgangMenu:
                 aktion = input("Auswahl: ").strip().lower()
 
             if aktion in ("q", ""):
-                self._synchronisiere_custom_nach_zutaten_aenderung(backvorgang)
+                self.backvorgangService.synchronisiere_zutaten_summen(backvorgang)
                 return
             if aktion == "a":
                 self._zutat_hinzufuegen(backvorgang)
@@ -681,7 +829,7 @@ class BackvorgangMenu:
             elif aktion == "d":
                 self._zutat_loeschen(backvorgang)
             elif aktion == "s":
-                self._setze_ist_auf_soll(backvorgang)
+                self.backvorgangService.uebernehme_soll_als_ist(backvorgang)
 
     def _baue_zutaten_editor_tabelle(
         self,
@@ -734,23 +882,12 @@ class BackvorgangMenu:
         if not mehl_id:
             return
 
-        planned = self._parse_float_oder_none(planned_roh)
-        actual = self._parse_float_oder_none(actual_roh)
-        stock = self._parse_float_oder_none(stock_roh)
-
-        planned_g = round(max(0.0, planned if planned is not None else 0.0), 3)
-        actual_g = round(max(0.0, actual if actual is not None else 0.0), 3)
-        stock_deducted_g = (
-            round(max(0.0, stock), 3) if stock is not None else round(actual_g, 3)
-        )
-
-        backvorgang.ingredient_usage.append(
-            ZutatenVerbrauch(
-                mehl_id=mehl_id,
-                planned_g=planned_g,
-                actual_g=actual_g,
-                stock_deducted_g=stock_deducted_g,
-            )
+        self.backvorgangService.zutat_hinzufuegen(
+            backvorgang,
+            mehl_id,
+            planned_g=self._parse_float_oder_none(planned_roh),
+            actual_g=self._parse_float_oder_none(actual_roh),
+            stock_deducted_g=self._parse_float_oder_none(stock_roh),
         )
 
     def _zutat_bearbeiten(self, backvorgang: Backvorgang) -> None:
@@ -771,20 +908,13 @@ class BackvorgangMenu:
             actual_roh = input(f"Ist g [{eintrag.actual_g}]: ").strip()
             stock_roh = input(f"Abzug g [{eintrag.stock_deducted_g}]: ").strip()
 
-        if mehl_id:
-            eintrag.mehl_id = mehl_id
-
-        planned = self._parse_float_oder_none(planned_roh)
-        if planned is not None:
-            eintrag.planned_g = round(max(0.0, planned), 3)
-
-        actual = self._parse_float_oder_none(actual_roh)
-        if actual is not None:
-            eintrag.actual_g = round(max(0.0, actual), 3)
-
-        stock = self._parse_float_oder_none(stock_roh)
-        if stock is not None:
-            eintrag.stock_deducted_g = round(max(0.0, stock), 3)
+        self.backvorgangService.zutat_aendern(
+            eintrag,
+            mehl_id=mehl_id,
+            planned_g=self._parse_float_oder_none(planned_roh),
+            actual_g=self._parse_float_oder_none(actual_roh),
+            stock_deducted_g=self._parse_float_oder_none(stock_roh),
+        )
 
     def _zutat_loeschen(self, backvorgang: Backvorgang) -> None:
         if not backvorgang.ingredient_usage:
@@ -794,30 +924,8 @@ class BackvorgangMenu:
             index_roh = input("Zutat-Nr. zum Loeschen: ").strip()
 
         index = self._parse_int_oder_none(index_roh)
-        if index is None or not (1 <= index <= len(backvorgang.ingredient_usage)):
-            return
-
-        del backvorgang.ingredient_usage[index - 1]
-
-    def _setze_ist_auf_soll(self, backvorgang: Backvorgang) -> None:
-        for eintrag in backvorgang.ingredient_usage:
-            eintrag.actual_g = round(max(0.0, eintrag.planned_g), 3)
-            eintrag.stock_deducted_g = round(max(0.0, eintrag.actual_g), 3)
-
-    def _synchronisiere_custom_nach_zutaten_aenderung(
-        self, backvorgang: Backvorgang
-    ) -> None:
-        flour_total = round(
-            sum(
-                max(0.0, eintrag.planned_g)
-                for eintrag in backvorgang.ingredient_usage
-                if (eintrag.mehl_id or "").lower() != "wasser"
-            ),
-            3,
-        )
-        water = round(self._geplante_wassermenge_g(backvorgang), 3)
-        backvorgang.custom["flour_total_planned_g"] = flour_total
-        backvorgang.custom["hydration_water_planned_g"] = water
+        if index is not None:
+            self.backvorgangService.zutat_entfernen(backvorgang, index)
 
     def _aktive_schritt_position(
         self, schritte: list[SchrittDurchlauf], aktiver_key: str | None
@@ -840,32 +948,8 @@ class BackvorgangMenu:
             max_zeilen=max_rows,
         )
 
-    def _geplante_wassermenge_g(self, backvorgang: Backvorgang) -> float:
-        for eintrag in backvorgang.ingredient_usage:
-            if (eintrag.mehl_id or "").lower() == "wasser":
-                return round(max(0.0, eintrag.planned_g), 3)
-
-        # Fallback fuer Altbestaende, falls Wasser noch nicht als Zutat gepflegt wurde
-        wasser_custom = backvorgang.custom.get("hydration_water_planned_g")
-        if isinstance(wasser_custom, (int, float)):
-            return round(max(0.0, float(wasser_custom)), 3)
-
-        hydration = backvorgang.recipe_snapshot.hydration_percent
-        mehl_summe = sum(
-            max(0.0, eintrag.planned_g)
-            for eintrag in backvorgang.ingredient_usage
-            if (eintrag.mehl_id or "").lower() != "wasser"
-        )
-        if hydration is not None and hydration > 0 and mehl_summe > 0:
-            return round(mehl_summe * (hydration / 100.0), 3)
-        return 0.0
-
     def _hole_rezept(self, rezept_id: str) -> BrotRezept | None:
-        rezepte = self.rezeptManager.laden(BrotRezept)
-        for rezept in rezepte:
-            if rezept.id == rezept_id:
-                return rezept
-        return None
+        return self.rezeptService.hole(rezept_id)
 
     def _zeige_rezept_uebersicht(
         self, backvorgang: Backvorgang, rezept: BrotRezept | None
@@ -877,7 +961,7 @@ class BackvorgangMenu:
                 if backvorgang.recipe_snapshot.hydration_percent is not None
                 else "-"
             )
-            wasser_text = f"{self._geplante_wassermenge_g(backvorgang):.1f}g"
+            wasser_text = f"{self.backvorgangService.geplante_wassermenge_g(backvorgang):.1f}g"
             summary = Panel(
                 (
                     f"[bold]Rezept:[/bold] {kuerze_text(titel, 42)}\n"
@@ -1053,17 +1137,9 @@ class BackvorgangMenu:
         if bestaetigung not in ("j", "ja", "y", "yes"):
             return False
 
-        if backvorgang.started_at is not None:
-            backvorgang.ended_at = self._jetzt_iso()
-        backvorgang.status = "aborted"
-
         with self.renderer.suspended():
             notiz = input("Abbruchgrund (optional): ").strip()
-        if notiz:
-            if backvorgang.notes:
-                backvorgang.notes += f"\nAbbruch: {notiz}"
-            else:
-                backvorgang.notes = f"Abbruch: {notiz}"
+        self.backvorgangService.abbrechen(backvorgang, grund=notiz)
 
         return True
 
@@ -1114,48 +1190,59 @@ class BackvorgangMenu:
                 print("Kein Timer gestartet (geplante Dauer <= 0).")
             return "completed"
 
-        endzeit = time.monotonic() + int(schritt.planned_duration_min * 60)
-        alarm_gesendet = False
+        # Restzeit aus der Wanduhr: nach einem Neustart laeuft der Timer ab
+        # actual_start_at weiter
+        timer = SchrittTimer(
+            schritt.planned_duration_min * 60,
+            bereits_vergangen_sekunden=self.backvorgangService.vergangene_sekunden(schritt),
+        )
 
-        while True:
-            rest = max(0, int(round(endzeit - time.monotonic())))
-            timer_fertig = rest <= 0
+        # Die Tabelle aendert sich waehrend des Timers nicht: einmal bauen und
+        # nur neu zeichnen, wenn sich die angezeigte Sekunde aendert
+        tracking_tabelle = self._baue_tracking_checkpoint_tabelle(
+            backvorgang=backvorgang,
+            aktiver_schritt_key=schritt.key,
+            rezept=rezept,
+        )
+        angezeigt: int | None = None
 
-            tracking_tabelle = self._baue_tracking_checkpoint_tabelle(
-                backvorgang=backvorgang,
-                aktiver_schritt_key=schritt.key,
-                rezept=rezept,
-            )
-            footer = self._baue_timer_footer_panel(
-                schritt=schritt,
-                schritt_index=schritt_index,
-                schritt_gesamt=schritt_gesamt,
-                verbleibende_sekunden=rest,
-                timer_fertig=timer_fertig,
-            )
-            self.renderer.update(Group(tracking_tabelle, footer))
+        # Eine Eingabe-Sitzung fuer den ganzen Timer statt Moduswechsel je Sekunde
+        with self.navigation.eingabe_sitzung():
+            while True:
+                rest = timer.restsekunden()
+                timer_fertig = rest <= 0
+
+                if rest != angezeigt:
+                    footer = self._baue_timer_footer_panel(
+                        schritt=schritt,
+                        schritt_index=schritt_index,
+                        schritt_gesamt=schritt_gesamt,
+                        verbleibende_sekunden=rest,
+                        timer_fertig=timer_fertig,
+                    )
+                    self.renderer.update(Group(tracking_tabelle, footer))
+                    angezeigt = rest
 
-            if timer_fertig and not alarm_gesendet:
-                self.renderer.console.bell()
-                alarm_gesendet = True
-                return "completed"
+                if timer_fertig:
+                    self.renderer.console.bell()
+                    return "completed"
 
-            taste = self.navigation.lese_taste_mit_timeout(0.25)
-            if taste is None:
-                continue
+                # Blockiert bis zur naechsten Sekunde oder bis eine Taste kommt
+                taste = self.navigation.lese_taste_mit_timeout(
+                    timer.sekunden_bis_zur_naechsten_anzeige()
+                )
+                if taste is None:
+                    continue
 
-            if taste == "ENTER":
-                return "completed"
+                if taste == "ENTER":
+                    return "completed"
 
-            if taste == "p":
-                backvorgang.status = "paused"
-                return "paused"
+                if taste == "p":
+                    self.backvorgangService.pausieren(backvorgang)
+                    return "paused"
 
     def _finalisiere_backvorgang(self, backvorgang: Backvorgang) -> None:
-        backvorgang.status = "completed"
-        if backvorgang.started_at is None:
-            backvorgang.started_at = self._jetzt_iso()
-        backvorgang.ended_at = self._jetzt_iso()
+        self.backvorgangService.markiere_abgeschlossen(backvorgang)
 
         self._erfasse_ingredient_usage(backvorgang)
         self._erfasse_outcome(backvorgang)
@@ -1175,9 +1262,7 @@ class BackvorgangMenu:
             )
 
         if uebernehmen in ("", "j", "ja", "y", "yes"):
-            for eintrag in backvorgang.ingredient_usage:
-                eintrag.actual_g = round(eintrag.planned_g, 3)
-                eintrag.stock_deducted_g = round(eintrag.actual_g, 3)
+            self.backvorgangService.uebernehme_soll_als_ist(backvorgang)
             return
 
         for eintrag in backvorgang.ingredient_usage:
@@ -1187,15 +1272,9 @@ class BackvorgangMenu:
                     f"Ist-Verbrauch fuer {eintrag.mehl_id} in g [{default}]: "
                 ).strip()
 
-            if roh:
-                wert = self._parse_float_oder_none(roh)
-                eintrag.actual_g = (
-                    round(wert, 3) if wert is not None else round(eintrag.planned_g, 3)
-                )
-            else:
-                eintrag.actual_g = round(eintrag.planned_g, 3)
-
-            eintrag.stock_deducted_g = round(eintrag.actual_g, 3)
+            self.backvorgangService.setze_ist_verbrauch(
+                eintrag, self._parse_float_oder_none(roh)
+            )
 
     def _erfasse_outcome(self, backvorgang: Backvorgang) -> None:
         with self.renderer.suspended():
@@ -1207,100 +1286,45 @@ class BackvorgangMenu:
             taste_note = input("Geschmacksnotiz: ").strip()
             notes = input("Notizen zum Backvorgang: ").strip()
 
-        if rating_roh.isdigit():
-            rating_int = int(rating_roh)
-            if 1 <= rating_int <= 5:
-                backvorgang.outcome.rating = rating_int
-
-        if crumb:
-            backvorgang.outcome.crumb = crumb
-        if crust:
-            backvorgang.outcome.crust = crust
-        if volume:
-            backvorgang.outcome.volume = volume
-        if taste_note:
-            backvorgang.outcome.taste_note = taste_note
-        if notes:
-            backvorgang.notes = notes
+        rating = self._parse_int_oder_none(rating_roh)
+        self.backvorgangService.erfasse_ergebnis(
+            backvorgang,
+            # Bewertungen ausserhalb von 1-5 werden wie bisher ignoriert
+            rating=rating if rating is not None and 1 <= rating <= 5 else None,
+            crumb=crumb,
+            crust=crust,
+            volume=volume,
+            taste_note=taste_note,
+            notes=notes,
+        )
 
     def _ziehe_mehlbestand_ab(self, backvorgang: Backvorgang) -> None:
-        if backvorgang.custom.get("stock_deducted") is True:
-            with self.renderer.suspended():
-                print("\nMehlbestand wurde fuer diesen Backvorgang bereits abgebucht.")
-            return
-
-        mehle = self.mehlManager.laden(Mehl)
-        mehle_index = {mehl.id: mehl for mehl in mehle if mehl.id}
-
-        aenderungen: list[str] = []
-        fehlende_ids: list[str] = []
-
-        for eintrag in backvorgang.ingredient_usage:
-            mehl = mehle_index.get(eintrag.mehl_id)
-            if mehl is None:
-                if eintrag.mehl_id and eintrag.mehl_id not in ("wasser",):
-                    fehlende_ids.append(eintrag.mehl_id)
-                continue
-
-            zielmenge = (
-                eintrag.stock_deducted_g
-                if eintrag.stock_deducted_g > 0
-                else eintrag.actual_g
-            )
-            abzuziehen = int(round(max(0.0, zielmenge)))
-            if abzuziehen <= 0:
-                continue
-
-            alt = mehl.vorhandenGramm
-            neu = max(0, alt - abzuziehen)
-            mehl.vorhandenGramm = neu
-            mehl.vorhanden = neu > 0
-            aenderungen.append(f"- {mehl.id}: {alt}g -> {neu}g (-{abzuziehen}g)")
-
-        if aenderungen:
-            self.mehlManager.speichern(mehle)
-            backvorgang.custom["stock_deducted"] = True
-            backvorgang.custom["stock_deducted_at"] = self._jetzt_iso()
-        else:
-            backvorgang.custom["stock_deducted"] = False
-
-        if fehlende_ids:
-            backvorgang.custom["stock_missing_ids"] = sorted(set(fehlende_ids))
+        abbuchung = self.backvorgangService.ziehe_bestand_ab(backvorgang)
 
         with self.renderer.suspended():
-            if aenderungen:
+            if abbuchung.bereits_abgebucht:
+                print("\nMehlbestand wurde fuer diesen Backvorgang bereits abgebucht.")
+                return
+
+            if abbuchung.aenderungen:
                 print("\nMehlbestand aktualisiert:")
-                for zeile in aenderungen:
-                    print(zeile)
+                for aenderung in abbuchung.aenderungen:
+                    print(
+                        f"- {aenderung.mehl_id}: {aenderung.alt_g}g -> "
+                        f"{aenderung.neu_g}g (-{aenderung.abgezogen_g}g)"
+                    )
             else:
                 print("\nKeine Mehl-Abbuchung notwendig.")
 
-            if fehlende_ids:
+            if abbuchung.fehlende_ids:
                 print("Nicht im Bestand gefuehrt:")
-                for mehl_id in sorted(set(fehlende_ids)):
+                for mehl_id in abbuchung.fehlende_ids:
                     print(f"- {mehl_id}")
 
-    def _zaehle_offene_schritte(self, backvorgang: Backvorgang) -> int:
-        return sum(
-            1
-            for schritt in backvorgang.step_runs
-            if schritt.actual_end_at is None and schritt.actual_duration_min is None
-        )
-
-    def _generiere_backvorgang_id(
-        self, bestehende_backvorgaenge: list[Backvorgang]
-    ) -> str:
-        datumsteil = datetime.now().strftime("%Y_%m_%d")
-        praefix = f"bv_{datumsteil}_"
-        regex = re.compile(rf"^{re.escape(praefix)}(\d{{3}})$")
-
-        hoechster_index = 0
-        for eintrag in bestehende_backvorgaenge:
-            match = regex.match(eintrag.id)
-            if match:
-                hoechster_index = max(hoechster_index, int(match.group(1)))
-
-        return f"{praefix}{hoechster_index + 1:03d}"
+    def _zaehle_offene_schritte(
+        self, backvorgang: Backvorgang | BackvorgangIndexEintrag
+    ) -> int:
+        return backvorgang.anzahl_offene_schritte()
 
     def _parse_float_oder_none(self, rohwert: str) -> float | None:
         text = rohwert.strip().replace(",", ".")
@@ -1320,4 +1344,4 @@ class BackvorgangMenu:
         return None
 
     def _jetzt_iso(self) -> str:
-        return datetime.now().astimezone().isoformat(timespec="seconds")
+        return self.backvorgangService.jetzt_iso()
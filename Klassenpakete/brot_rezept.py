@@ -44,13 +44,24 @@ def _normalize_number(value: float) -> int | float:
     return round(float(value), 3)
 
 
-def _merge_extra(result: dict[str, Any], extra_fields: dict[str, Any]) -> None:
+def _json_kopie(value: Any) -> Any:
+    # Freie JSON-Strukturen entkoppeln, damit Objekte keine Rohdaten (z. B. aus dem Cache) teilen
+    if isinstance(value, dict):
+        return {key: _json_kopie(eintrag) for key, eintrag in value.items()}
+    if isinstance(value, list):
+        return [_json_kopie(eintrag) for eintrag in value]
+    return value
+
+
+def _merge_extra(result: dict[str, Any], extra_fields: dict[str, Any] | None) -> None:
+    if not extra_fields:
+        return
     for key, value in extra_fields.items():
         if key not in result:
             result[key] = value
 
 
-@dataclass
+@dataclass(slots=True)
 class MehlAnteil:
     mehl_id: str
     percent: float
@@ -72,7 +83,7 @@ class MehlAnteil:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Starter:
     amount_g: float
     hydration_percent: float
@@ -91,7 +102,7 @@ class Starter:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Formel:
     flours: list[MehlAnteil] = field(default_factory=list)
     water_g: float = 0.0
@@ -134,7 +145,7 @@ class Formel:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class RezeptAusbeute:
     loaf_count_default: int = 1
     target_dough_weight_g: float = 0.0
@@ -153,7 +164,7 @@ class RezeptAusbeute:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class RezeptZiele:
     hydration_percent: float = 0.0
     dough_temp_c: float | None = None
@@ -172,7 +183,7 @@ class RezeptZiele:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class BrotRezept:
     id: str
     name: str
@@ -190,7 +201,8 @@ class BrotRezept:
     created_at: str | None = None
     updated_at: str | None = None
     archived_at: str | None = None
-    extra_fields: dict[str, Any] = field(default_factory=dict)
+    # Unbekannte JSON-Schlüssel; None solange es keine gibt (spart ein dict je Objekt)
+    extra_fields: dict[str, Any] | None = None
 
     @classmethod
     def from_dict(cls, daten: dict[str, Any]) -> "BrotRezept":
@@ -212,7 +224,7 @@ class BrotRezept:
             "updated_at",
             "archived_at",
         }
-        extra_fields = {k: v for k, v in daten.items() if k not in known_keys}
+        extra_fields = {k: _json_kopie(v) for k, v in daten.items() if k not in known_keys}
 
         return cls(
             id=str(daten.get("id", "")).strip(),
@@ -235,11 +247,11 @@ class BrotRezept:
                 if isinstance(eintrag, dict)
             ],
             notes=str(daten.get("notes", "")).strip(),
-            custom=_as_dict(daten.get("custom")),
+            custom=_json_kopie(_as_dict(daten.get("custom"))),
             created_at=daten.get("created_at") if isinstance(daten.get("created_at"), str) else None,
             updated_at=daten.get("updated_at") if isinstance(daten.get("updated_at"), str) else None,
             archived_at=daten.get("archived_at") if isinstance(daten.get("archived_at"), str) else None,
-            extra_fields=extra_fields,
+            extra_fields=extra_fields or None,
         )
 
     def to_dict(self) -> dict[str, Any]:
@@ -258,13 +270,13 @@ class BrotRezept:
             "notes": self.notes,
         }
 
-        if self.custom or "custom" in self.extra_fields:
+        if self.custom or "custom" in (self.extra_fields or {}):
             result["custom"] = self.custom
-        if self.created_at is not None or "created_at" in self.extra_fields:
+        if self.created_at is not None or "created_at" in (self.extra_fields or {}):
             result["created_at"] = self.created_at
-        if self.updated_at is not None or "updated_at" in self.extra_fields:
+        if self.updated_at is not None or "updated_at" in (self.extra_fields or {}):
             result["updated_at"] = self.updated_at
-        if self.archived_at is not None or "archived_at" in self.extra_fields:
+        if self.archived_at is not None or "archived_at" in (self.extra_fields or {}):
             result["archived_at"] = self.archived_at
 
         _merge_extra(result, self.extra_fields)
@@ -2,9 +2,9 @@ from __future__ import annotations
 
 from rich.table import Table
 
-from Klassenpakete.backvorgang import Backvorgang
-from Klassenpakete.json_manager import JsonManager
+from Klassenpakete.backvorgang import BackvorgangIndexEintrag
 from Klassenpakete.menu import Menu
+from Klassenpakete.repository import BackvorgangRepository, backvorgang_repository
 from Klassenpakete.ui_layout import MAX_ZEILEN_STANDARD, baue_standard_tabelle, kuerze_text
 
 
@@ -19,7 +19,7 @@ class DatenMenu:
             "Zurueck",
         ]
         self.menu: Menu = Menu(menuePunkte=self.menuePunkte)
-        self.backvorgangManager: JsonManager = JsonManager("daten/backvorgaenge.json")
+        self.backvorgangRepository: BackvorgangRepository = backvorgang_repository()
 
     def starten(self, navigation, renderer) -> None:
         self.renderer = renderer
@@ -41,12 +41,7 @@ class DatenMenu:
                 return
 
     def laufende_backvorgaenge_anzeigen(self, navigation) -> None:
-        backvorgaenge = self.backvorgangManager.laden(Backvorgang)
-        laufende = [
-            eintrag
-            for eintrag in backvorgaenge
-            if eintrag.status in ("running", "paused")
-        ]
+        laufende = self.backvorgangRepository.uebersicht("running", "paused")
 
         def render():
             tabelle = baue_standard_tabelle(
@@ -91,7 +86,7 @@ class DatenMenu:
 
             sichtbare = laufende[:MAX_ZEILEN_STANDARD]
             for index, eintrag in enumerate(sichtbare, start=1):
-                rezept_name = eintrag.recipe_snapshot.name or eintrag.recipe_id
+                rezept_name = eintrag.recipe_name or eintrag.recipe_id
                 start = eintrag.started_at or "-"
                 offene_schritte = self._zaehle_offene_schritte(eintrag)
                 tabelle.add_row(
@@ -116,9 +111,5 @@ class DatenMenu:
 
         self.renderer.render_loop(render, navigation, input_handler)
 
-    def _zaehle_offene_schritte(self, backvorgang: Backvorgang) -> int:
-        return sum(
-            1
-            for schritt in backvorgang.step_runs
-            if schritt.actual_end_at is None and schritt.actual_duration_min is None
-        )
+    def _zaehle_offene_schritte(self, backvorgang: BackvorgangIndexEintrag) -> int:
+        return backvorgang.anzahl_offene_schritte()
@@ -0,0 +1,151 @@
+# Diese Datei enthält die Hintergrund-Laufzeit der Terminal-Oberfläche.
+# Eine asyncio-Ereignisschleife läuft in einem eigenen (Daemon-)Thread; langsame
+# Aufträge wie eine KI-Anfrage laufen dort, während die Menüs weiter bedienbar
+# bleiben. Blockierende Funktionen werden mit asyncio.to_thread ausgeführt,
+# Koroutinen direkt auf der Schleife.
+#
+# Die Oberfläche fragt den Zustand nur ab (laeuft/fertig/fehler), sie wird nie
+# aus dem Hintergrund-Thread heraus gezeichnet. asyncio (und inspect) werden erst
+# beim ersten Auftrag importiert, damit der Programmstart nicht darauf wartet.
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    import asyncio
+    from concurrent.futures import Future
+
+
+@dataclass(slots=True)
+class HintergrundAufgabe:
+    schluessel: str
+    titel: str
+    # Wo das Ergebnis abgeholt wird, z. B. "KI fragen > Backvorgang mit KI bewerten"
+    hinweis: str
+    zukunft: Future
+    gestartet: float = field(default_factory=time.monotonic)
+    # Daten, die der Aufrufer beim Abholen wieder braucht
+    kontext: dict[str, Any] = field(default_factory=dict)
+
+    def laeuft(self) -> bool:
+        return not self.zukunft.done()
+
+    def ist_fehlgeschlagen(self) -> bool:
+        return self.zukunft.done() and self.zukunft.exception() is not None
+
+    def vergangene_sekunden(self) -> float:
+        return time.monotonic() - self.gestartet
+
+    def ergebnis(self) -> Any:
+        """
+        Ergebnis des fertigen Auftrags; eine Ausnahme des Auftrags wird hier erneut ausgelöst.
+        """
+        return self.zukunft.result(timeout=0)
+
+
+class Hintergrund:
+    """
+    Verwaltet die Ereignisschleife und die Aufträge (je Schlüssel höchstens einer).
+    Fertige Aufträge bleiben erhalten, bis der Aufrufer sie mit abholen() entfernt.
+    """
+
+    def __init__(self) -> None:
+        self._schleife: asyncio.AbstractEventLoop | None = None
+        self._aufgaben: dict[str, HintergrundAufgabe] = {}
+        self._sperre = threading.Lock()
+
+    def starten(
+        self,
+        schluessel: str,
+        titel: str,
+        funktion: Callable[..., Any],
+        *argumente: Any,
+        hinweis: str = "",
+        kontext: dict[str, Any] | None = None,
+    ) -> HintergrundAufgabe:
+        """
+        Startet funktion(*argumente) im Hintergrund. Löst ValueError aus, wenn unter
+        schluessel schon ein Auftrag läuft oder auf Abholung wartet.
+        """
+        import asyncio
+        import inspect
+
+        if schluessel in self._aufgaben:
+            raise ValueError(f"Auftrag {schluessel} ist bereits vorhanden.")
+
+        async def ausfuehren() -> Any:
+            if inspect.iscoroutinefunction(funktion):
+                return await funktion(*argumente)
+            return await asyncio.to_thread(funktion, *argumente)
+
+        aufgabe = HintergrundAufgabe(
+            schluessel=schluessel,
+            titel=titel,
+            hinweis=hinweis,
+            zukunft=asyncio.run_coroutine_threadsafe(ausfuehren(), self._hole_schleife()),
+            kontext=dict(kontext or {}),
+        )
+        self._aufgaben[schluessel] = aufgabe
+        return aufgabe
+
+    def get(self, schluessel: str) -> HintergrundAufgabe | None:
+        return self._aufgaben.get(schluessel)
+
+    def abholen(self, schluessel: str) -> HintergrundAufgabe | None:
+        """
+        Entfernt einen fertigen Auftrag und gibt ihn zurück; None, solange er noch läuft.
+        """
+        aufgabe = self._aufgaben.get(schluessel)
+        if aufgabe is None or aufgabe.laeuft():
+            return None
+        del self._aufgaben[schluessel]
+        return aufgabe
+
+    def aufgaben(self) -> list[HintergrundAufgabe]:
+        return sorted(self._aufgaben.values(), key=lambda aufgabe: aufgabe.gestartet)
+
+    def sekunden_bis_anzeigewechsel(self) -> float | None:
+        """
+        Wartezeit, bis sich die angezeigte Laufzeit (ganze Sekunden) eines laufenden
+        Auftrags ändert; None ohne laufende Aufträge. Spätestens dann fällt auch auf,
+        dass ein Auftrag fertig geworden ist.
+        """
+        wartezeiten = [
+            math.floor(vergangen) + 1 - vergangen
+            for vergangen in (
+                aufgabe.vergangene_sekunden()
+                for aufgabe in self._aufgaben.values()
+                if aufgabe.laeuft()
+            )
+        ]
+        return min(wartezeiten) if wartezeiten else None
+
+    def _hole_schleife(self) -> asyncio.AbstractEventLoop:
+        import asyncio
+
+        with self._sperre:
+            if self._schleife is None:
+                schleife = asyncio.new_event_loop()
+                threading.Thread(
+                    target=schleife.run_forever,
+                    name="brot-backer-hintergrund",
+                    daemon=True,
+                ).start()
+                self._schleife = schleife
+        return self._schleife
+
+
+# Prozessweit eine Laufzeit, damit Aufträge das Verlassen eines Untermenüs überdauern
+_hintergrund: Hintergrund | None = None
+
+
+def hintergrund() -> Hintergrund:
+    global _hintergrund
+    if _hintergrund is None:
+        _hintergrund = Hintergrund()
+    return _hintergrund
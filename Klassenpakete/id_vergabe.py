@@ -0,0 +1,79 @@
+# Diese Datei vergibt fortlaufende IDs über persistierte Zähler je Schlüssel
+# (z. B. ein Zähler pro Backtag oder pro Mehl-Basis-ID).
+# Eine Vergabe liest und schreibt nur den einen Zähler, unabhängig von der
+# Anzahl gespeicherter Objekte, und ist per Dateisperre prozessübergreifend geschützt.
+
+import fcntl
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from Klassenpakete.speicher import Datenspeicher, erzeuge_manager
+
+ZAEHLER_DATEI = "daten/id_zaehler.json"
+
+
+@dataclass
+class IdZaehler:
+    id: str
+    wert: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"id": self.id, "wert": self.wert}
+
+    @classmethod
+    def from_dict(cls, daten: dict[str, Any]) -> "IdZaehler":
+        return cls(id=str(daten.get("id", "")), wert=int(daten.get("wert", 0) or 0))
+
+
+_zaehlerManager: Datenspeicher | None = None
+
+
+def naechster_wert(
+    schluessel: str,
+    startwert: Callable[[], int] = lambda: 0,
+    ist_vergeben: Callable[[int], bool] = lambda wert: False,
+) -> int:
+    """
+    Erhöht den Zähler zu schluessel und liefert den neuen Wert.
+
+    startwert() wird nur beim ersten Zugriff auf einen Schlüssel aufgerufen
+    (z. B. höchster bereits vergebener Index aus den Daten). ist_vergeben()
+    überspringt Werte, die trotzdem schon belegt sind, etwa nach dem
+    Zurückspielen einer Sicherung.
+    """
+    with _sperre():
+        manager = _manager()
+        zaehler = manager.get(IdZaehler, schluessel)
+        if zaehler is None:
+            zaehler = IdZaehler(id=schluessel, wert=startwert())
+
+        zaehler.wert += 1
+        while ist_vergeben(zaehler.wert):
+            zaehler.wert += 1
+
+        manager.eintrag_speichern(zaehler)
+        return zaehler.wert
+
+
+def _manager() -> Datenspeicher:
+    global _zaehlerManager
+    if _zaehlerManager is None:
+        # Journal: jede Vergabe hängt nur eine Zeile an statt die Datei neu zu schreiben
+        _zaehlerManager = erzeuge_manager(ZAEHLER_DATEI, journal=True)
+    return _zaehlerManager
+
+
+@contextmanager
+def _sperre() -> Iterator[None]:
+    projektPfad = Path(__file__).parent.parent
+    sperrPfad = projektPfad / "daten" / "id_zaehler.lock"
+    sperrPfad.parent.mkdir(parents=True, exist_ok=True)
+
+    with sperrPfad.open("a") as sperrDatei:
+        fcntl.flock(sperrDatei.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(sperrDatei.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,123 @@
+# Diese Datei kapselt das Kodieren und Dekodieren von JSON für die Datenablage.
+# Ist orjson installiert, wird es verwendet, sonst das json-Modul der Standardbibliothek.
+# Das Dateiformat steuert die Umgebungsvariable BROT_BACKER_JSON_FORMAT:
+#   "lesbar"  (Standard) eingerückt mit 4 Leerzeichen, wie bisher
+#   "kompakt" ohne Einrückung und Leerzeichen, für große Produktivdaten
+
+import json
+import os
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional, siehe README
+    orjson = None
+
+
+def codec_name() -> str:
+    return "orjson" if orjson is not None else "json"
+
+
+def format_art() -> str:
+    art = os.getenv("BROT_BACKER_JSON_FORMAT", "lesbar").strip().lower()
+    return "kompakt" if art == "kompakt" else "lesbar"
+
+
+def loads(daten: str | bytes) -> Any:
+    """
+    Dekodiert ein JSON-Dokument. Fehler sind immer json.JSONDecodeError
+    (orjson.JSONDecodeError ist davon abgeleitet).
+    """
+    if orjson is not None:
+        return orjson.loads(daten)
+    if isinstance(daten, bytes):
+        daten = daten.decode("utf-8")
+    return json.loads(daten)
+
+
+def dumps(wert: Any, lesbar: bool | None = None) -> bytes:
+    """
+    Kodiert ein Dokument als UTF-8.
+    lesbar=None übernimmt das konfigurierte Format (BROT_BACKER_JSON_FORMAT).
+    """
+    if lesbar is None:
+        lesbar = format_art() == "lesbar"
+
+    if lesbar:
+        # Einrückung 4 wie bisher; orjson kennt nur 2 und bleibt daher außen vor
+        return json.dumps(wert, indent=4, ensure_ascii=False).encode("utf-8")
+    return dumps_zeile(wert)
+
+
+def dumps_zeile(wert: Any) -> bytes:
+    """
+    Kodiert einen Wert kompakt in einer Zeile (z. B. für das Journal).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(wert)
+        except TypeError:
+            # z. B. Ganzzahlen über 64 Bit oder Nicht-String-Schlüssel
+            pass
+    return json.dumps(wert, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# Platzhalter für die Eintragsliste beim Zusammensetzen eines Dokuments aus Fragmenten
+_EINTRAEGE_PLATZHALTER = "\x00brot_backer_items\x00"
+
+
+def dumps_eintrag(wert: Any, lesbar: bool | None = None) -> bytes:
+    """
+    Kodiert einen einzelnen Eintrag der items-Liste so, wie er in einem mit
+    dumps() geschriebenen Dokument steht (bei "lesbar" bereits eingerückt).
+    """
+    if lesbar is None:
+        lesbar = format_art() == "lesbar"
+
+    if lesbar:
+        # JSON-Strings enthalten keine echten Zeilenumbrüche, das Einrücken ist daher sicher
+        text = json.dumps(wert, indent=4, ensure_ascii=False).replace("\n", "\n        ")
+        return text.encode("utf-8")
+    return dumps_zeile(wert)
+
+
+def dumps_dokument(
+    dokument: dict[str, Any], eintraege: list[bytes], lesbar: bool | None = None
+) -> bytes:
+    """
+    Setzt ein Dokument aus bereits kodierten items-Einträgen zusammen.
+    Das Ergebnis ist byteweise identisch mit dumps() auf dem vollständigen Dokument.
+    """
+    return dumps_dokument_mit_positionen(dokument, eintraege, lesbar)[0]
+
+
+def dumps_dokument_mit_positionen(
+    dokument: dict[str, Any], eintraege: list[bytes], lesbar: bool | None = None
+) -> tuple[bytes, list[tuple[int, int]]]:
+    """
+    Wie dumps_dokument(), zusätzlich (Start, Länge) jedes Eintrags im Ergebnis
+    in Bytes (für den Versatzindex des JsonManagers).
+    """
+    if lesbar is None:
+        lesbar = format_art() == "lesbar"
+
+    kopf = dumps({**dokument, "items": _EINTRAEGE_PLATZHALTER}, lesbar=lesbar)
+    platzhalter = dumps_zeile(_EINTRAEGE_PLATZHALTER)
+
+    if not eintraege:
+        anfang, trenner, liste = b"[", b"", b"[]"
+    elif lesbar:
+        anfang, trenner = b"[\n        ", b",\n        "
+        liste = anfang + trenner.join(eintraege) + b"\n    ]"
+    else:
+        anfang, trenner = b"[", b","
+        liste = anfang + trenner.join(eintraege) + b"]"
+
+    beginn = kopf.index(platzhalter)
+    positionen: list[tuple[int, int]] = []
+    position = beginn + len(anfang)
+    for eintrag in eintraege:
+        positionen.append((position, len(eintrag)))
+        position += len(eintrag) + len(trenner)
+
+    return kopf[:beginn] + liste + kopf[beginn + len(platzhalter) :], positionen
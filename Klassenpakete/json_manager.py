@@ -1,37 +1,251 @@
 # Diese Datei ist für das Laden und Speichern von JSON-Daten zuständig.
 # Sie kapselt alle Datei-Zugriffe, damit andere Klassen kein JSON-Wissen benötigen.
 
+import fcntl
+import gzip
 import json
+import mmap
+import os
+import shutil
+import stat
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, List, Type, TypeVar
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Iterable,
+    Iterator,
+    List,
+    TextIO,
+    Type,
+    TypeVar,
+)
+
+from Klassenpakete import json_codec, migrationen
 
 T = TypeVar("T")
 
 
+@dataclass
+class _CacheEintrag:
+    """
+    Geparstes Dokument einer Datei samt bereits erzeugter Objekte.
+    Die Signatur (mtime_ns, Größe) entscheidet, ob der Eintrag noch gültig ist.
+    """
+
+    signatur: tuple[int, int, int, int]
+    dokument: dict[str, Any]
+    objekte: dict[type, list[Any]] = field(default_factory=dict)
+
+    # Stand des Änderungsjournals, das bereits in das Dokument eingespielt ist
+    journalSeq: int = 0
+    journalZeilen: int = 0
+    positionen: dict[str, int] | None = None
+
+    # Bereits kodierte items-Einträge: id -> (Rohdaten, Bytes). Gültig, solange genau
+    # dieses Rohdaten-Objekt wieder gespeichert wird; Format siehe fragmentLesbar
+    fragmente: dict[Any, tuple[dict[str, Any], bytes]] = field(default_factory=dict)
+    fragmentLesbar: bool | None = None
+
+
+# Versatzindex (.<datei>.versatz): Kopf mit dem Stand der Datendatei, dann je Eintrag
+# (Start, Länge) in Bytes. Eintrag N liegt damit an fester Stelle im Index
+_VERSATZ_KENNUNG = b"BBV1"
+_VERSATZ_KOPF = struct.Struct("<4sIqqqI")  # Kennung, schema_version, mtime_ns, Größe, inode, Anzahl
+_VERSATZ_EINTRAG = struct.Struct("<QI")  # Start, Länge
+
+
+class _Versatzindex:
+    """
+    Per mmap geöffnete Datendatei samt Versatzindex. Eintrag N wird direkt
+    aus seinem Bytebereich dekodiert, ohne den Rest der Datei zu lesen.
+    """
+
+    def __init__(self, daten: mmap.mmap, index: mmap.mmap, anzahl: int) -> None:
+        self._daten = daten
+        self._index = index
+        self.anzahl: int = anzahl
+
+    def eintrag(self, nummer: int) -> Any:
+        start, laenge = _VERSATZ_EINTRAG.unpack_from(
+            self._index, _VERSATZ_KOPF.size + nummer * _VERSATZ_EINTRAG.size
+        )
+        return json_codec.loads(self._daten[start : start + laenge])
+
+    def schliessen(self) -> None:
+        self._daten.close()
+        self._index.close()
+
+
+class _StromLeser:
+    """
+    Liest JSON-Werte blockweise aus einer Datei, ohne das ganze Dokument
+    auf einmal zu parsen. Im Puffer liegt nur der noch nicht gelesene Rest.
+    """
+
+    BLOCK_GROESSE: int = 64 * 1024
+
+    def __init__(self, datei: TextIO) -> None:
+        self._datei = datei
+        self._decoder = json.JSONDecoder()
+        self._puffer: str = ""
+        self._position: int = 0
+        self._dateiende: bool = False
+
+    def _nachladen(self) -> bool:
+        if self._dateiende:
+            return False
+        block = self._datei.read(self.BLOCK_GROESSE)
+        if not block:
+            self._dateiende = True
+            return False
+        self._puffer = self._puffer[self._position :] + block
+        self._position = 0
+        return True
+
+    def zeichen(self) -> str:
+        """
+        Liefert das nächste Nicht-Leerzeichen (ohne es zu verbrauchen), "" am Dateiende.
+        """
+        while True:
+            puffer = self._puffer
+            while self._position < len(puffer) and puffer[self._position] in " \t\r\n":
+                self._position += 1
+            if self._position < len(self._puffer):
+                return self._puffer[self._position]
+            if not self._nachladen():
+                return ""
+
+    def erwarte(self, erwartet: str) -> None:
+        if self.zeichen() != erwartet:
+            raise json.JSONDecodeError(f"'{erwartet}' erwartet", self._puffer, self._position)
+        self._position += 1
+
+    def wert(self) -> Any:
+        self.zeichen()
+        while True:
+            try:
+                wert, ende = self._decoder.raw_decode(self._puffer, self._position)
+            except json.JSONDecodeError:
+                # Wert reicht über das Pufferende hinaus
+                if self._nachladen():
+                    continue
+                raise
+            # Zahlen am Pufferende könnten abgeschnitten sein
+            if ende == len(self._puffer) and self._nachladen():
+                continue
+            self._position = ende
+            return wert
+
+
+class SpeicherKonflikt(Exception):
+    """
+    Die Datei wurde seit dem Laden von einem anderen Prozess geändert
+    (siehe basisVersion bei speichern()).
+    """
+
+
+@dataclass(frozen=True, slots=True)
+class Schreibergebnis:
+    """
+    Ergebnis eines Schreibvorgangs: die neue version() und der stand() direkt
+    danach, beide noch unter der Sperre gelesen. Ein später gelesener stand()
+    könnte bereits die Änderung eines anderen Prozesses enthalten.
+    """
+
+    version: str
+    stand: Any
+
+
+class _StreamNichtMoeglich(Exception):
+    """Die Datei kann nicht blockweise gelesen werden (siehe iter_items)."""
+
+
+# Prozessweiter Cache: alle JsonManager-Instanzen derselben Datei teilen sich einen Eintrag
+_dokumentCache: dict[Path, _CacheEintrag] = {}
+_cacheSperre = threading.Lock()
+
+# Dateisperren je Datendatei: RLock für Threads, flock für andere Prozesse.
+# Die Tiefe erlaubt verschachtelte Aufrufe (z. B. aktualisieren -> eintrag_speichern)
+_dateiSperren: dict[Path, threading.RLock] = {}
+_sperrTiefe: dict[Path, int] = {}
+_sperrDateien: dict[Path, Any] = {}
+
+
+def _lies_umask() -> int:
+    # os.umask() lässt sich nur setzend lesen; einmal beim Import, bevor Threads laufen
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+# Rechte neu angelegter Dateien wie bei open(): 0666 abzüglich umask
+_NEUE_DATEI_RECHTE: int = 0o666 & ~_lies_umask()
+
+
 class JsonManager:
     """
     Diese Klasse übernimmt das Laden und Speichern von Listen von Objekten
     (z. B. Mehl, BrotRezept) aus bzw. in JSON-Dateien.
     """
 
-    def __init__(self, dateiPfad: str) -> None:
-        self.standardSchemaVersion: int = 1
+    # Temporäre Schreibdateien, die älter sind, stammen von abgebrochenen Prozessen
+    VERWAISTE_TEMP_DATEI_SEKUNDEN: int = 600
 
-        # Immer den Datenordner unterhalb des Projektstamms verwenden
-        projektPfad = Path(__file__).parent.parent
-        datenOrdner = projektPfad / "daten"
-        datenOrdner.mkdir(parents=True, exist_ok=True)
-        self.dateiPfad: Path = datenOrdner / Path(dateiPfad).name
+    # Beim Schreiben einen Versatzindex anlegen (siehe eintraege_bereich)
+    VERSATZ_INDEX: bool = True
+
+    def __init__(self, dateiPfad: str, journal: bool = False, schema: str | None = None) -> None:
+        # Name der Migrationskette (siehe migrationen), standardmäßig der Dateiname.
+        # Aufgeteilte Ablagen (ShardManager) teilen sich eine Kette über mehrere Dateien.
+        self.schemaName: str = schema or Path(dateiPfad).name
+        # Aktuelle Schema-Version der Datei; ältere Dokumente werden beim Laden migriert
+        self.standardSchemaVersion: int = migrationen.aktuelle_version(self.schemaName)
+
+        # Journal-Modus: eintrag_speichern() hängt nur die Änderung als JSON-Zeile an,
+        # statt das komplette Dokument neu zu schreiben
+        self.journalAktiv: bool = journal
+        self.kompaktierungAbZeilen: int = 200
+
+        # Anzahl rollierender Sicherungen (.bak, .bak.2, ...) vor jedem Überschreiben
+        self.sicherungsGenerationen: int = 2
+
+        self.dateiPfad: Path = self.pfad_im_datenordner(dateiPfad)
+        self.journalPfad: Path = self.dateiPfad.with_name(
+            f"{self.dateiPfad.stem}.journal.jsonl"
+        )
+        self.versatzPfad: Path = self.dateiPfad.with_name(f".{self.dateiPfad.name}.versatz")
 
         # Falls die Datei noch nicht existiert, wird sie als Schema-Objekt angelegt
         if not self.dateiPfad.exists():
             self.dateiPfad.parent.mkdir(parents=True, exist_ok=True)
-            self.dateiPfad.write_text(
-                json.dumps(self._leeres_schema_objekt(), indent=4, ensure_ascii=False),
-                encoding="utf-8",
+            self._schreibe_atomar(
+                self._kodiere_datei(json_codec.dumps(self._leeres_schema_objekt())),
+                mitSicherung=False,
             )
 
+        self._entferne_verwaiste_temp_dateien()
+
+    @staticmethod
+    def pfad_im_datenordner(dateiPfad: str) -> Path:
+        """
+        Immer den Datenordner unterhalb des Projektstamms verwenden;
+        Unterordner (z. B. daten/backvorgaenge/2024-06.json) bleiben erhalten.
+        """
+        datenOrdner = Path(__file__).parent.parent / "daten"
+        datenOrdner.mkdir(parents=True, exist_ok=True)
+        relativerPfad = Path(dateiPfad)
+        if relativerPfad.parts[:1] == ("daten",):
+            relativerPfad = relativerPfad.relative_to("daten")
+        return datenOrdner / relativerPfad
+
     def laden(self, klasse: Type[T]) -> List[T]:
         """
         Lädt eine JSON-Datei und erzeugt daraus eine Liste von Objekten
@@ -39,69 +253,895 @@ class JsonManager:
 
         Wenn die Datei leer ist, wird eine leere Liste zurückgegeben.
         Die Klasse MUSS eine from_dict()-Methode besitzen.
+        Die Objekte sind frisch erzeugt und dürfen verändert werden.
         """
-        if self.dateiPfad.stat().st_size == 0:
-            return []
-
-        roheDaten = self._lese_rohdaten()
-        eintraege = self._extrahiere_eintraege(roheDaten)
+        eintraege = self._extrahiere_eintraege(self._lese_rohdaten())
 
         objekte: List[T] = [klasse.from_dict(eintrag) for eintrag in eintraege]
 
         return objekte
 
-    def speichern(self, objekte: List[T]) -> None:
+    def laden_nur_lesen(self, klasse: Type[T]) -> List[T]:
+        """
+        Liefert die zwischengespeicherten Objekte der Datei.
+
+        Die Liste wird zwischen allen Aufrufern geteilt und darf daher
+        NICHT verändert werden. Für Änderungen laden() verwenden.
+        """
+        eintrag = self._hole_cache_eintrag()
+        objekte = eintrag.objekte.get(klasse)
+        if objekte is None:
+            objekte = [
+                klasse.from_dict(daten)
+                for daten in self._extrahiere_eintraege(eintrag.dokument)
+            ]
+            eintrag.objekte[klasse] = objekte
+        return objekte
+
+    def stand(self) -> tuple[int, int, int, int]:
+        """
+        Günstiger Änderungsstand (mtime/Größe von Dokument und Journal).
+        Ändert sich der Wert, wurde die Datei seitdem geschrieben.
+        """
+        return self._signatur()
+
+    def rohe_eintraege(self) -> list[Any]:
+        """
+        Liefert die rohen JSON-Einträge (inklusive Journal). Nur lesen!
+        """
+        return self._extrahiere_eintraege(self._lese_rohdaten())
+
+    def anzahl_eintraege(self) -> int:
+        """
+        Anzahl der Einträge; mit gültigem Versatzindex ohne die Datei zu lesen.
+        """
+        if not self._im_cache():
+            with self._versatzindex() as index:
+                if index is not None:
+                    return index.anzahl
+        return len(self.rohe_eintraege())
+
+    def eintraege_bereich(self, klasse: Type[T], start: int, stop: int) -> List[T]:
+        """
+        Objekte der Einträge start..stop-1 (wie ein Slice), frisch erzeugt.
+
+        Für Anzeigen, die nur ein Fenster einer langen Liste zeigen: Ist die
+        Datei nicht im Cache und der Versatzindex gültig, werden per mmap nur
+        die benötigten Bytebereiche dekodiert. Sonst wie laden()[start:stop].
+        """
+        if not self._im_cache():
+            with self._versatzindex() as index:
+                if index is not None:
+                    return [
+                        klasse.from_dict(index.eintrag(nummer))
+                        for nummer in range(index.anzahl)[start:stop]
+                    ]
+        return [klasse.from_dict(daten) for daten in self.rohe_eintraege()[start:stop]]
+
+    def iter_items(
+        self,
+        klasse: Type[T],
+        predicate: Callable[[dict[str, Any]], bool] | None = None,
+    ) -> Iterator[T]:
+        """
+        Liefert die Objekte der Datei nacheinander (inklusive Journal).
+
+        predicate prüft vorab die rohen Einträge (z. B. den status), Objekte
+        werden nur für Treffer erzeugt. Ist die Datei nicht bereits im Cache,
+        wird sie blockweise gelesen, ohne das ganze Dokument im Speicher zu halten.
+        """
+        for daten in self._iter_rohe_eintraege():
+            if predicate is None or predicate(daten):
+                yield klasse.from_dict(daten)
+
+    def get(self, klasse: Type[T], objektId: str) -> T | None:
+        """
+        Liefert das Objekt mit der angegebenen id (frisch erzeugt) oder None.
+        """
+        cacheEintrag = self._hole_cache_eintrag()
+        position = self._positionen(cacheEintrag).get(objektId)
+        if position is None:
+            return None
+        return klasse.from_dict(self._extrahiere_eintraege(cacheEintrag.dokument)[position])
+
+    def query(
+        self,
+        klasse: Type[T],
+        status: str | tuple[str, ...] | None = None,
+        recipe_id: str | None = None,
+    ) -> List[T]:
+        """
+        Liefert alle Objekte, die den Filtern entsprechen. Gefiltert wird auf
+        den Rohdaten, Objekte werden nur für Treffer erzeugt.
+        status darf ein einzelner Wert oder ein Tupel erlaubter Werte sein.
+        """
+        erlaubteStatus = (status,) if isinstance(status, str) else status
+        return [
+            klasse.from_dict(daten)
+            for daten in self.rohe_eintraege()
+            if isinstance(daten, dict)
+            and (erlaubteStatus is None or daten.get("status") in erlaubteStatus)
+            and (recipe_id is None or daten.get("recipe_id") == recipe_id)
+        ]
+
+    def hoechste_id(self, praefix: str) -> str | None:
+        """
+        Liefert die lexikographisch größte id mit dem angegebenen Präfix.
+        """
+        kandidaten = [
+            str(daten.get("id", ""))
+            for daten in self.rohe_eintraege()
+            if isinstance(daten, dict) and str(daten.get("id", "")).startswith(praefix)
+        ]
+        return max(kandidaten, default=None)
+
+    def speichern(
+        self,
+        objekte: List[T],
+        geaendert: Iterable[str] | None = None,
+        basisVersion: str | None = None,
+    ) -> Schreibergebnis:
         """
         Speichert eine Liste von Objekten als JSON-Datei.
 
         Die Objekte MÜSSEN eine to_dict()-Methode besitzen.
+        Unveränderte Einträge werden nicht neu kodiert: Mit geaendert (ids) wird
+        to_dict() nur für diese und neue Objekte aufgerufen, ohne geaendert wird
+        jedes Objekt mit dem gespeicherten Stand verglichen.
+
+        basisVersion ist die version(), auf der die Objekte beruhen. Hat ein anderer
+        Prozess die Datei seitdem geschrieben, wird SpeicherKonflikt ausgelöst,
+        statt dessen Änderungen zu überschreiben. Rückgabe: neue Version und Stand.
         """
+        with self._dateisperre():
+            cacheEintrag = self._hole_cache_eintrag()
+            if basisVersion is not None and self._version_von(cacheEintrag) != basisVersion:
+                raise SpeicherKonflikt(
+                    f"{self.dateiPfad.name} wurde zwischenzeitlich geändert"
+                )
+            version = self._speichere_objekte(cacheEintrag, objekte, geaendert)
+            return Schreibergebnis(version, self.stand())
+
+    def _speichere_objekte(
+        self,
+        cacheEintrag: _CacheEintrag,
+        objekte: List[T],
+        geaendert: Iterable[str] | None,
+    ) -> str:
+        bisherige = self._extrahiere_eintraege(cacheEintrag.dokument)
+        positionen = self._positionen(cacheEintrag)
+        geaenderteIds = set(geaendert) if geaendert is not None else None
+
         datenZumSpeichern: list = []
+        for objekt in objekte:
+            position = positionen.get(objekt.id)
+            bisher = bisherige[position] if position is not None else None
+            if bisher is not None and geaenderteIds is not None and objekt.id not in geaenderteIds:
+                datenZumSpeichern.append(bisher)
+                continue
+
+            daten = objekt.to_dict()
+            # Gleicher Inhalt: gespeicherte Rohdaten samt kodiertem Fragment weiterverwenden
+            datenZumSpeichern.append(bisher if daten == bisher else daten)
+
+        return self._schreibe_eintraege(cacheEintrag, datenZumSpeichern)
 
+    def _schreibe_eintraege(self, cacheEintrag: _CacheEintrag, eintraege: list[Any]) -> str:
+        # schema_version bleibt erhalten: das Dokument ist bereits migriert
+        dokument = dict(cacheEintrag.dokument)
+        dokument["updated_at"] = self._zeitstempel()
+        dokument["items"] = eintraege
+        return self._schreibe_dokument(dokument, cacheEintrag)
+
+    def eintrag_speichern(self, objekt: T) -> Schreibergebnis:
+        """
+        Speichert ein einzelnes Objekt: vorhandenes mit gleicher id ersetzen,
+        sonst anhängen. Andere Einträge bleiben so, wie sie in der Datei stehen,
+        auch wenn ein anderer Prozess sie inzwischen geändert hat.
+
+        Im Journal-Modus wird nur die Änderung gegenüber dem gespeicherten Stand
+        als JSON-Zeile angehängt (Aufwand ~ Größe der Änderung). Ab
+        kompaktierungAbZeilen Zeilen wird das Journal in das Dokument gefaltet.
+        Rückgabe: neue Version und Stand.
+        """
+        with self._dateisperre():
+            return Schreibergebnis(self._speichere_eintrag(objekt), self.stand())
+
+    def eintraege_speichern(self, objekte: Iterable[T]) -> Schreibergebnis:
+        """
+        Wie eintrag_speichern() für mehrere Objekte, aber mit einem einzigen
+        Schreibvorgang (z. B. Massenimport). Ein offenes Journal wird dabei in
+        das Dokument gefaltet. Rückgabe: neue Version und Stand.
+        """
+        with self._dateisperre():
+            return Schreibergebnis(self._speichere_eintraege(objekte), self.stand())
+
+    def _speichere_eintraege(self, objekte: Iterable[T]) -> str:
+        cacheEintrag = self._hole_cache_eintrag()
+        eintraege = list(self._extrahiere_eintraege(cacheEintrag.dokument))
+        positionen = dict(self._positionen(cacheEintrag))
+
+        geaendert = False
         for objekt in objekte:
-            datenZumSpeichern.append(objekt.to_dict())
-
-        rohdaten = self._lese_rohdaten()
-        if isinstance(rohdaten, dict):
-            dokument = dict(rohdaten)
-            schemaVersionRoh = dokument.get("schema_version", self.standardSchemaVersion)
-            schemaVersion = (
-                schemaVersionRoh
-                if isinstance(schemaVersionRoh, int)
-                else self.standardSchemaVersion
+            neu = objekt.to_dict()
+            position = positionen.get(neu.get("id"))
+            if position is None:
+                positionen[neu.get("id")] = len(eintraege)
+                eintraege.append(neu)
+            elif eintraege[position] != neu:
+                eintraege[position] = neu
+            else:
+                continue
+            geaendert = True
+
+        if not geaendert:
+            return self._version_von(cacheEintrag)
+        return self._schreibe_eintraege(cacheEintrag, eintraege)
+
+    def aktualisieren(
+        self, klasse: Type[T], objektId: str, aenderung: Callable[[T], None]
+    ) -> T | None:
+        """
+        Liest ein Objekt unter der Dateisperre frisch ein, wendet aenderung darauf
+        an und speichert es. Für relative Änderungen wie Bestandsabbuchungen,
+        die sonst bei parallelen Terminals verloren gehen könnten.
+        Gibt das gespeicherte Objekt zurück, None falls es die id nicht gibt.
+        """
+        with self._dateisperre():
+            objekt = self.get(klasse, objektId)
+            if objekt is None:
+                return None
+            aenderung(objekt)
+            self._speichere_eintrag(objekt)
+            return objekt
+
+    def version(self) -> str:
+        """
+        Versionskennung des gespeicherten Stands (updated_at plus Journal-Nummer)
+        für die Konfliktprüfung in speichern().
+        """
+        return self._version_von(self._hole_cache_eintrag())
+
+    def _speichere_eintrag(self, objekt: T) -> str:
+        cacheEintrag = self._hole_cache_eintrag()
+        neu = objekt.to_dict()
+
+        if not self.journalAktiv:
+            # Nur dieser Eintrag wird neu kodiert, alle anderen kommen aus dem Cache
+            eintraege = list(self._extrahiere_eintraege(cacheEintrag.dokument))
+            position = self._positionen(cacheEintrag).get(neu.get("id"))
+            if position is None:
+                eintraege.append(neu)
+            elif eintraege[position] == neu:
+                return self._version_von(cacheEintrag)
+            else:
+                eintraege[position] = neu
+            return self._schreibe_eintraege(cacheEintrag, eintraege)
+
+        position = self._positionen(cacheEintrag).get(neu.get("id"))
+        eintraege = self._extrahiere_eintraege(cacheEintrag.dokument)
+
+        if position is None:
+            aenderung: dict[str, Any] = {"op": "neu", "item": neu}
+        else:
+            bisher = eintraege[position]
+            gesetzt = {k: v for k, v in neu.items() if k not in bisher or bisher[k] != v}
+            entfernt = [k for k in bisher if k not in neu]
+            if not gesetzt and not entfernt:
+                return self._version_von(cacheEintrag)
+            aenderung = {"op": "aendern", "id": neu.get("id"), "set": gesetzt}
+            if entfernt:
+                aenderung["unset"] = entfernt
+
+        aenderung["seq"] = cacheEintrag.journalSeq + 1
+        zeile = json_codec.dumps_zeile(aenderung)
+
+        with self.journalPfad.open("ab") as datei:
+            datei.write(zeile + b"\n")
+            datei.flush()
+            os.fsync(datei.fileno())
+
+        # Cache mit einer unabhängigen Kopie der Änderung nachziehen, statt neu zu parsen
+        with _cacheSperre:
+            if _dokumentCache.get(self.dateiPfad) is cacheEintrag:
+                self._spiele_aenderung_ein(cacheEintrag, json_codec.loads(zeile))
+                cacheEintrag.journalZeilen += 1
+                cacheEintrag.signatur = self._signatur()
+            else:
+                _dokumentCache.pop(self.dateiPfad, None)
+
+        if cacheEintrag.journalZeilen >= self.kompaktierungAbZeilen:
+            return self.kompaktieren()
+        return self._version_von(cacheEintrag)
+
+    # Gleicher Name wie beim SqliteManager
+    upsert = eintrag_speichern
+
+    def kompaktieren(self) -> str:
+        """
+        Faltet das Änderungsjournal in das Dokument und leert es anschließend.
+        """
+        with self._dateisperre():
+            cacheEintrag = self._hole_cache_eintrag()
+            if not self.journalPfad.exists():
+                return self._version_von(cacheEintrag)
+
+            dokument = dict(cacheEintrag.dokument)
+            dokument["updated_at"] = self._zeitstempel()
+            return self._schreibe_dokument(dokument, cacheEintrag)
+
+    def _schreibe_dokument(self, dokument: dict[str, Any], cacheEintrag: _CacheEintrag) -> str:
+        journalSeq = cacheEintrag.journalSeq
+        if journalSeq > 0 or self.journalAktiv:
+            # Zeilen bis zu dieser Nummer sind im Dokument enthalten und werden
+            # beim Laden übersprungen, falls das Journal nicht mehr gelöscht wurde.
+            # Steht vor "items", damit iter_items() den Wert schon vor den Einträgen kennt.
+            eintraege = dokument.pop("items", [])
+            dokument.pop("journal_seq", None)
+            dokument["journal_seq"] = journalSeq
+            dokument["items"] = eintraege
+
+        lesbar = json_codec.format_art() == "lesbar"
+        alteFragmente = cacheEintrag.fragmente if cacheEintrag.fragmentLesbar == lesbar else {}
+        fragmente: dict[Any, tuple[dict[str, Any], bytes]] = {}
+        kodiert: list[bytes] = []
+        for daten in self._extrahiere_eintraege(dokument):
+            objektId = daten.get("id") if isinstance(daten, dict) else None
+            fragment = alteFragmente.get(objektId)
+            if fragment is not None and fragment[0] is daten:
+                inhalt = fragment[1]
+            else:
+                inhalt = json_codec.dumps_eintrag(daten, lesbar=lesbar)
+            if objektId is not None:
+                fragmente[objektId] = (daten, inhalt)
+            kodiert.append(inhalt)
+
+        inhalt, positionen = json_codec.dumps_dokument_mit_positionen(
+            dokument, kodiert, lesbar=lesbar
+        )
+        try:
+            self._schreibe_atomar(self._kodiere_datei(inhalt))
+            self.journalPfad.unlink(missing_ok=True)
+        except BaseException:
+            self._cache_verwerfen()
+            raise
+        if self.VERSATZ_INDEX:
+            self._schreibe_versatzindex(positionen, dokument.get("schema_version"))
+
+        # Das geschriebene Dokument direkt als neuen Cache-Stand übernehmen,
+        # damit das nächste Speichern die Fragmente wiederverwenden kann
+        neuerEintrag = _CacheEintrag(
+            signatur=self._signatur(),
+            dokument=dokument,
+            journalSeq=journalSeq,
+            fragmente=fragmente,
+            fragmentLesbar=lesbar,
+        )
+        with _cacheSperre:
+            _dokumentCache[self.dateiPfad] = neuerEintrag
+        return self._version_von(neuerEintrag)
+
+    def _version_von(self, cacheEintrag: _CacheEintrag) -> str:
+        updatedAt = cacheEintrag.dokument.get("updated_at")
+        return f"{updatedAt or '-'}+{cacheEintrag.journalSeq}"
+
+    def sperre(self) -> ContextManager[None]:
+        """
+        Die Schreibsperre dieser Datei für Ablagen, die mehrere Dateien
+        gemeinsam ändern (siehe ShardManager). Verschachtelung ist erlaubt.
+        """
+        return self._dateisperre()
+
+    @contextmanager
+    def _dateisperre(self) -> Iterator[None]:
+        """
+        Exklusive Sperre auf die Datendatei für die Dauer eines Schreibvorgangs
+        (Lesen des aktuellen Stands, Prüfen, Schreiben). Lesen bleibt ungesperrt.
+        """
+        with _cacheSperre:
+            sperre = _dateiSperren.setdefault(self.dateiPfad, threading.RLock())
+
+        with sperre:
+            tiefe = _sperrTiefe.get(self.dateiPfad, 0)
+            if tiefe == 0:
+                sperrPfad = self.dateiPfad.with_name(f".{self.dateiPfad.name}.lock")
+                sperrDatei = sperrPfad.open("a")
+                fcntl.flock(sperrDatei.fileno(), fcntl.LOCK_EX)
+                _sperrDateien[self.dateiPfad] = sperrDatei
+            _sperrTiefe[self.dateiPfad] = tiefe + 1
+            try:
+                yield
+            finally:
+                _sperrTiefe[self.dateiPfad] -= 1
+                if _sperrTiefe[self.dateiPfad] == 0:
+                    sperrDatei = _sperrDateien.pop(self.dateiPfad)
+                    fcntl.flock(sperrDatei.fileno(), fcntl.LOCK_UN)
+                    sperrDatei.close()
+
+    def loeschen(self) -> None:
+        """
+        Entfernt die Datei samt Journal, Sicherungen und Versatzindex, z. B. einen
+        Shard, der nach dem Archivieren leer ist. Ein späterer Zugriff legt sie leer neu an.
+        """
+        with self._dateisperre():
+            pfade = [self.dateiPfad, self.journalPfad, self.versatzPfad]
+            for pfad in pfade + self.sicherungs_pfade():
+                pfad.unlink(missing_ok=True)
+            self._cache_verwerfen()
+
+    def exportieren(self, zielPfad: Path, lesbar: bool = True) -> int:
+        """
+        Schreibt den aktuellen Stand (inklusive Journal) in eine eigene Datei,
+        standardmäßig eingerückt, unabhängig vom Format der Datenablage.
+        Gibt die Anzahl exportierter Einträge zurück.
+        """
+        dokument = dict(self._lese_rohdaten())
+        dokument.pop("journal_seq", None)
+
+        zielPfad.parent.mkdir(parents=True, exist_ok=True)
+        zielPfad.write_bytes(json_codec.dumps(dokument, lesbar=lesbar))
+        return len(self._extrahiere_eintraege(dokument))
+
+    def sicherungs_pfade(self) -> list[Path]:
+        """
+        Liefert die Pfade der rollierenden Sicherungen, die jüngste zuerst.
+        """
+        pfade = [self.dateiPfad.with_name(f"{self.dateiPfad.name}.bak")]
+        for generation in range(2, self.sicherungsGenerationen + 1):
+            pfade.append(self.dateiPfad.with_name(f"{self.dateiPfad.name}.bak.{generation}"))
+        return pfade
+
+    def _schreibe_atomar(self, inhalt: bytes, mitSicherung: bool = True) -> None:
+        """
+        Schreibt zuerst in eine temporäre Datei im selben Ordner, synchronisiert
+        sie auf den Datenträger und ersetzt dann das Ziel per os.replace().
+        Ein Absturz hinterlässt so entweder die alte oder die neue Datei,
+        nie eine halb geschriebene.
+        """
+        dateiDeskriptor, tempName = tempfile.mkstemp(
+            prefix=f".{self.dateiPfad.name}.",
+            suffix=".tmp",
+            dir=self.dateiPfad.parent,
+        )
+        tempPfad = Path(tempName)
+        try:
+            with os.fdopen(dateiDeskriptor, "wb") as datei:
+                datei.write(inhalt)
+                datei.flush()
+                os.fsync(datei.fileno())
+
+            # mkstemp legt 0600 an: bisherige Rechte erhalten, neue Dateien wie open()
+            if self.dateiPfad.exists():
+                os.chmod(tempPfad, stat.S_IMODE(self.dateiPfad.stat().st_mode))
+                if mitSicherung:
+                    self._rotiere_sicherungen()
+            else:
+                os.chmod(tempPfad, _NEUE_DATEI_RECHTE)
+
+            os.replace(tempPfad, self.dateiPfad)
+            self._synchronisiere_ordner()
+        except BaseException:
+            tempPfad.unlink(missing_ok=True)
+            raise
+
+    def _rotiere_sicherungen(self) -> None:
+        if self.sicherungsGenerationen <= 0 or self.dateiPfad.stat().st_size == 0:
+            return
+
+        pfade = self.sicherungs_pfade()
+        for aelter, juenger in zip(reversed(pfade), list(reversed(pfade))[1:]):
+            if juenger.exists():
+                os.replace(juenger, aelter)
+
+        # Harter Link statt Kopie: die alte Datei bleibt als .bak erhalten,
+        # während das Ziel gleich atomar ersetzt wird
+        neuesteSicherung = pfade[0]
+        neuesteSicherung.unlink(missing_ok=True)
+        try:
+            os.link(self.dateiPfad, neuesteSicherung)
+        except OSError:
+            shutil.copy2(self.dateiPfad, neuesteSicherung)
+
+    def _synchronisiere_ordner(self) -> None:
+        # Damit auch der Verzeichniseintrag nach os.replace() dauerhaft ist (nur POSIX)
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        try:
+            ordnerDeskriptor = os.open(self.dateiPfad.parent, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            return
+        try:
+            os.fsync(ordnerDeskriptor)
+        except OSError:
+            pass
+        finally:
+            os.close(ordnerDeskriptor)
+
+    def _entferne_verwaiste_temp_dateien(self) -> None:
+        grenze = time.time() - self.VERWAISTE_TEMP_DATEI_SEKUNDEN
+        for tempPfad in self.dateiPfad.parent.glob(f".{self.dateiPfad.name}.*.tmp"):
+            try:
+                if tempPfad.stat().st_mtime < grenze:
+                    tempPfad.unlink()
+            except OSError:
+                continue
+
+    def _schreibe_versatzindex(
+        self, positionen: list[tuple[int, int]], schemaVersion: Any
+    ) -> None:
+        # Der Index ist nur eine Lesehilfe: gehört er nicht (mehr) zur Datendatei,
+        # wird er beim Lesen ignoriert. Daher ohne fsync und ohne Sicherungen
+        tempPfad = self.versatzPfad.with_name(f"{self.versatzPfad.name}.tmp")
+        try:
+            status = self.dateiPfad.stat()
+            inhalt = bytearray(
+                _VERSATZ_KOPF.pack(
+                    _VERSATZ_KENNUNG,
+                    schemaVersion if isinstance(schemaVersion, int) else 0,
+                    status.st_mtime_ns,
+                    status.st_size,
+                    status.st_ino,
+                    len(positionen),
+                )
             )
+            for start, laenge in positionen:
+                inhalt += _VERSATZ_EINTRAG.pack(start, laenge)
+            tempPfad.write_bytes(inhalt)
+            os.replace(tempPfad, self.versatzPfad)
+        except OSError:
+            tempPfad.unlink(missing_ok=True)
+            self.versatzPfad.unlink(missing_ok=True)
+
+    @contextmanager
+    def _versatzindex(self) -> Iterator[_Versatzindex | None]:
+        """
+        Öffnet Datendatei und Versatzindex per mmap, falls der Index zum
+        aktuellen Dateistand passt; sonst None. Ein offenes Journal oder
+        eine veraltete Schema-Version lassen sich so nicht lesen.
+        """
+        index = self._oeffne_versatzindex()
+        try:
+            yield index
+        finally:
+            if index is not None:
+                index.schliessen()
+
+    def _oeffne_versatzindex(self) -> _Versatzindex | None:
+        if not self.VERSATZ_INDEX:
+            return None
+        try:
+            if self.journalPfad.exists() and self.journalPfad.stat().st_size > 0:
+                return None
+            with self.versatzPfad.open("rb") as indexDatei, self.dateiPfad.open("rb") as datei:
+                indexMap = mmap.mmap(indexDatei.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    kennung, schemaVersion, mtime, groesse, inode, anzahl = (
+                        _VERSATZ_KOPF.unpack_from(indexMap)
+                    )
+                    status = os.fstat(datei.fileno())
+                    gueltig = (
+                        kennung == _VERSATZ_KENNUNG
+                        and schemaVersion == self.standardSchemaVersion
+                        and (mtime, groesse, inode)
+                        == (status.st_mtime_ns, status.st_size, status.st_ino)
+                        and len(indexMap) == _VERSATZ_KOPF.size + anzahl * _VERSATZ_EINTRAG.size
+                    )
+                    if not gueltig or groesse == 0:
+                        indexMap.close()
+                        return None
+                    # Die Abbildung bleibt auch nach einem späteren os.replace() beim
+                    # gelesenen Stand, Index und Daten passen also immer zusammen
+                    datenMap = mmap.mmap(datei.fileno(), 0, access=mmap.ACCESS_READ)
+                except BaseException:
+                    indexMap.close()
+                    raise
+        except (OSError, ValueError, struct.error):
+            return None
+        return _Versatzindex(datenMap, indexMap, anzahl)
+
+    def _im_cache(self) -> bool:
+        with _cacheSperre:
+            eintrag = _dokumentCache.get(self.dateiPfad)
+        return eintrag is not None and eintrag.signatur == self._signatur()
+
+    def _lese_rohdaten(self) -> dict[str, Any]:
+        # Das gelieferte Dokument stammt aus dem Cache und darf nicht verändert werden
+        return self._hole_cache_eintrag().dokument
+
+    def _hole_cache_eintrag(self) -> _CacheEintrag:
+        signatur = self._signatur()
+
+        with _cacheSperre:
+            eintrag = _dokumentCache.get(self.dateiPfad)
+            if eintrag is not None and eintrag.signatur == signatur:
+                return eintrag
+
+        # Parsen außerhalb der Sperre, damit andere Dateien nicht blockiert werden
+        eintrag = _CacheEintrag(signatur=signatur, dokument=self._parse_datei())
+        self._lese_journal(eintrag)
+        if migrationen.braucht_migration(self.schemaName, eintrag.dokument):
+            return self._migriere(eintrag)
+        with _cacheSperre:
+            _dokumentCache[self.dateiPfad] = eintrag
+        return eintrag
+
+    def _migriere(self, cacheEintrag: _CacheEintrag) -> _CacheEintrag:
+        # Einmalig: älteres Dokument (samt eingespieltem Journal) auf die aktuelle
+        # Schema-Version heben und speichern; der alte Stand bleibt als .bak erhalten
+        with self._dateisperre():
+            if self._signatur() != cacheEintrag.signatur:
+                # Inzwischen geschrieben, womöglich schon von einem anderen Prozess migriert
+                return self._hole_cache_eintrag()
+
+            dokument = migrationen.migriere(self.schemaName, cacheEintrag.dokument)
+            dokument["updated_at"] = self._zeitstempel()
+            self._schreibe_dokument(dokument, cacheEintrag)
+            with _cacheSperre:
+                return _dokumentCache[self.dateiPfad]
+
+    def _cache_verwerfen(self) -> None:
+        with _cacheSperre:
+            _dokumentCache.pop(self.dateiPfad, None)
+
+    def _signatur(self) -> tuple[int, int, int, int]:
+        signatur: tuple[int, ...] = ()
+        for pfad in (self.dateiPfad, self.journalPfad):
+            try:
+                status = pfad.stat()
+                signatur += (status.st_mtime_ns, status.st_size)
+            except FileNotFoundError:
+                signatur += (0, 0)
+        return signatur  # type: ignore[return-value]
+
+    def _lese_journal(self, cacheEintrag: _CacheEintrag) -> None:
+        dokument = cacheEintrag.dokument
+        if not isinstance(dokument.get("items"), list):
+            dokument["items"] = []
+        seqRoh = dokument.get("journal_seq", 0)
+        cacheEintrag.journalSeq = seqRoh if isinstance(seqRoh, int) else 0
+
+        for aenderung in self._journal_aenderungen(cacheEintrag.journalSeq):
+            self._spiele_aenderung_ein(cacheEintrag, aenderung)
+            cacheEintrag.journalZeilen += 1
+
+    def _journal_aenderungen(self, abSeq: int) -> list[dict[str, Any]]:
+        # Alle gültigen Journalzeilen mit einer Nummer größer abSeq
+        if not self.journalPfad.exists():
+            return []
+
+        aenderungen: list[dict[str, Any]] = []
+        with self.journalPfad.open("r", encoding="utf-8") as datei:
+            for zeile in datei:
+                try:
+                    aenderung = json_codec.loads(zeile)
+                except json.JSONDecodeError:
+                    # Abgebrochene letzte Zeile nach einem Absturz
+                    continue
+                if not isinstance(aenderung, dict):
+                    continue
+
+                seq = aenderung.get("seq", 0)
+                if not isinstance(seq, int) or seq <= abSeq:
+                    continue
+                aenderungen.append(aenderung)
+        return aenderungen
+
+    def _iter_rohe_eintraege(self) -> Iterator[dict[str, Any]]:
+        signatur = self._signatur()
+        with _cacheSperre:
+            eintrag = _dokumentCache.get(self.dateiPfad)
+        if eintrag is not None and eintrag.signatur == signatur:
+            # Bereits geparst: nichts erneut lesen
+            for daten in self._extrahiere_eintraege(eintrag.dokument):
+                if isinstance(daten, dict):
+                    yield daten
+            return
+
+        try:
+            yield from self._streame_rohe_eintraege()
+        except _StreamNichtMoeglich:
+            # Alte Dateien ohne journal_seq vor den Einträgen, ältere Schema-Versionen
+            # oder defekte Dateien (Wiederherstellung aus Sicherung) laufen über den
+            # normalen Cache-Pfad
+            for daten in self.rohe_eintraege():
+                if isinstance(daten, dict):
+                    yield daten
+
+    def _streame_rohe_eintraege(self) -> Iterator[dict[str, Any]]:
+        journalVorhanden = self.journalPfad.exists() and self.journalPfad.stat().st_size > 0
+        geliefert = False
+
+        try:
+            with self._oeffne_text() as datei:
+                leser = _StromLeser(datei)
+                if leser.zeichen() == "{":
+                    leser.erwarte("{")
+                    kopf: dict[str, Any] = {}
+                    while leser.zeichen() not in ("}", ""):
+                        if kopf:
+                            leser.erwarte(",")
+                        schluessel = leser.wert()
+                        leser.erwarte(":")
+                        if schluessel == "items" and leser.zeichen() == "[":
+                            kopf["items"] = None
+                            break
+                        kopf[schluessel] = leser.wert()
+                    else:
+                        # Dokument ohne Einträge: der Cache-Pfad ergänzt sie aus dem Journal
+                        raise _StreamNichtMoeglich()
+                    if journalVorhanden and "journal_seq" not in kopf:
+                        raise _StreamNichtMoeglich()
+                    if migrationen.braucht_migration(self.schemaName, kopf):
+                        # Der Cache-Pfad migriert und speichert die Datei einmalig
+                        raise _StreamNichtMoeglich()
+                    seqRoh = kopf.get("journal_seq", 0)
+                    abSeq = seqRoh if isinstance(seqRoh, int) else 0
+                else:
+                    # Reine Liste (altes Format): muss erst migriert werden
+                    raise _StreamNichtMoeglich()
+
+                aenderungen: dict[Any, list[dict[str, Any]]] = {}
+                if journalVorhanden:
+                    for aenderung in self._journal_aenderungen(abSeq):
+                        objektId = (
+                            aenderung["item"].get("id")
+                            if isinstance(aenderung.get("item"), dict)
+                            else aenderung.get("id")
+                        )
+                        aenderungen.setdefault(objektId, []).append(aenderung)
+
+                leser.erwarte("[")
+                while leser.zeichen() not in ("]", ""):
+                    if geliefert:
+                        leser.erwarte(",")
+                    daten = leser.wert()
+                    if isinstance(daten, dict) and daten.get("id") in aenderungen:
+                        daten = self._wende_aenderungen_an(daten, aenderungen.pop(daten.get("id")))
+                    geliefert = True
+                    if isinstance(daten, dict):
+                        yield daten
+                leser.erwarte("]")
+        except (OSError, EOFError, UnicodeDecodeError, json.JSONDecodeError):
+            # EOFError: abgeschnittene gzip-Datei (GzipJsonManager)
+            if geliefert:
+                raise
+            raise _StreamNichtMoeglich()
+
+        # Neu angelegte Einträge aus dem Journal in der Reihenfolge ihres Anlegens
+        def erste_neu_seq(liste: list[dict[str, Any]]) -> int:
+            return min((a.get("seq", 0) for a in liste if a.get("op") == "neu"), default=0)
+
+        for liste in sorted(aenderungen.values(), key=erste_neu_seq):
+            daten = self._wende_aenderungen_an(None, liste)
+            if daten is not None:
+                yield daten
+
+    def _wende_aenderungen_an(
+        self, daten: dict[str, Any] | None, aenderungen: list[dict[str, Any]]
+    ) -> dict[str, Any] | None:
+        # Gleiche Regeln wie _spiele_aenderung_ein, aber für einen einzelnen Eintrag
+        for aenderung in aenderungen:
+            if aenderung.get("op") == "neu" and isinstance(aenderung.get("item"), dict):
+                daten = aenderung["item"]
+            elif aenderung.get("op") == "aendern" and daten is not None:
+                daten = dict(daten)
+                gesetzt = aenderung.get("set")
+                if isinstance(gesetzt, dict):
+                    daten.update(gesetzt)
+                for key in aenderung.get("unset") or []:
+                    daten.pop(key, None)
+        return daten
+
+    def _spiele_aenderung_ein(
+        self, cacheEintrag: _CacheEintrag, aenderung: dict[str, Any]
+    ) -> None:
+        eintraege = self._extrahiere_eintraege(cacheEintrag.dokument)
+        positionen = self._positionen(cacheEintrag)
+        cacheEintrag.journalSeq = max(cacheEintrag.journalSeq, aenderung.get("seq", 0))
+
+        if aenderung.get("op") == "neu" and isinstance(aenderung.get("item"), dict):
+            daten = aenderung["item"]
+            position = positionen.get(daten.get("id"))
+            if position is None:
+                position = len(eintraege)
+                eintraege.append(daten)
+                positionen[daten.get("id")] = position
+            else:
+                eintraege[position] = daten
+        elif aenderung.get("op") == "aendern":
+            position = positionen.get(aenderung.get("id"))
+            if position is None:
+                return
+            daten = dict(eintraege[position])
+            gesetzt = aenderung.get("set")
+            if isinstance(gesetzt, dict):
+                daten.update(gesetzt)
+            for key in aenderung.get("unset") or []:
+                daten.pop(key, None)
+            eintraege[position] = daten
         else:
-            dokument = {}
-            schemaVersion = self.standardSchemaVersion
+            return
 
-        dokument["schema_version"] = schemaVersion
-        dokument["updated_at"] = self._zeitstempel()
-        dokument["items"] = datenZumSpeichern
+        # Bereits erzeugte Objekte nur an dieser Position ersetzen
+        for klasse, objekte in cacheEintrag.objekte.items():
+            objekt = klasse.from_dict(daten)
+            if position < len(objekte):
+                objekte[position] = objekt
+            else:
+                objekte.append(objekt)
 
-        with self.dateiPfad.open("w", encoding="utf-8") as datei:
-            json.dump(dokument, datei, indent=4, ensure_ascii=False)
+    def _positionen(self, cacheEintrag: _CacheEintrag) -> dict[str, int]:
+        if cacheEintrag.positionen is None:
+            cacheEintrag.positionen = {
+                daten.get("id"): index
+                for index, daten in enumerate(
+                    self._extrahiere_eintraege(cacheEintrag.dokument)
+                )
+                if isinstance(daten, dict)
+            }
+        return cacheEintrag.positionen
 
-    def _lese_rohdaten(self) -> dict[str, Any] | list[Any]:
-        if self.dateiPfad.stat().st_size == 0:
+    def _parse_datei(self) -> dict[str, Any]:
+        if not self.dateiPfad.exists():
             return self._leeres_schema_objekt()
 
-        with self.dateiPfad.open("r", encoding="utf-8") as datei:
-            try:
-                return json.load(datei)
-            except json.JSONDecodeError:
-                return self._leeres_schema_objekt()
+        dokument = self._lese_json_oder_none(self.dateiPfad)
+        if dokument is None:
+            # Leere oder defekte Datei: nicht still als leer behandeln, sonst
+            # löscht das nächste Speichern die gesamte Historie
+            dokument = self._stelle_aus_sicherung_wieder_her()
+
+        if isinstance(dokument, list):
+            # Erstes Dateiformat (reine Liste) als Schema-Version 0, siehe migrationen
+            return {"schema_version": 0, "items": dokument}
+        if not isinstance(dokument, dict):
+            return self._leeres_schema_objekt()
+        return dokument
+
+    def _lese_json_oder_none(self, pfad: Path) -> dict[str, Any] | list[Any] | None:
+        try:
+            return json_codec.loads(self._dekodiere_datei(pfad.read_bytes()))
+        except (OSError, EOFError, UnicodeDecodeError, json.JSONDecodeError):
+            return None
+
+    # Dateiinhalt vor dem Schreiben bzw. nach dem Lesen umwandeln (siehe GzipJsonManager)
+    def _kodiere_datei(self, inhalt: bytes) -> bytes:
+        return inhalt
 
-    def _extrahiere_eintraege(self, rohdaten: dict[str, Any] | list[Any]) -> list[Any]:
-        # Abwärtskompatibel: alte Dateien mit reiner Listenstruktur weiter unterstützen
-        if isinstance(rohdaten, list):
-            return rohdaten
+    def _dekodiere_datei(self, inhalt: bytes) -> bytes:
+        return inhalt
 
-        if isinstance(rohdaten, dict):
-            items = rohdaten.get("items", [])
-            if isinstance(items, list):
-                return items
+    def _oeffne_text(self) -> TextIO:
+        return self.dateiPfad.open("r", encoding="utf-8")
 
-        return []
+    def _stelle_aus_sicherung_wieder_her(self) -> dict[str, Any] | list[Any]:
+        defekt = self.dateiPfad.stat().st_size > 0
+        if defekt:
+            # Defekte Datei für eine manuelle Prüfung aufheben
+            zeitteil = datetime.now().strftime("%Y%m%d_%H%M%S")
+            shutil.copy2(
+                self.dateiPfad,
+                self.dateiPfad.with_name(f"{self.dateiPfad.name}.defekt_{zeitteil}"),
+            )
+
+        for sicherung in self.sicherungs_pfade():
+            if not sicherung.exists():
+                continue
+            dokument = self._lese_json_oder_none(sicherung)
+            if dokument is None:
+                continue
+
+            self._schreibe_atomar(
+                sicherung.read_bytes(),
+                mitSicherung=False,
+            )
+            return dokument
+
+        return self._leeres_schema_objekt()
+
+    def _extrahiere_eintraege(self, dokument: dict[str, Any]) -> list[Any]:
+        # Ältere Formate (z. B. reine Listen) hat die Migration beim Laden bereits umgestellt
+        return dokument["items"]
 
     def _leeres_schema_objekt(self) -> dict[str, Any]:
         return {
@@ -111,4 +1151,52 @@ class JsonManager:
         }
 
     def _zeitstempel(self) -> str:
-        return datetime.now().astimezone().isoformat(timespec="seconds")
+        # Mikrosekunden, damit updated_at als Version auch bei schnellen Folgeschreibvorgängen eindeutig ist
+        return datetime.now().astimezone().isoformat(timespec="microseconds")
+
+
+class GzipJsonManager(JsonManager):
+    """
+    JsonManager für gzip-komprimierte Dateien (z. B. das Archiv der Backhistorie).
+    Gedacht für selten geänderte Daten: ohne Journal, jedes Speichern schreibt
+    die ganze Datei. iter_items() entpackt beim Lesen blockweise.
+    """
+
+    KOMPRESSIONS_STUFE: int = 6
+    # Bytebereiche in der gzip-Datei lassen sich nicht direkt lesen
+    VERSATZ_INDEX: bool = False
+
+    def __init__(self, dateiPfad: str, schema: str | None = None) -> None:
+        super().__init__(dateiPfad, journal=False, schema=schema)
+
+    def _kodiere_datei(self, inhalt: bytes) -> bytes:
+        # mtime=0: gleicher Inhalt ergibt dieselbe Datei
+        return gzip.compress(inhalt, compresslevel=self.KOMPRESSIONS_STUFE, mtime=0)
+
+    def _dekodiere_datei(self, inhalt: bytes) -> bytes:
+        return gzip.decompress(inhalt)
+
+    def _oeffne_text(self) -> TextIO:
+        return gzip.open(self.dateiPfad, "rt", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    import sys
+
+    # python3 -m Klassenpakete.json_manager export [ZIELORDNER] [--kompakt]
+    argumente = [argument for argument in sys.argv[1:] if not argument.startswith("--")]
+    if not argumente or argumente[0] != "export":
+        print("Aufruf: python3 -m Klassenpakete.json_manager export [ZIELORDNER] [--kompakt]")
+        sys.exit(2)
+
+    zielOrdner = Path(argumente[1]) if len(argumente) > 1 else Path("export")
+    lesbar = "--kompakt" not in sys.argv[1:]
+    # Über die JSON-Ablage, damit die aufgeteilte Backhistorie als eine Datei exportiert wird
+    from Klassenpakete.speicher import json_ablage
+
+    datenOrdner = Path(__file__).parent.parent / "daten"
+    dateiNamen = {datei.name for datei in datenOrdner.glob("*.json")}
+    dateiNamen |= {f"{manifest.parent.name}.json" for manifest in datenOrdner.glob("*/manifest.json")}
+    for dateiName in sorted(dateiNamen):
+        anzahl = json_ablage(dateiName).exportieren(zielOrdner / dateiName, lesbar=lesbar)
+        print(f"{dateiName}: {anzahl} Eintraege nach {zielOrdner / dateiName}")
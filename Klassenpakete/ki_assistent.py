@@ -2,21 +2,27 @@ from __future__ import annotations
 
 import json
 import os
-from dataclasses import dataclass, field
 from datetime import datetime
-from pathlib import Path
 from typing import Any
-from uuid import uuid4
 
-from google import genai
 from rich.console import Group
 from rich.panel import Panel
 from rich.table import Table
 
-from Klassenpakete.backvorgang import Backvorgang, ZutatenVerbrauch
+from Klassenpakete.backvorgang import Backvorgang, BackvorgangIndexEintrag
 from Klassenpakete.brot_rezept import BrotRezept
-from Klassenpakete.json_manager import JsonManager
+from Klassenpakete.hintergrund import Hintergrund, HintergrundAufgabe, hintergrund
+from Klassenpakete.ki_verlauf import KiVerlaufEintrag
 from Klassenpakete.menu import Menu
+from Klassenpakete.repository import (
+    BackvorgangRepository,
+    RezeptRepository,
+    backvorgang_repository,
+    rezept_repository,
+)
+from Klassenpakete.services import KiFehler, KiReviewService
+from Klassenpakete.services.ki_service import als_float_oder_none
+from Klassenpakete.speicher import Datenspeicher
 from Klassenpakete.ui_layout import (
     HIGHLIGHT_STYLE,
     MAX_ZEILEN_KOMPAKT,
@@ -26,94 +32,8 @@ from Klassenpakete.ui_layout import (
     sichtfenster_indizes,
 )
 
-
-@dataclass
-class KiVerlaufEintrag:
-    id: str
-    created_at: str
-    backvorgang_id: str
-    recipe_id: str
-    recipe_name: str
-    model: str
-    status_snapshot: str
-    user_question: str = ""
-    overall_rating_1_10: int = 0
-    summary: str = ""
-    review: dict[str, Any] = field(default_factory=dict)
-    ingredient_changes_applied: int = 0
-    review_in_backvorgang_saved: bool = False
-    extra_fields: dict[str, Any] = field(default_factory=dict)
-
-    @classmethod
-    def from_dict(cls, daten: dict[str, Any]) -> "KiVerlaufEintrag":
-        known_keys = {
-            "id",
-            "created_at",
-            "backvorgang_id",
-            "recipe_id",
-            "recipe_name",
-            "model",
-            "status_snapshot",
-            "user_question",
-            "overall_rating_1_10",
-            "summary",
-            "review",
-            "ingredient_changes_applied",
-            "review_in_backvorgang_saved",
-        }
-        extra_fields = {k: v for k, v in daten.items() if k not in known_keys}
-
-        try:
-            rating = int(daten.get("overall_rating_1_10", 0))
-        except (TypeError, ValueError):
-            rating = 0
-
-        try:
-            applied = int(daten.get("ingredient_changes_applied", 0))
-        except (TypeError, ValueError):
-            applied = 0
-
-        review = daten.get("review", {})
-        if not isinstance(review, dict):
-            review = {}
-
-        return cls(
-            id=str(daten.get("id", "")).strip(),
-            created_at=str(daten.get("created_at", "")).strip(),
-            backvorgang_id=str(daten.get("backvorgang_id", "")).strip(),
-            recipe_id=str(daten.get("recipe_id", "")).strip(),
-            recipe_name=str(daten.get("recipe_name", "")).strip(),
-            model=str(daten.get("model", "")).strip(),
-            status_snapshot=str(daten.get("status_snapshot", "")).strip(),
-            user_question=str(daten.get("user_question", "")).strip(),
-            overall_rating_1_10=max(0, min(10, rating)),
-            summary=str(daten.get("summary", "")).strip(),
-            review=review,
-            ingredient_changes_applied=max(0, applied),
-            review_in_backvorgang_saved=bool(daten.get("review_in_backvorgang_saved", False)),
-            extra_fields=extra_fields,
-        )
-
-    def to_dict(self) -> dict[str, Any]:
-        result = {
-            "id": self.id,
-            "created_at": self.created_at,
-            "backvorgang_id": self.backvorgang_id,
-            "recipe_id": self.recipe_id,
-            "recipe_name": self.recipe_name,
-            "model": self.model,
-            "status_snapshot": self.status_snapshot,
-            "user_question": self.user_question,
-            "overall_rating_1_10": self.overall_rating_1_10,
-            "summary": self.summary,
-            "review": self.review,
-            "ingredient_changes_applied": self.ingredient_changes_applied,
-            "review_in_backvorgang_saved": self.review_in_backvorgang_saved,
-        }
-        for key, value in self.extra_fields.items():
-            if key not in result:
-                result[key] = value
-        return result
+# Schlüssel der laufenden KI-Bewertung in der Hintergrund-Laufzeit
+KI_BEWERTUNG_AUFGABE: str = "ki_bewertung"
 
 
 class KiAssistentMenu:
@@ -130,16 +50,11 @@ class KiAssistentMenu:
             "Zurueck",
         ]
         self.menu: Menu = Menu(menuePunkte=self.menuePunkte)
-        self.backvorgangManager: JsonManager = JsonManager("daten/backvorgaenge.json")
-        self.rezeptManager: JsonManager = JsonManager("daten/brote.json")
-        self.kiVerlaufManager: JsonManager = JsonManager("daten/ki_anfragen.json")
-        self.env_datei: Path = Path(__file__).parent.parent / ".env"
-        self.model_name: str = (
-            os.getenv("GOOGLE_MODEL")
-            or self._lade_wert_aus_env_datei("GOOGLE_MODEL")
-            or "gemini-2.5-flash-lite"
-        )
-        self._client: genai.Client | None = None
+        self.backvorgangRepository: BackvorgangRepository = backvorgang_repository()
+        self.rezeptRepository: RezeptRepository = rezept_repository()
+        self.kiService: KiReviewService = KiReviewService()
+        self.kiVerlaufManager: Datenspeicher = self.kiService.kiVerlaufManager
+        self.hintergrund: Hintergrund = hintergrund()
 
     def starten(self, navigation, renderer) -> None:
         self.renderer = renderer
@@ -167,41 +82,21 @@ class KiAssistentMenu:
             elif ausgewaehlterPunkt == "Zurueck":
                 return
 
-    def _hole_client(self) -> genai.Client | None:
-        if self._client is not None:
-            return self._client
+    def _hole_api_key(self) -> str | None:
+        return self.kiService.hole_api_key()
 
-        key = self._hole_api_key()
-        if not key:
-            with self.renderer.suspended():
-                print("\nGOOGLE_API_KEY ist nicht gesetzt.")
+    def _zeige_ki_fehler(self, fehler: KiFehler) -> None:
+        with self.renderer.suspended():
+            print(f"\n{fehler}")
+            if fehler.rohantwort is not None:
+                print("Rohantwort:\n")
+                print(fehler.rohantwort or "-")
+            elif self.kiService.hole_api_key() is None:
                 print(
                     "Nutze im Menue den Punkt 'API-Key in .env hinterlegen' "
                     "oder setze die Variable manuell."
                 )
-                input("ENTER druecken, um zurueckzukehren...")
-            return None
-
-        try:
-            self._client = genai.Client(api_key=key)
-            return self._client
-        except Exception as exc:  # pragma: no cover - defensive
-            with self.renderer.suspended():
-                print(f"\nKI-Client konnte nicht erstellt werden: {exc}")
-                input("ENTER druecken, um zurueckzukehren...")
-            return None
-
-    def _hole_api_key(self) -> str | None:
-        key = os.getenv("GOOGLE_API_KEY")
-        if key:
-            return key.strip() or None
-
-        key_aus_datei = self._lade_wert_aus_env_datei("GOOGLE_API_KEY")
-        if key_aus_datei:
-            # Fuer die laufende Session verfuegbar machen.
-            os.environ["GOOGLE_API_KEY"] = key_aus_datei
-            return key_aus_datei
-        return None
+            input("\nENTER druecken, um zurueckzukehren...")
 
     def _api_key_verwalten(self) -> None:
         aktueller_key = self._hole_api_key()
@@ -224,79 +119,17 @@ class KiAssistentMenu:
             return
 
         if neu == "-":
-            self._schreibe_env_wert("GOOGLE_API_KEY", None)
-            if "GOOGLE_API_KEY" in os.environ:
-                del os.environ["GOOGLE_API_KEY"]
-            self._client = None
+            self.kiService.setze_api_key(None)
             with self.renderer.suspended():
                 print("\nGOOGLE_API_KEY wurde aus .env entfernt.")
                 input("ENTER druecken, um zurueckzukehren...")
             return
 
-        self._schreibe_env_wert("GOOGLE_API_KEY", neu)
-        os.environ["GOOGLE_API_KEY"] = neu
-        self._client = None
+        self.kiService.setze_api_key(neu)
         with self.renderer.suspended():
             print("\nGOOGLE_API_KEY wurde in .env gespeichert.")
             input("ENTER druecken, um zurueckzukehren...")
 
-    def _lade_wert_aus_env_datei(self, key: str) -> str | None:
-        if not self.env_datei.exists():
-            return None
-
-        try:
-            zeilen = self.env_datei.read_text(encoding="utf-8").splitlines()
-        except OSError:
-            return None
-
-        praefix = f"{key}="
-        for zeile in zeilen:
-            text = zeile.strip()
-            if not text or text.startswith("#") or "=" not in text:
-                continue
-            if not text.startswith(praefix):
-                continue
-
-            roh = text[len(praefix) :].strip()
-            if not roh:
-                return None
-            if (roh.startswith('"') and roh.endswith('"')) or (
-                roh.startswith("'") and roh.endswith("'")
-            ):
-                roh = roh[1:-1]
-                roh = roh.replace('\\"', '"').replace("\\\\", "\\")
-            return roh.strip() or None
-        return None
-
-    def _schreibe_env_wert(self, key: str, value: str | None) -> None:
-        bestehend: list[str] = []
-        if self.env_datei.exists():
-            try:
-                bestehend = self.env_datei.read_text(encoding="utf-8").splitlines()
-            except OSError:
-                bestehend = []
-
-        praefix = f"{key}="
-        neue_zeilen: list[str] = []
-        ersetzt = False
-        for zeile in bestehend:
-            stripped = zeile.strip()
-            if stripped.startswith(praefix):
-                ersetzt = True
-                if value is not None:
-                    neue_zeilen.append(f'{key}="{self._escape_env_value(value)}"')
-                continue
-            neue_zeilen.append(zeile)
-
-        if not ersetzt and value is not None:
-            neue_zeilen.append(f'{key}="{self._escape_env_value(value)}"')
-
-        inhalt = "\n".join(neue_zeilen).rstrip() + "\n"
-        self.env_datei.write_text(inhalt, encoding="utf-8")
-
-    def _escape_env_value(self, value: str) -> str:
-        return value.replace("\\", "\\\\").replace('"', '\\"')
-
     def _maskiere_api_key(self, key: str | None) -> str:
         if not key:
             return "-"
@@ -305,18 +138,52 @@ class KiAssistentMenu:
         return key[:4] + ("*" * (len(key) - 8)) + key[-4:]
 
     def _backvorgang_ki_bewerten(self, navigation) -> None:
-        backvorgaenge = self.backvorgangManager.laden(Backvorgang)
+        # Eine schon gestartete Bewertung wird fortgesetzt bzw. abgeholt
+        aufgabe = self.hintergrund.get(KI_BEWERTUNG_AUFGABE)
+        if aufgabe is None:
+            aufgabe = self._ki_bewertung_starten(navigation)
+            if aufgabe is None:
+                return
+
+        if not self._warte_auf_ki_bewertung(aufgabe, navigation):
+            return  # laeuft im Hintergrund weiter
+        self.hintergrund.abholen(KI_BEWERTUNG_AUFGABE)
+
+        try:
+            review = aufgabe.ergebnis()
+        except KiFehler as fehler:
+            self._zeige_ki_fehler(fehler)
+            return
+        except Exception as exc:
+            # Unerwartete Fehler aus dem Hintergrund-Thread nicht bis ins Menue durchreichen
+            self._zeige_ki_fehler(KiFehler(f"KI-Bewertung fehlgeschlagen: {exc}"))
+            return
+
+        # Frisch lesen: der Backvorgang kann sich waehrend der Anfrage geaendert haben
+        backvorgang = self.backvorgangRepository.get(aufgabe.kontext["backvorgang_id"])
+        if backvorgang is None:
+            with self.renderer.suspended():
+                print("\nDer bewertete Backvorgang existiert nicht mehr.")
+                input("ENTER druecken, um zurueckzukehren...")
+            return
+
+        self._ki_bewertung_abschliessen(backvorgang, review, aufgabe.kontext["zusatzfrage"])
+
+    def _ki_bewertung_starten(self, navigation) -> HintergrundAufgabe | None:
+        backvorgaenge = self.backvorgangRepository.uebersicht()
         if not backvorgaenge:
             with self.renderer.suspended():
                 print("\nKeine Backvorgaenge vorhanden.")
                 input("ENTER druecken, um zurueckzukehren...")
-            return
+            return None
 
         auswahl = self._backvorgang_auswaehlen(backvorgaenge, navigation)
         if not isinstance(auswahl, int):
-            return
+            return None
 
-        backvorgang = backvorgaenge[auswahl]
+        backvorgang = self.backvorgangRepository.get(backvorgaenge[auswahl].id)
+        if backvorgang is None:
+            return None
         rezept = self._hole_rezept(backvorgang.recipe_id)
 
         with self.renderer.suspended():
@@ -324,10 +191,48 @@ class KiAssistentMenu:
                 "Optionale Zusatzfrage an die KI (optional): "
             ).strip()
 
-        review = self._frage_meisterbaecker_ki(backvorgang, rezept, zusatzfrage)
-        if review is None:
-            return
+        # Die Anfrage bekommt eine Kopie, die Menues aendern das Original evtl. weiter
+        return self.hintergrund.starten(
+            KI_BEWERTUNG_AUFGABE,
+            f"KI-Bewertung {backvorgang.recipe_snapshot.name or backvorgang.recipe_id}",
+            self.kiService.frage_meisterbaecker,
+            Backvorgang.from_dict(backvorgang.to_dict()),
+            rezept,
+            zusatzfrage,
+            hinweis="KI fragen > Backvorgang mit KI bewerten",
+            kontext={"backvorgang_id": backvorgang.id, "zusatzfrage": zusatzfrage},
+        )
 
+    def _warte_auf_ki_bewertung(self, aufgabe: HintergrundAufgabe, navigation) -> bool:
+        """
+        Zeigt den Fortschritt, bis die Bewertung fertig ist (True). Mit ESC/BACK
+        laeuft sie im Hintergrund weiter und kann spaeter abgeholt werden (False).
+        """
+        with navigation.eingabe_sitzung():
+            while aufgabe.laeuft():
+                self.renderer.update(
+                    Panel(
+                        f"[bold]{aufgabe.titel}[/bold]\n"
+                        f"Wartet auf die Antwort der KI ... "
+                        f"{int(aufgabe.vergangene_sekunden())} s\n\n"
+                        "[dim]ESC/BACK: im Hintergrund weiterlaufen lassen[/dim]",
+                        title="KI fragen",
+                        border_style="cyan",
+                    )
+                )
+                wartezeit = self.hintergrund.sekunden_bis_anzeigewechsel()
+                if wartezeit is None:
+                    break
+                if navigation.lese_taste_mit_timeout(wartezeit) in ("ESC", "BACK"):
+                    return False
+        return True
+
+    def _ki_bewertung_abschliessen(
+        self,
+        backvorgang: Backvorgang,
+        review: dict[str, Any],
+        zusatzfrage: str,
+    ) -> None:
         self._zeige_review_kompakt(review)
 
         with self.renderer.suspended():
@@ -348,7 +253,7 @@ class KiAssistentMenu:
         hat_geaendert = False
         uebernommene_ingredient_aenderungen = 0
         if vorschlaege_anwenden in ("j", "ja", "y", "yes"):
-            aenderungen = self._ermittle_ingredient_suggestion_aenderungen(
+            aenderungen = self.kiService.ermittle_zutaten_aenderungen(
                 backvorgang,
                 review,
             )
@@ -365,7 +270,7 @@ class KiAssistentMenu:
                         .lower()
                     )
                 if uebernehmen in ("", "j", "ja", "y", "yes"):
-                    anzahl = self._wende_ingredient_aenderungen_an(
+                    anzahl = self.kiService.wende_zutaten_aenderungen_an(
                         backvorgang,
                         aenderungen,
                     )
@@ -381,10 +286,10 @@ class KiAssistentMenu:
 
         review_gespeichert = False
         if speichern in ("", "j", "ja", "y", "yes"):
-            self._speichere_ki_review(backvorgaenge, auswahl, review)
+            self.kiService.speichere_review(backvorgang, review)
             review_gespeichert = True
 
-        self._speichere_ki_verlauf(
+        self.kiService.speichere_verlauf(
             backvorgang=backvorgang,
             review=review,
             user_question=zusatzfrage,
@@ -394,77 +299,40 @@ class KiAssistentMenu:
 
         if hat_geaendert or review_gespeichert:
             backvorgang.updated_at = datetime.now().astimezone().isoformat(timespec="seconds")
-            self.backvorgangManager.speichern(backvorgaenge)
+            self.backvorgangRepository.upsert(backvorgang)
             if review_gespeichert:
                 with self.renderer.suspended():
                     print("KI-Bewertung wurde gespeichert.")
                     input("ENTER druecken, um fortzufahren...")
 
-    def _speichere_ki_verlauf(
-        self,
-        backvorgang: Backvorgang,
-        review: dict[str, Any],
-        user_question: str,
-        ingredient_changes_applied: int,
-        review_in_backvorgang_saved: bool,
-    ) -> None:
-        eintraege = self.kiVerlaufManager.laden(KiVerlaufEintrag)
-        rating = review.get("overall_rating_1_10")
-        try:
-            rating_int = int(rating)
-        except (TypeError, ValueError):
-            rating_int = 0
-        rating_int = max(0, min(10, rating_int))
-
-        eintraege.append(
-            KiVerlaufEintrag(
-                id=f"ki_{uuid4().hex[:12]}",
-                created_at=datetime.now().astimezone().isoformat(timespec="seconds"),
-                backvorgang_id=backvorgang.id,
-                recipe_id=backvorgang.recipe_id,
-                recipe_name=backvorgang.recipe_snapshot.name or backvorgang.recipe_id,
-                model=self.model_name,
-                status_snapshot=backvorgang.status,
-                user_question=user_question,
-                overall_rating_1_10=rating_int,
-                summary=str(review.get("summary", "")).strip(),
-                review=review,
-                ingredient_changes_applied=max(0, int(ingredient_changes_applied)),
-                review_in_backvorgang_saved=review_in_backvorgang_saved,
-            )
-        )
-        self.kiVerlaufManager.speichern(eintraege)
-
     def _ki_verlauf_anzeigen(self, navigation) -> None:
         highlight_index = 0
 
         while True:
-            verlauf = self.kiVerlaufManager.laden(KiVerlaufEintrag)
-            if not verlauf:
+            # Gelesen werden nur die sichtbaren Einträge, nicht der ganze Verlauf
+            anzahl = self.kiVerlaufManager.anzahl_eintraege()
+            if anzahl == 0:
                 with self.renderer.suspended():
                     print("\nNoch keine KI-Anfragen gespeichert.")
                     input("ENTER druecken, um zurueckzukehren...")
                 return
 
-            verlauf_sortiert = sorted(
-                verlauf,
-                key=lambda x: x.created_at or "",
-                reverse=True,
-            )
-            highlight_index = min(highlight_index, len(verlauf_sortiert) - 1)
+            highlight_index = min(highlight_index, anzahl - 1)
+            geladen: dict[int, KiVerlaufEintrag] = {}
 
             def render():
                 return self._baue_ki_verlauf_browser(
-                    verlauf=verlauf_sortiert,
+                    anzahl=anzahl,
                     highlight_index=highlight_index,
+                    geladen=geladen,
                 )
 
             def input_handler(taste: str):
                 nonlocal highlight_index
                 if taste == "UP":
-                    highlight_index = (highlight_index - 1) % len(verlauf_sortiert)
+                    highlight_index = (highlight_index - 1) % anzahl
                 elif taste == "DOWN":
-                    highlight_index = (highlight_index + 1) % len(verlauf_sortiert)
+                    highlight_index = (highlight_index + 1) % anzahl
                 elif taste == "ENTER":
                     return "OPEN_DETAIL"
                 elif taste in ("BACK", "ESC"):
@@ -473,14 +341,35 @@ class KiAssistentMenu:
 
             result = self.renderer.render_loop(render, navigation, input_handler)
             if result == "OPEN_DETAIL":
-                self._zeige_ki_verlauf_detail(verlauf_sortiert[highlight_index], navigation)
+                self._lade_ki_verlauf(anzahl, [highlight_index], geladen)
+                self._zeige_ki_verlauf_detail(geladen[highlight_index], navigation)
                 continue
             return
 
+    def _lade_ki_verlauf(
+        self,
+        anzahl: int,
+        indizes: list[int],
+        geladen: dict[int, KiVerlaufEintrag],
+    ) -> None:
+        """
+        Ergaenzt geladen um die Anzeige-Indizes (neueste Antwort zuerst).
+        Neue Antworten werden angehaengt, Anzeige-Index i ist also Eintrag anzahl - 1 - i.
+        """
+        fehlend = [index for index in indizes if index not in geladen]
+        if not fehlend:
+            return
+        start = anzahl - 1 - max(fehlend)
+        stop = anzahl - min(fehlend)
+        eintraege = self.kiVerlaufManager.eintraege_bereich(KiVerlaufEintrag, start, stop)
+        for position, eintrag in enumerate(eintraege, start=start):
+            geladen[anzahl - 1 - position] = eintrag
+
     def _baue_ki_verlauf_browser(
         self,
-        verlauf: list[KiVerlaufEintrag],
+        anzahl: int,
         highlight_index: int,
+        geladen: dict[int, KiVerlaufEintrag],
     ):
         liste = baue_standard_tabelle(
             titel="KI-Verlauf | Gespeicherte Antworten",
@@ -494,16 +383,17 @@ class KiAssistentMenu:
         liste.add_column("Modell", style="magenta", max_width=12, overflow="ellipsis")
 
         sichtbare_indizes, hat_oben, hat_unten = sichtfenster_indizes(
-            anzahl_zeilen=len(verlauf),
+            anzahl_zeilen=anzahl,
             aktiver_index=highlight_index,
             max_zeilen=MAX_ZEILEN_KOMPAKT,
         )
+        self._lade_ki_verlauf(anzahl, [*sichtbare_indizes, highlight_index], geladen)
 
         if hat_oben:
             liste.add_row("...", "...", "...", "...", "...", "...", style="dim")
 
         for index in sichtbare_indizes:
-            eintrag = verlauf[index]
+            eintrag = geladen[index]
             rezept = eintrag.recipe_name or eintrag.recipe_id or "-"
             modell = eintrag.model.replace("models/", "")
             zeilen_style = HIGHLIGHT_STYLE if index == highlight_index else ""
@@ -520,7 +410,7 @@ class KiAssistentMenu:
         if hat_unten:
             liste.add_row("...", "...", "...", "...", "...", "...", style="dim")
 
-        preview = self._baue_ki_vorschau_tabelle(verlauf[highlight_index])
+        preview = self._baue_ki_vorschau_tabelle(geladen[highlight_index])
         return Group(liste, preview)
 
     def _baue_ki_vorschau_tabelle(self, eintrag: KiVerlaufEintrag) -> Table:
@@ -687,7 +577,7 @@ class KiAssistentMenu:
                 return 0
             return len([item for item in missing if isinstance(item, dict)])
         if seite_index == 3:
-            return len(self._extrahiere_ingredient_suggestions(review))
+            return len(self.kiService.extrahiere_zutaten_vorschlaege(review))
         return 0
 
     def _baue_ki_verlauf_detail_tabelle(
@@ -825,7 +715,7 @@ class KiAssistentMenu:
                 tabelle.add_row("...", "...", "...", "...", f"... {total - ende} weitere", style="dim")
             return tabelle
 
-        ingredient_vorschlaege = self._extrahiere_ingredient_suggestions(review)
+        ingredient_vorschlaege = self.kiService.extrahiere_zutaten_vorschlaege(review)
         tabelle = baue_standard_tabelle(titel=titel, caption=caption)
         tabelle.add_column("Nr.", style="bold cyan", justify="right", width=4)
         tabelle.add_column("Zutat", style="bold white", max_width=16, overflow="ellipsis")
@@ -874,26 +764,16 @@ class KiAssistentMenu:
         return text
 
     def _modelle_anzeigen(self) -> None:
-        client = self._hole_client()
-        if client is None:
-            return
-
-        modellnamen: list[str] = []
         try:
-            for model in client.models.list():
-                name = getattr(model, "name", None)
-                if isinstance(name, str) and name:
-                    modellnamen.append(name)
-        except Exception as exc:
-            with self.renderer.suspended():
-                print(f"\nModelle konnten nicht geladen werden: {exc}")
-                input("ENTER druecken, um zurueckzukehren...")
+            modellnamen = self.kiService.modelle()
+        except KiFehler as fehler:
+            self._zeige_ki_fehler(fehler)
             return
 
         with self.renderer.suspended():
             tabelle = baue_standard_tabelle(
                 titel="KI-Modelle (Google GenAI)",
-                caption=f"Aktuelles Modell: {self.model_name}",
+                caption=f"Aktuelles Modell: {self.kiService.modellName}",
             )
             tabelle.add_column("Nr.", style="bold cyan", justify="right", width=4)
             tabelle.add_column(
@@ -914,11 +794,11 @@ class KiAssistentMenu:
             input("ENTER druecken, um zurueckzukehren...")
 
     def _backvorgang_auswaehlen(
-        self, backvorgaenge: list[Backvorgang], navigation
+        self, backvorgaenge: list[BackvorgangIndexEintrag], navigation
     ) -> int | None:
         eintraege = []
         for eintrag in backvorgaenge:
-            rezeptname = eintrag.recipe_snapshot.name or eintrag.recipe_id
+            rezeptname = eintrag.recipe_name or eintrag.recipe_id
             offene = self._zaehle_offene_schritte(eintrag)
             eintraege.append(
                 f"{rezeptname} | {eintrag.id} | {eintrag.status} | offene Schritte: {offene}"
@@ -926,227 +806,6 @@ class KiAssistentMenu:
 
         return Menu(eintraege).anzeigen(navigation, self.renderer)
 
-    def _frage_meisterbaecker_ki(
-        self,
-        backvorgang: Backvorgang,
-        rezept: BrotRezept | None,
-        zusatzfrage: str,
-    ) -> dict[str, Any] | None:
-        client = self._hole_client()
-        if client is None:
-            return None
-
-        backvorgang_json = json.dumps(
-            backvorgang.to_dict(),
-            ensure_ascii=False,
-            indent=2,
-        )
-        rezept_json = json.dumps(
-            rezept.to_dict() if rezept is not None else {},
-            ensure_ascii=False,
-            indent=2,
-        )
-
-        prompt = f"""
-Du bist ein deutscher Meisterbaecker mit hoher Praxiserfahrung.
-Analysiere den Backvorgang kritisch und gib konkrete Verbesserungen.
-Antworte AUSSCHLIESSLICH als valides JSON (kein Markdown, kein Freitext davor/danach).
-
-JSON-Struktur (genau diese Top-Level-Keys verwenden):
-{{
-  "persona": "meisterbaecker",
-  "overall_rating_1_10": 0,
-  "summary": "",
-  "strengths": ["", ""],
-  "issues": [
-    {{"topic": "", "severity": "low|medium|high", "details": ""}}
-  ],
-  "missing_data_suggestions": [
-    {{"field": "", "reason": "", "suggested_value": "", "confidence": "low|medium|high"}}
-  ],
-  "ingredient_usage_suggestions": [
-    {{"ingredient_id": "", "planned_g": 0, "actual_g": 0, "note": ""}}
-  ],
-  "next_actions": ["", ""]
-}}
-
-Regeln:
-- Wenn Daten fehlen, liefere sinnvolle Vorschlaege in "missing_data_suggestions".
-- Nutze nur plausible Baeckerlogik, keine Fantasie.
-- "overall_rating_1_10" ist ganzzahlig zwischen 1 und 10.
-- Antworte kompakt: max 3 "strengths", max 6 "issues", max 5 "missing_data_suggestions", max 5 "next_actions".
-- Jede "issues.details" kurz halten (max ~220 Zeichen).
-
-BACKVORGANG_JSON:
-{backvorgang_json}
-
-REZEPT_JSON:
-{rezept_json}
-
-ZUSATZFRAGE:
-{zusatzfrage or "-"}
-"""
-
-        try:
-            response = client.models.generate_content(
-                model=self.model_name,
-                contents=prompt,
-                config={
-                    "temperature": 0.2,
-                    "max_output_tokens": 1600,
-                    "response_mime_type": "application/json",
-                },
-            )
-        except Exception as exc:
-            with self.renderer.suspended():
-                print(f"\nKI-Anfrage fehlgeschlagen: {exc}")
-                input("ENTER druecken, um zurueckzukehren...")
-            return None
-
-        daten = response.parsed if isinstance(response.parsed, dict) else None
-        text = getattr(response, "text", None)
-
-        if daten is None and isinstance(text, str) and text.strip():
-            daten = self._parse_json_antwort(text)
-
-        if daten is None and isinstance(text, str) and text.strip():
-            daten = self._repariere_json_antwort(client, text)
-
-        if daten is None:
-            with self.renderer.suspended():
-                print("\nKI-Antwort konnte nicht als JSON gelesen werden.")
-                print("Rohantwort:\n")
-                print(text or "-")
-                input("\nENTER druecken, um zurueckzukehren...")
-            return None
-
-        return self._normalisiere_review_json(daten)
-
-    def _parse_json_antwort(self, text: str) -> dict[str, Any] | None:
-        kandidaten: list[str] = []
-        roh = text.strip()
-        kandidaten.append(roh)
-
-        if roh.startswith("```"):
-            ohne_start = roh.replace("```json", "", 1).replace("```", "").strip()
-            kandidaten.append(ohne_start)
-
-        extrahiert = self._extrahiere_erstes_json_objekt(roh)
-        if extrahiert:
-            kandidaten.append(extrahiert)
-
-        for kandidat in kandidaten:
-            try:
-                daten = json.loads(kandidat)
-            except json.JSONDecodeError:
-                continue
-            if isinstance(daten, dict):
-                return daten
-
-        return None
-
-    def _extrahiere_erstes_json_objekt(self, text: str) -> str | None:
-        start = text.find("{")
-        if start < 0:
-            return None
-
-        tiefe = 0
-        in_string = False
-        escaped = False
-        for index in range(start, len(text)):
-            zeichen = text[index]
-
-            if in_string:
-                if escaped:
-                    escaped = False
-                elif zeichen == "\\":
-                    escaped = True
-                elif zeichen == '"':
-                    in_string = False
-                continue
-
-            if zeichen == '"':
-                in_string = True
-                continue
-
-            if zeichen == "{":
-                tiefe += 1
-            elif zeichen == "}":
-                tiefe -= 1
-                if tiefe == 0:
-                    return text[start : index + 1]
-
-        return None
-
-    def _repariere_json_antwort(
-        self,
-        client: genai.Client,
-        rohantwort: str,
-    ) -> dict[str, Any] | None:
-        prompt = f"""
-Konvertiere die folgende KI-Rohantwort in EIN valides JSON-Objekt.
-Entferne Markdown-Fences und unvollstaendige Fragmente.
-Nutze diese Top-Level-Keys:
-persona, overall_rating_1_10, summary, strengths, issues,
-missing_data_suggestions, ingredient_usage_suggestions, next_actions.
-Wenn ein Bereich fehlt, nutze leere Standardwerte.
-Antworte nur mit JSON.
-
-ROHANTWORT:
-{rohantwort}
-"""
-        try:
-            response = client.models.generate_content(
-                model=self.model_name,
-                contents=prompt,
-                config={
-                    "temperature": 0.0,
-                    "max_output_tokens": 1400,
-                    "response_mime_type": "application/json",
-                },
-            )
-        except Exception:
-            return None
-
-        if isinstance(response.parsed, dict):
-            return response.parsed
-
-        text = getattr(response, "text", None)
-        if isinstance(text, str) and text.strip():
-            return self._parse_json_antwort(text)
-        return None
-
-    def _normalisiere_review_json(self, daten: dict[str, Any]) -> dict[str, Any]:
-        rating = daten.get("overall_rating_1_10")
-        try:
-            rating_int = int(rating)
-        except (TypeError, ValueError):
-            rating_int = 0
-        rating_int = max(1, min(10, rating_int)) if rating_int else 0
-
-        def as_list_text(key: str) -> list[str]:
-            rohwert = daten.get(key, [])
-            if not isinstance(rohwert, list):
-                return []
-            return [str(eintrag) for eintrag in rohwert if str(eintrag).strip()]
-
-        def as_list_dict(key: str) -> list[dict[str, Any]]:
-            rohwert = daten.get(key, [])
-            if not isinstance(rohwert, list):
-                return []
-            return [eintrag for eintrag in rohwert if isinstance(eintrag, dict)]
-
-        return {
-            "persona": "meisterbaecker",
-            "overall_rating_1_10": rating_int,
-            "summary": str(daten.get("summary", "")).strip(),
-            "strengths": as_list_text("strengths"),
-            "issues": as_list_dict("issues"),
-            "missing_data_suggestions": as_list_dict("missing_data_suggestions"),
-            "ingredient_usage_suggestions": as_list_dict("ingredient_usage_suggestions"),
-            "next_actions": as_list_text("next_actions"),
-        }
-
     def _zeige_review_kompakt(self, review: dict[str, Any]) -> None:
         rating = int(review.get("overall_rating_1_10") or 0)
         if rating >= 8:
@@ -1233,79 +892,6 @@ ROHANTWORT:
             return f"Liste mit {len(value)} Eintraegen"
         return "-"
 
-    def _wende_ingredient_suggestions_an(
-        self,
-        backvorgang: Backvorgang,
-        review: dict[str, Any],
-    ) -> int:
-        aenderungen = self._ermittle_ingredient_suggestion_aenderungen(backvorgang, review)
-        return self._wende_ingredient_aenderungen_an(backvorgang, aenderungen)
-
-    def _ermittle_ingredient_suggestion_aenderungen(
-        self,
-        backvorgang: Backvorgang,
-        review: dict[str, Any],
-    ) -> list[dict[str, Any]]:
-        vorschlaege = self._extrahiere_ingredient_suggestions(review)
-        if not vorschlaege:
-            return []
-
-        bestehend_index = {
-            (eintrag.mehl_id or "").lower(): eintrag
-            for eintrag in backvorgang.ingredient_usage
-        }
-        gesammelt: dict[str, dict[str, Any]] = {}
-
-        for vorschlag in vorschlaege:
-            ingredient_id = (vorschlag.get("ingredient_id") or "").strip()
-            if not ingredient_id:
-                continue
-
-            key = ingredient_id.lower()
-            planned = self._to_float_oder_none(vorschlag.get("planned_g"))
-            actual = self._to_float_oder_none(vorschlag.get("actual_g"))
-
-            if key not in gesammelt:
-                alt = bestehend_index.get(key)
-                old_planned = alt.planned_g if alt is not None else None
-                old_actual = alt.actual_g if alt is not None else None
-                gesammelt[key] = {
-                    "ingredient_id": alt.mehl_id if alt is not None else ingredient_id,
-                    "mode": "update" if alt is not None else "add",
-                    "old_planned_g": old_planned,
-                    "new_planned_g": (
-                        round(max(0.0, old_planned), 3) if old_planned is not None else 0.0
-                    ),
-                    "old_actual_g": old_actual,
-                    "new_actual_g": (
-                        round(max(0.0, old_actual), 3) if old_actual is not None else 0.0
-                    ),
-                }
-
-            if planned is not None:
-                gesammelt[key]["new_planned_g"] = round(max(0.0, planned), 3)
-            if actual is not None:
-                gesammelt[key]["new_actual_g"] = round(max(0.0, actual), 3)
-
-        aenderungen: list[dict[str, Any]] = []
-        for eintrag in gesammelt.values():
-            old_planned = eintrag.get("old_planned_g")
-            old_actual = eintrag.get("old_actual_g")
-            if eintrag["mode"] == "add":
-                aenderungen.append(eintrag)
-                continue
-
-            planned_changed = (
-                old_planned is None or round(float(old_planned), 3) != eintrag["new_planned_g"]
-            )
-            actual_changed = (
-                old_actual is None or round(float(old_actual), 3) != eintrag["new_actual_g"]
-            )
-            if planned_changed or actual_changed:
-                aenderungen.append(eintrag)
-
-        return sorted(aenderungen, key=lambda x: str(x.get("ingredient_id", "")).lower())
-
     def _zeige_ingredient_diff_vorschau(self, aenderungen: list[dict[str, Any]]) -> None:
         tabelle = baue_standard_tabelle(
             titel="KI-Vorschau | ingredient_usage Diff",
@@ -1341,147 +927,13 @@ ROHANTWORT:
         with self.renderer.suspended():
             self.renderer.console.print(tabelle)
 
-    def _wende_ingredient_aenderungen_an(
-        self,
-        backvorgang: Backvorgang,
-        aenderungen: list[dict[str, Any]],
-    ) -> int:
-        if not aenderungen:
-            return 0
-
-        index = {
-            (eintrag.mehl_id or "").lower(): eintrag
-            for eintrag in backvorgang.ingredient_usage
-        }
-        anzahl = 0
-
-        for aenderung in aenderungen:
-            ingredient_id = str(aenderung.get("ingredient_id", "")).strip()
-            if not ingredient_id:
-                continue
-
-            planned = self._to_float_oder_none(aenderung.get("new_planned_g"))
-            actual = self._to_float_oder_none(aenderung.get("new_actual_g"))
-
-            ziel = index.get(ingredient_id.lower())
-            if ziel is None:
-                ziel = ZutatenVerbrauch(
-                    mehl_id=ingredient_id,
-                    planned_g=max(0.0, planned) if planned is not None else 0.0,
-                    actual_g=max(0.0, actual) if actual is not None else 0.0,
-                    stock_deducted_g=max(0.0, actual) if actual is not None else 0.0,
-                )
-                backvorgang.ingredient_usage.append(ziel)
-                index[ingredient_id.lower()] = ziel
-                anzahl += 1
-                continue
-
-            geaendert = False
-            if planned is not None:
-                ziel.planned_g = round(max(0.0, planned), 3)
-                geaendert = True
-            if actual is not None:
-                ziel.actual_g = round(max(0.0, actual), 3)
-                ziel.stock_deducted_g = round(max(0.0, actual), 3)
-                geaendert = True
-            if geaendert:
-                anzahl += 1
-
-        return anzahl
-
-    def _extrahiere_ingredient_suggestions(self, review: dict[str, Any]) -> list[dict[str, Any]]:
-        gesammelt: list[dict[str, Any]] = []
-
-        direkte = review.get("ingredient_usage_suggestions", [])
-        if isinstance(direkte, list):
-            for eintrag in direkte:
-                if not isinstance(eintrag, dict):
-                    continue
-                gesammelt.append(
-                    {
-                        "ingredient_id": str(
-                            eintrag.get("ingredient_id")
-                            or eintrag.get("mehl_id")
-                            or ""
-                        ).strip(),
-                        "planned_g": eintrag.get("planned_g"),
-                        "actual_g": eintrag.get("actual_g"),
-                        "note": str(eintrag.get("note", "")).strip(),
-                    }
-                )
-
-        missing = review.get("missing_data_suggestions", [])
-        if isinstance(missing, list):
-            for eintrag in missing:
-                if not isinstance(eintrag, dict):
-                    continue
-                feld = str(eintrag.get("field", "")).strip().lower()
-                if feld != "ingredient_usage":
-                    continue
-                sv = eintrag.get("suggested_value")
-                if not isinstance(sv, list):
-                    continue
-                for kandidat in sv:
-                    if not isinstance(kandidat, dict):
-                        continue
-                    gesammelt.append(
-                        {
-                            "ingredient_id": str(
-                                kandidat.get("ingredient_id")
-                                or kandidat.get("mehl_id")
-                                or ""
-                            ).strip(),
-                            "planned_g": kandidat.get("planned_g"),
-                            "actual_g": kandidat.get("actual_g"),
-                            "note": str(kandidat.get("note", "")).strip(),
-                        }
-                    )
-
-        return gesammelt
-
-    def _speichere_ki_review(
-        self,
-        backvorgaenge: list[Backvorgang],
-        index: int,
-        review: dict[str, Any],
-    ) -> None:
-        ziel = backvorgaenge[index]
-        review_eintrag = {
-            "created_at": datetime.now().astimezone().isoformat(timespec="seconds"),
-            "model": self.model_name,
-            "review": review,
-        }
-        bestehend = ziel.custom.get("ki_reviews")
-        if isinstance(bestehend, list):
-            bestehend.append(review_eintrag)
-        else:
-            ziel.custom["ki_reviews"] = [review_eintrag]
-
     def _hole_rezept(self, rezept_id: str) -> BrotRezept | None:
-        rezepte = self.rezeptManager.laden(BrotRezept)
-        for rezept in rezepte:
-            if rezept.id == rezept_id:
-                return rezept
-        return None
+        return self.rezeptRepository.get(rezept_id)
 
     def _to_float_oder_none(self, value: Any) -> float | None:
-        if value is None:
-            return None
-        if isinstance(value, (int, float)):
-            return float(value)
-        if isinstance(value, str):
-            text = value.strip().replace(",", ".")
-            if not text:
-                return None
-            try:
-                return float(text)
-            except ValueError:
-                return None
-        return None
+        return als_float_oder_none(value)
 
-    def _zaehle_offene_schritte(self, backvorgang: Backvorgang) -> int:
-        return sum(
-            1
-            for schritt in backvorgang.step_runs
-            if schritt.actual_end_at is None and schritt.actual_duration_min is None
-        )
+    def _zaehle_offene_schritte(
+        self, backvorgang: Backvorgang | BackvorgangIndexEintrag
+    ) -> int:
+        return backvorgang.anzahl_offene_schritte()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(slots=True)
+class KiVerlaufEintrag:
+    id: str
+    created_at: str
+    backvorgang_id: str
+    recipe_id: str
+    recipe_name: str
+    model: str
+    status_snapshot: str
+    user_question: str = ""
+    overall_rating_1_10: int = 0
+    summary: str = ""
+    review: dict[str, Any] = field(default_factory=dict)
+    ingredient_changes_applied: int = 0
+    review_in_backvorgang_saved: bool = False
+    extra_fields: dict[str, Any] | None = None
+
+    @classmethod
+    def from_dict(cls, daten: dict[str, Any]) -> "KiVerlaufEintrag":
+        known_keys = {
+            "id",
+            "created_at",
+            "backvorgang_id",
+            "recipe_id",
+            "recipe_name",
+            "model",
+            "status_snapshot",
+            "user_question",
+            "overall_rating_1_10",
+            "summary",
+            "review",
+            "ingredient_changes_applied",
+            "review_in_backvorgang_saved",
+        }
+        extra_fields = {k: v for k, v in daten.items() if k not in known_keys}
+
+        try:
+            rating = int(daten.get("overall_rating_1_10", 0))
+        except (TypeError, ValueError):
+            rating = 0
+
+        try:
+            applied = int(daten.get("ingredient_changes_applied", 0))
+        except (TypeError, ValueError):
+            applied = 0
+
+        review = daten.get("review", {})
+        if not isinstance(review, dict):
+            review = {}
+
+        return cls(
+            id=str(daten.get("id", "")).strip(),
+            created_at=str(daten.get("created_at", "")).strip(),
+            backvorgang_id=str(daten.get("backvorgang_id", "")).strip(),
+            recipe_id=str(daten.get("recipe_id", "")).strip(),
+            recipe_name=str(daten.get("recipe_name", "")).strip(),
+            model=str(daten.get("model", "")).strip(),
+            status_snapshot=str(daten.get("status_snapshot", "")).strip(),
+            user_question=str(daten.get("user_question", "")).strip(),
+            overall_rating_1_10=max(0, min(10, rating)),
+            summary=str(daten.get("summary", "")).strip(),
+            review=review,
+            ingredient_changes_applied=max(0, applied),
+            review_in_backvorgang_saved=bool(daten.get("review_in_backvorgang_saved", False)),
+            extra_fields=extra_fields or None,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        result = {
+            "id": self.id,
+            "created_at": self.created_at,
+            "backvorgang_id": self.backvorgang_id,
+            "recipe_id": self.recipe_id,
+            "recipe_name": self.recipe_name,
+            "model": self.model,
+            "status_snapshot": self.status_snapshot,
+            "user_question": self.user_question,
+            "overall_rating_1_10": self.overall_rating_1_10,
+            "summary": self.summary,
+            "review": self.review,
+            "ingredient_changes_applied": self.ingredient_changes_applied,
+            "review_in_backvorgang_saved": self.review_in_backvorgang_saved,
+        }
+        for key, value in (self.extra_fields or {}).items():
+            if key not in result:
+                result[key] = value
+        return result
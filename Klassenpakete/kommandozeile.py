@@ -0,0 +1,354 @@
+# Diese Datei enthält die nicht-interaktive Kommandozeile (ohne LiveRenderer und Menüs),
+# z. B. für cron-Jobs und Shell-Skripte. Sie nutzt dieselben Dienste wie die Menüs;
+# rich und google.genai werden nicht geladen (die KI erst bei "ai review").
+# Ausgabe ist JSON auf stdout, Fehler stehen auf stderr (Rückgabewert 1).
+#
+#   python3 -m Klassenpakete bake create brot_roggen_001 --faktor 2
+#   python3 -m Klassenpakete bake step-complete bv_2024_06_01_001 --temp 24.5
+#   python3 -m Klassenpakete bake complete bv_2024_06_01_001 --bewertung 4
+#   python3 -m Klassenpakete bake abort bv_2024_06_01_001 --grund "Teig zu weich"
+#   python3 -m Klassenpakete stock deduct --mehl mehl_weizen_550 --gramm 500
+#   python3 -m Klassenpakete recipe scale brot_roggen_001 0.5
+#   python3 -m Klassenpakete ai review bv_2024_06_01_001 --frage "Warum so flach?"
+
+import argparse
+import json
+import sys
+from datetime import date
+from typing import Any, Callable
+
+from Klassenpakete.backvorgang import Backvorgang, SchrittDurchlauf
+from Klassenpakete.brot_rezept import BrotRezept
+from Klassenpakete.services import (
+    BackvorgangService,
+    KiFehler,
+    KiReviewService,
+    MehlbestandService,
+    RezeptService,
+)
+
+
+class KommandoFehler(Exception):
+    """Ungültige Angabe auf der Kommandozeile (z. B. unbekannte id)."""
+
+
+def _ausgeben(daten: Any) -> None:
+    print(json.dumps(daten, ensure_ascii=False, indent=2))
+
+
+def _hole_backvorgang(service: BackvorgangService, backvorgangId: str) -> Backvorgang:
+    backvorgang = service.hole(backvorgangId)
+    if backvorgang is None:
+        raise KommandoFehler(f"Backvorgang {backvorgangId} nicht gefunden.")
+    return backvorgang
+
+
+def _hole_rezept(service: RezeptService, rezeptId: str) -> BrotRezept:
+    rezept = service.hole(rezeptId)
+    if rezept is None:
+        raise KommandoFehler(f"Rezept {rezeptId} nicht gefunden.")
+    return rezept
+
+
+def _datum(text: str) -> str:
+    try:
+        return date.fromisoformat(text).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"kein Datum (JJJJ-MM-TT): {text}") from None
+
+
+def _positive_zahl(text: str) -> float:
+    try:
+        wert = float(text.replace(",", "."))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"keine Zahl: {text}") from None
+    if wert <= 0:
+        raise argparse.ArgumentTypeError("muss groesser als 0 sein")
+    return wert
+
+
+def bake_list(optionen: argparse.Namespace) -> None:
+    service = BackvorgangService()
+    _ausgeben(
+        [
+            eintrag.to_dict()
+            for eintrag in service.backvorgangRepository.uebersicht(*optionen.status)
+        ]
+    )
+
+
+def bake_show(optionen: argparse.Namespace) -> None:
+    service = BackvorgangService()
+    _ausgeben(_hole_backvorgang(service, optionen.backvorgang_id).to_dict())
+
+
+def bake_create(optionen: argparse.Namespace) -> None:
+    service = BackvorgangService()
+    rezept = _hole_rezept(service.rezeptService, optionen.rezept_id)
+    backvorgang = service.anlegen(rezept, optionen.faktor, optionen.datum)
+    _ausgeben(backvorgang.to_dict())
+
+
+def bake_step_start(optionen: argparse.Namespace) -> None:
+    service = BackvorgangService()
+    backvorgang = _hole_backvorgang(service, optionen.backvorgang_id)
+    schritt = _waehle_schritt(service, backvorgang, optionen.schritt)
+    service.starte_schritt(backvorgang, schritt)
+    service.speichern(backvorgang)
+    _ausgeben(_schritt_ergebnis(service, backvorgang, schritt))
+
+
+def bake_step_complete(optionen: argparse.Namespace) -> None:
+    service = BackvorgangService()
+    backvorgang = _hole_backvorgang(service, optionen.backvorgang_id)
+    schritt = _waehle_schritt(service, backvorgang, optionen.schritt)
+    service.schliesse_schritt_ab(
+        backvorgang,
+        schritt,
+        avg_temp_c=optionen.temp,
+        note=optionen.notiz,
+        dauer_min=optionen.dauer,
+    )
+    service.speichern(backvorgang)
+    _ausgeben(_schritt_ergebnis(service, backvorgang, schritt))
+
+
+def bake_complete(optionen: argparse.Namespace) -> None:
+    service = BackvorgangService()
+    backvorgang = _hole_backvorgang(service, optionen.backvorgang_id)
+    if backvorgang.status in ("completed", "aborted"):
+        raise KommandoFehler(
+            f"Backvorgang {backvorgang.id} ist bereits beendet ({backvorgang.status})."
+        )
+
+    service.markiere_abgeschlossen(backvorgang)
+    if not optionen.ist_beibehalten:
+        service.uebernehme_soll_als_ist(backvorgang)
+    service.erfasse_ergebnis(backvorgang, rating=optionen.bewertung, notes=optionen.notiz)
+
+    abbuchung = None
+    if not optionen.ohne_abbuchung:
+        abbuchung = service.ziehe_bestand_ab(backvorgang)
+    service.speichern(backvorgang)
+    _ausgeben(
+        {
+            "backvorgang": backvorgang.to_dict(),
+            "abbuchung": abbuchung.to_dict() if abbuchung is not None else None,
+        }
+    )
+
+
+def bake_abort(optionen: argparse.Namespace) -> None:
+    service = BackvorgangService()
+    backvorgang = _hole_backvorgang(service, optionen.backvorgang_id)
+    if backvorgang.status in ("completed", "aborted"):
+        raise KommandoFehler(
+            f"Backvorgang {backvorgang.id} ist bereits beendet ({backvorgang.status})."
+        )
+    service.abbrechen(backvorgang, grund=optionen.grund)
+    service.speichern(backvorgang)
+    _ausgeben(backvorgang.to_dict())
+
+
+def stock_list(optionen: argparse.Namespace) -> None:
+    service = MehlbestandService()
+    _ausgeben([mehl.to_dict() for mehl in service.alle()])
+
+
+def stock_deduct(optionen: argparse.Namespace) -> None:
+    if optionen.mehl is not None:
+        if optionen.backvorgang_id is not None:
+            raise KommandoFehler("Entweder BACKVORGANG_ID oder --mehl angeben.")
+        if optionen.gramm is None:
+            raise KommandoFehler("--mehl braucht --gramm.")
+        aenderung = MehlbestandService().buche_ab(optionen.mehl, optionen.gramm)
+        if aenderung is None:
+            raise KommandoFehler(f"Mehl {optionen.mehl} nicht im Bestand gefuehrt.")
+        _ausgeben(aenderung.to_dict())
+        return
+
+    if optionen.backvorgang_id is None:
+        raise KommandoFehler("BACKVORGANG_ID oder --mehl/--gramm angeben.")
+    service = BackvorgangService()
+    backvorgang = _hole_backvorgang(service, optionen.backvorgang_id)
+    abbuchung = service.ziehe_bestand_ab(backvorgang)
+    if not abbuchung.bereits_abgebucht:
+        service.speichern(backvorgang)
+    _ausgeben(abbuchung.to_dict())
+
+
+def recipe_list(optionen: argparse.Namespace) -> None:
+    service = RezeptService()
+    rezepte = service.alle() if optionen.alle else service.aktive_rezepte()
+    _ausgeben(
+        [
+            {"id": rezept.id, "name": rezept.name, "status": rezept.status}
+            for rezept in rezepte
+        ]
+    )
+
+
+def recipe_scale(optionen: argparse.Namespace) -> None:
+    service = RezeptService()
+    rezept = _hole_rezept(service, optionen.rezept_id)
+    _ausgeben(service.skalieren(rezept, optionen.faktor).to_dict())
+
+
+def ai_review(optionen: argparse.Namespace) -> None:
+    backvorgangService = BackvorgangService()
+    kiService = KiReviewService()
+    backvorgang = _hole_backvorgang(backvorgangService, optionen.backvorgang_id)
+    rezept = backvorgangService.rezeptService.hole(backvorgang.recipe_id)
+
+    review = kiService.frage_meisterbaecker(backvorgang, rezept, optionen.frage)
+    aenderungen: list[dict[str, Any]] = []
+    uebernommen = 0
+    if optionen.vorschlaege_anwenden:
+        aenderungen = kiService.ermittle_zutaten_aenderungen(backvorgang, review)
+        uebernommen = kiService.wende_zutaten_aenderungen_an(backvorgang, aenderungen)
+
+    speichern = not optionen.nicht_speichern
+    if speichern:
+        kiService.speichere_review(backvorgang, review)
+    kiService.speichere_verlauf(
+        backvorgang=backvorgang,
+        review=review,
+        user_question=optionen.frage,
+        ingredient_changes_applied=uebernommen,
+        review_in_backvorgang_saved=speichern,
+    )
+    if speichern or uebernommen:
+        backvorgangService.speichern(backvorgang)
+    if optionen.vorschlaege_anwenden:
+        _ausgeben({"review": review, "ingredient_changes": aenderungen})
+    else:
+        _ausgeben(review)
+
+
+def _waehle_schritt(
+    service: BackvorgangService, backvorgang: Backvorgang, schrittKey: str | None
+) -> SchrittDurchlauf:
+    schritt = service.finde_schritt(backvorgang, schrittKey)
+    if schritt is None:
+        if schrittKey is None:
+            raise KommandoFehler(f"Backvorgang {backvorgang.id} hat keine offenen Schritte.")
+        raise KommandoFehler(f"Schritt {schrittKey} gibt es in {backvorgang.id} nicht.")
+    return schritt
+
+
+def _schritt_ergebnis(
+    service: BackvorgangService, backvorgang: Backvorgang, schritt: SchrittDurchlauf
+) -> dict[str, Any]:
+    return {
+        "backvorgang_id": backvorgang.id,
+        "status": backvorgang.status,
+        "schritt": schritt.to_dict(),
+        "offene_schritte": len(service.offene_schritte(backvorgang)),
+    }
+
+
+def _baue_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python3 -m Klassenpakete",
+        description="Brot-Backer ohne Terminal-Oberflaeche (Ausgabe als JSON)",
+    )
+    bereiche = parser.add_subparsers(dest="bereich", required=True)
+
+    def kommando(
+        unterparser: Any, name: str, hilfe: str, funktion: Callable[[argparse.Namespace], None]
+    ) -> argparse.ArgumentParser:
+        befehl = unterparser.add_parser(name, help=hilfe, description=hilfe)
+        befehl.set_defaults(funktion=funktion)
+        return befehl
+
+    bake = bereiche.add_parser("bake", help="Backvorgaenge").add_subparsers(
+        dest="kommando", required=True
+    )
+    befehl = kommando(bake, "list", "Backvorgaenge auflisten", bake_list)
+    befehl.add_argument("--status", nargs="*", default=[], help="nur diese Status")
+    befehl = kommando(bake, "show", "Backvorgang vollstaendig anzeigen", bake_show)
+    befehl.add_argument("backvorgang_id")
+    befehl = kommando(bake, "create", "Backvorgang aus einem Rezept anlegen", bake_create)
+    befehl.add_argument("rezept_id")
+    befehl.add_argument("--faktor", type=_positive_zahl, default=1.0, help="Scale-Faktor")
+    befehl.add_argument("--datum", type=_datum, help="geplantes Backdatum (Standard: heute)")
+    befehl = kommando(bake, "step-start", "Schritt starten", bake_step_start)
+    befehl.add_argument("backvorgang_id")
+    befehl.add_argument("--schritt", help="Schritt-key (Standard: erster offener Schritt)")
+    befehl = kommando(bake, "step-complete", "Schritt abschliessen", bake_step_complete)
+    befehl.add_argument("backvorgang_id")
+    befehl.add_argument("--schritt", help="Schritt-key (Standard: erster offener Schritt)")
+    befehl.add_argument("--temp", type=float, help="Durchschnittstemperatur in C")
+    befehl.add_argument("--notiz", default="", help="Notiz zum Schritt")
+    befehl.add_argument(
+        "--dauer",
+        type=int,
+        help="Dauer in Minuten (Standard: seit Start, bei nie gestarteten Schritten die geplante Dauer)",
+    )
+    befehl = kommando(
+        bake, "complete", "Backvorgang abschliessen und Mehlbestand abbuchen", bake_complete
+    )
+    befehl.add_argument("backvorgang_id")
+    befehl.add_argument(
+        "--ist-beibehalten",
+        action="store_true",
+        help="Ist-Verbrauch nicht aus den Sollmengen uebernehmen",
+    )
+    befehl.add_argument("--bewertung", type=int, choices=range(1, 6), help="Bewertung 1-5")
+    befehl.add_argument("--notiz", default="", help="Notizen zum Backvorgang")
+    befehl.add_argument("--ohne-abbuchung", action="store_true", help="Bestand nicht abbuchen")
+    befehl = kommando(bake, "abort", "Backvorgang abbrechen", bake_abort)
+    befehl.add_argument("backvorgang_id")
+    befehl.add_argument("--grund", default="", help="Abbruchgrund (wird an die Notizen angehaengt)")
+
+    stock = bereiche.add_parser("stock", help="Mehlbestand").add_subparsers(
+        dest="kommando", required=True
+    )
+    kommando(stock, "list", "Mehle mit Bestand auflisten", stock_list)
+    befehl = kommando(
+        stock, "deduct", "Verbrauch eines Backvorgangs oder eine Menge abbuchen", stock_deduct
+    )
+    befehl.add_argument("backvorgang_id", nargs="?")
+    befehl.add_argument("--mehl", help="Mehl-id fuer eine einzelne Abbuchung")
+    befehl.add_argument("--gramm", type=int, help="abzubuchende Menge in g")
+
+    recipe = bereiche.add_parser("recipe", help="Rezepte").add_subparsers(
+        dest="kommando", required=True
+    )
+    befehl = kommando(recipe, "list", "Rezepte auflisten", recipe_list)
+    befehl.add_argument("--alle", action="store_true", help="auch archivierte Rezepte")
+    befehl = kommando(recipe, "scale", "Rezeptmengen skalieren", recipe_scale)
+    befehl.add_argument("rezept_id")
+    befehl.add_argument("faktor", type=_positive_zahl)
+
+    ai = bereiche.add_parser("ai", help="KI-Assistent").add_subparsers(
+        dest="kommando", required=True
+    )
+    befehl = kommando(ai, "review", "Backvorgang von der KI bewerten lassen", ai_review)
+    befehl.add_argument("backvorgang_id")
+    befehl.add_argument("--frage", default="", help="optionale Zusatzfrage")
+    befehl.add_argument(
+        "--nicht-speichern",
+        action="store_true",
+        help="Bewertung nur im KI-Verlauf, nicht im Backvorgang speichern",
+    )
+    befehl.add_argument(
+        "--vorschlaege-anwenden",
+        action="store_true",
+        help="Mengenvorschlaege der KI in ingredient_usage uebernehmen",
+    )
+    return parser
+
+
+def main(argumente: list[str] | None = None) -> int:
+    optionen = _baue_parser().parse_args(argumente)
+    try:
+        optionen.funktion(optionen)
+    except (KommandoFehler, KiFehler, OSError, ValueError) as fehler:
+        print(f"Fehler: {fehler}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
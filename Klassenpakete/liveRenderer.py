@@ -1,10 +1,12 @@
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 from typing import List, Optional
 
-from rich.console import Console
+from rich.console import Console, Group
 from rich.live import Live
 from rich.table import Table
+from rich.text import Text
 
+from Klassenpakete.hintergrund import Hintergrund, hintergrund
 from Klassenpakete.mehl import Mehl
 from Klassenpakete.navigation import Navigation
 from Klassenpakete.ui_layout import (
@@ -24,7 +26,9 @@ class LiveRenderer:
     Kann für Mehle, Brote oder andere Listen genutzt werden.
     """
 
-    def __init__(self):
+    def __init__(self, navigation: Optional[Navigation] = None):
+        # Mit navigation wird deren Eingabe-Sitzung für input() in suspended() pausiert
+        self.navigation: Optional[Navigation] = navigation
         self.console = Console(width=TERMINAL_ZIEL_BREITE)
         self._live: Live = Live(
             console=self.console,
@@ -33,6 +37,7 @@ class LiveRenderer:
             transient=True,
         )
         self._ist_aktiv: bool = False
+        self.hintergrund: Hintergrund = hintergrund()
 
     def baue_mehle_tabelle(
         self,
@@ -188,7 +193,8 @@ class LiveRenderer:
     def suspended(self):
         self.pause()
         try:
-            yield
+            with self.navigation.eingabe_pausiert() if self.navigation else nullcontext():
+                yield
         finally:
             self.resume()
 
@@ -201,20 +207,29 @@ class LiveRenderer:
 
         Pfeiltasten/OPTIONEN → Loop weiterlaufen
         BACK oder ENTER → Loop beenden, Rückgabe an Aufrufer
+
+        Solange Hintergrund-Aufträge laufen, wird auch ohne Taste jede Sekunde
+        deren Fortschritt neu gezeichnet (render_funktion wird dafür nicht erneut aufgerufen).
+        Die Eingabe-Sitzung bleibt für die ganze Schleife offen.
         """
         self.resume()
 
-        while True:
-            renderbares_objekt = render_funktion()
-            self._live.update(renderbares_objekt, refresh=True)
+        with navigation.eingabe_sitzung():
+            while True:
+                renderbares_objekt = render_funktion()
+                self._live.update(self._mit_hintergrund(renderbares_objekt), refresh=True)
+
+                taste = self._warte_auf_taste(navigation)
+                while taste is None:
+                    self._live.update(self._mit_hintergrund(renderbares_objekt), refresh=True)
+                    taste = self._warte_auf_taste(navigation)
 
-            taste = navigation.lese_taste()
-            result = input_handler(taste)
+                result = input_handler(taste)
 
-            # Loop nur beenden, wenn BACK oder ENTER erkannt wird
-            if result is not None:
-                return result
-            # sonst weiterlaufen (z.B. Pfeiltasten) ohne None zurückzugeben
+                # Loop nur beenden, wenn BACK oder ENTER erkannt wird
+                if result is not None:
+                    return result
+                # sonst weiterlaufen (z.B. Pfeiltasten) ohne None zurückzugeben
 
     def update(self, renderbares_objekt) -> None:
         """
@@ -222,3 +237,42 @@ class LiveRenderer:
         """
         self.resume()
         self._live.update(renderbares_objekt, refresh=True)
+
+    def baue_hintergrund_zeilen(self) -> Text | None:
+        """
+        Eine Zeile je Hintergrund-Auftrag (laufend, fertig oder fehlgeschlagen).
+        """
+        aufgaben = self.hintergrund.aufgaben()
+        if not aufgaben:
+            return None
+
+        zeilen = Text()
+        for aufgabe in aufgaben:
+            if zeilen:
+                zeilen.append("\n")
+            if aufgabe.laeuft():
+                zeilen.append(
+                    f"⏳ {aufgabe.titel} laeuft ({int(aufgabe.vergangene_sekunden())} s)",
+                    style="yellow",
+                )
+                continue
+            if aufgabe.ist_fehlgeschlagen():
+                zeilen.append(f"✖ {aufgabe.titel} fehlgeschlagen", style="bold red")
+            else:
+                zeilen.append(f"✔ {aufgabe.titel} fertig", style="bold green")
+            if aufgabe.hinweis:
+                zeilen.append(f" | abrufen: {aufgabe.hinweis}", style="dim")
+        return zeilen
+
+    def _mit_hintergrund(self, renderbares_objekt):
+        zeilen = self.baue_hintergrund_zeilen()
+        if zeilen is None:
+            return renderbares_objekt
+        return Group(renderbares_objekt, zeilen)
+
+    def _warte_auf_taste(self, navigation: Navigation) -> str | None:
+        # Ohne laufende Aufträge blockierend lesen, sonst bis zur nächsten vollen Sekunde
+        wartezeit = self.hintergrund.sekunden_bis_anzeigewechsel()
+        if wartezeit is None:
+            return navigation.lese_taste()
+        return navigation.lese_taste_mit_timeout(wartezeit)
@@ -0,0 +1,303 @@
+# Diese Datei enthält den Massenimport und -export der Daten (JSON Lines und CSV).
+# Gelesen und geschrieben wird zeilenweise, ohne die ganze Datei im Speicher zu halten.
+# Jeder importierte Eintrag durchläuft die Schema-Migrationen der Zieldatei und wird über
+# from_dict() der Modellklasse geprüft, doppelte ids werden übersprungen und neue Einträge stapelweise mit einem Schreibvorgang gespeichert.
+#
+#   python3 -m Klassenpakete.massendaten export backvorgaenge export/backvorgaenge.jsonl
+#   python3 -m Klassenpakete.massendaten import backvorgaenge historie.csv --stapel 1000
+#   python3 -m Klassenpakete.massendaten import mehle mehle.jsonl --ersetzen
+#
+# CSV: eine Spalte je Feld der obersten Ebene. Zahlen, Wahrheitswerte, Listen und
+# verschachtelte Objekte stehen als JSON in der Zelle, Texte unverändert. Texte, die
+# selbst als JSON lesbar wären ("null", "42", "true", ""), werden als JSON-String
+# geschrieben, damit sie beim Import Texte bleiben; leere Zellen gelten als fehlendes
+# Feld (from_dict setzt dann den Standardwert).
+
+import argparse
+import csv
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+from Klassenpakete import json_codec, migrationen
+from Klassenpakete.backvorgang import Backvorgang
+from Klassenpakete.brot_rezept import BrotRezept
+from Klassenpakete.mehl import Mehl
+from Klassenpakete.speicher import Datenspeicher, erzeuge_manager
+
+
+@dataclass(slots=True)
+class Datenart:
+    datei: str
+    klasse: type
+    journal: bool = False
+
+    def manager(self) -> Datenspeicher:
+        return erzeuge_manager(self.datei, journal=self.journal)
+
+    @property
+    def schema(self) -> str:
+        # Schlüssel der Migrationskette, z. B. "backvorgaenge.json"
+        return Path(self.datei).name
+
+
+DATENARTEN: dict[str, Datenart] = {
+    "backvorgaenge": Datenart("daten/backvorgaenge.json", Backvorgang, journal=True),
+    "rezepte": Datenart("daten/brote.json", BrotRezept),
+    "mehle": Datenart("daten/mehle.json", Mehl),
+}
+
+FORMATE: dict[str, str] = {
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".csv": "csv",
+}
+
+STANDARD_STAPEL: int = 500
+# Höchstens so viele Fehlermeldungen sammeln, gezählt werden alle
+MAX_FEHLERMELDUNGEN: int = 50
+
+
+@dataclass(slots=True)
+class ImportErgebnis:
+    gelesen: int = 0
+    neu: int = 0
+    ersetzt: int = 0
+    doppelt: int = 0
+    fehlerhaft: int = 0
+    fehler: list[str] = field(default_factory=list)
+
+    def melde_fehler(self, zeile: int, meldung: str) -> None:
+        self.fehlerhaft += 1
+        if len(self.fehler) < MAX_FEHLERMELDUNGEN:
+            self.fehler.append(f"Zeile {zeile}: {meldung}")
+
+
+class _NurId:
+    # Für iter_items(): liest nur die id, ohne das Modell aufzubauen
+    @staticmethod
+    def from_dict(daten: dict[str, Any]) -> str:
+        return str(daten.get("id", ""))
+
+
+def format_von(pfad: Path, angabe: str | None = None) -> str:
+    """
+    "jsonl" oder "csv", aus der Angabe oder der Dateiendung.
+    """
+    if angabe:
+        if angabe not in FORMATE.values():
+            raise ValueError(f"Unbekanntes Format: {angabe}")
+        return angabe
+    art = FORMATE.get(pfad.suffix.lower())
+    if art is None:
+        raise ValueError(f"Format von {pfad.name} unklar, bitte --format jsonl|csv angeben")
+    return art
+
+
+def exportieren(artName: str, zielPfad: Path, formatAngabe: str | None = None) -> int:
+    """
+    Schreibt alle Einträge einer Datenart als JSON Lines oder CSV.
+    Gibt die Anzahl geschriebener Einträge zurück.
+    """
+    art = DATENARTEN[artName]
+    formatName = format_von(zielPfad, formatAngabe)
+    manager = art.manager()
+    zielPfad.parent.mkdir(parents=True, exist_ok=True)
+
+    anzahl = 0
+    if formatName == "jsonl":
+        with zielPfad.open("wb") as datei:
+            for objekt in manager.iter_items(art.klasse):
+                datei.write(json_codec.dumps_zeile(objekt.to_dict()) + b"\n")
+                anzahl += 1
+        return anzahl
+
+    # Erster Durchlauf nur für die Spalten: Einträge können unterschiedliche Felder haben
+    spalten: dict[str, None] = {}
+    for objekt in manager.iter_items(art.klasse):
+        spalten.update(dict.fromkeys(objekt.to_dict()))
+
+    with zielPfad.open("w", encoding="utf-8", newline="") as datei:
+        schreiber = csv.DictWriter(datei, fieldnames=list(spalten))
+        schreiber.writeheader()
+        for objekt in manager.iter_items(art.klasse):
+            schreiber.writerow(
+                {schluessel: _zelle(wert) for schluessel, wert in objekt.to_dict().items()}
+            )
+            anzahl += 1
+    return anzahl
+
+
+def importieren(
+    artName: str,
+    quellPfad: Path,
+    formatAngabe: str | None = None,
+    stapelGroesse: int = STANDARD_STAPEL,
+    ersetzen: bool = False,
+) -> ImportErgebnis:
+    """
+    Liest Einträge aus JSON Lines oder CSV und speichert sie stapelweise.
+
+    Ungültige Zeilen werden gemeldet und übersprungen. Vorhandene ids bleiben
+    unverändert (doppelt), mit ersetzen=True werden sie überschrieben. Innerhalb
+    der Datei gilt das erste Vorkommen einer id.
+    """
+    art = DATENARTEN[artName]
+    formatName = format_von(quellPfad, formatAngabe)
+    manager = art.manager()
+    stapelGroesse = max(1, stapelGroesse)
+
+    vorhandeneIds = set(manager.iter_items(_NurId))
+    geleseneIds: set[str] = set()
+    ergebnis = ImportErgebnis()
+    stapel: list[Any] = []
+
+    zeilen = _lies_jsonl(quellPfad) if formatName == "jsonl" else _lies_csv(quellPfad)
+    for zeile, daten in zeilen:
+        ergebnis.gelesen += 1
+        if isinstance(daten, Exception):
+            ergebnis.melde_fehler(zeile, str(daten))
+            continue
+        if not isinstance(daten, dict):
+            ergebnis.melde_fehler(zeile, "kein JSON-Objekt")
+            continue
+
+        try:
+            objekt = art.klasse.from_dict(_migriere_zeile(art, daten))
+        except (TypeError, ValueError, KeyError, AttributeError) as fehler:
+            ergebnis.melde_fehler(zeile, f"ungueltig ({fehler})")
+            continue
+
+        objektId = objekt.id
+        if not objektId:
+            ergebnis.melde_fehler(zeile, "ohne id")
+            continue
+        if objektId in geleseneIds or (objektId in vorhandeneIds and not ersetzen):
+            ergebnis.doppelt += 1
+            continue
+
+        geleseneIds.add(objektId)
+        if objektId in vorhandeneIds:
+            ergebnis.ersetzt += 1
+        else:
+            ergebnis.neu += 1
+        stapel.append(objekt)
+        if len(stapel) >= stapelGroesse:
+            manager.eintraege_speichern(stapel)
+            stapel = []
+
+    if stapel:
+        manager.eintraege_speichern(stapel)
+    return ergebnis
+
+
+def _migriere_zeile(art: Datenart, daten: dict[str, Any]) -> dict[str, Any]:
+    # Ohne eigene schema_version gilt eine Zeile als ältestes Format; die Migrationen
+    # lassen bereits aktuelle Einträge unverändert
+    version = daten.pop("schema_version", 1)
+    dokument = migrationen.migriere(art.schema, {"schema_version": version, "items": [daten]})
+    return dokument["items"][0]
+
+
+def _zelle(wert: Any) -> str:
+    if wert is None:
+        return ""
+    if isinstance(wert, str) and not _als_json_lesbar(wert):
+        return wert
+    return json_codec.dumps_zeile(wert).decode("utf-8")
+
+
+def _als_json_lesbar(text: str) -> bool:
+    # Solche Texte würde _wert_aus_zelle() umdeuten (leere Zellen fehlen ganz)
+    if not text:
+        return True
+    try:
+        json_codec.loads(text)
+    except json.JSONDecodeError:
+        return False
+    return True
+
+
+def _wert_aus_zelle(text: str) -> Any:
+    try:
+        return json_codec.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+def _lies_jsonl(pfad: Path) -> Iterator[tuple[int, Any]]:
+    # Liefert (Zeilennummer, Daten); nicht lesbare Zeilen als Exception
+    with pfad.open("rb") as datei:
+        for zeile, inhalt in enumerate(datei, start=1):
+            if not inhalt.strip():
+                continue
+            try:
+                yield zeile, json_codec.loads(inhalt)
+            except json.JSONDecodeError as fehler:
+                yield zeile, ValueError(f"kein gueltiges JSON ({fehler.msg})")
+
+
+def _lies_csv(pfad: Path) -> Iterator[tuple[int, Any]]:
+    # Zellen mit verschachtelten Daten können die Standardgrenze von 128 KiB überschreiten
+    csv.field_size_limit(max(csv.field_size_limit(), 64 * 1024 * 1024))
+    with pfad.open("r", encoding="utf-8-sig", newline="") as datei:
+        leser = csv.DictReader(datei)
+        for daten in leser:
+            if None in daten:
+                yield leser.line_num, ValueError("mehr Zellen als Spalten")
+                continue
+            yield leser.line_num, {
+                schluessel: _wert_aus_zelle(text)
+                for schluessel, text in daten.items()
+                if text not in ("", None)
+            }
+
+
+def main(argumente: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python3 -m Klassenpakete.massendaten",
+        description="Massenimport und -export (JSON Lines oder CSV)",
+    )
+    parser.add_argument("aktion", choices=("import", "export"))
+    parser.add_argument("art", choices=sorted(DATENARTEN))
+    parser.add_argument("datei", type=Path)
+    parser.add_argument("--format", choices=sorted(set(FORMATE.values())))
+    parser.add_argument("--stapel", type=int, default=STANDARD_STAPEL)
+    parser.add_argument(
+        "--ersetzen", action="store_true", help="vorhandene ids ueberschreiben"
+    )
+    optionen = parser.parse_args(argumente)
+
+    try:
+        if optionen.aktion == "export":
+            anzahl = exportieren(optionen.art, optionen.datei, optionen.format)
+            print(f"{optionen.art}: {anzahl} Eintraege nach {optionen.datei}")
+            return 0
+
+        ergebnis = importieren(
+            optionen.art,
+            optionen.datei,
+            optionen.format,
+            stapelGroesse=optionen.stapel,
+            ersetzen=optionen.ersetzen,
+        )
+    except (OSError, ValueError) as fehler:
+        print(f"Fehler: {fehler}", file=sys.stderr)
+        return 1
+
+    print(
+        f"{optionen.art}: {ergebnis.gelesen} gelesen, {ergebnis.neu} neu, "
+        f"{ergebnis.ersetzt} ersetzt, {ergebnis.doppelt} doppelt, "
+        f"{ergebnis.fehlerhaft} fehlerhaft"
+    )
+    for meldung in ergebnis.fehler:
+        print(f"  {meldung}")
+    if ergebnis.fehlerhaft > len(ergebnis.fehler):
+        print(f"  ... {ergebnis.fehlerhaft - len(ergebnis.fehler)} weitere Fehler")
+    return 0 if ergebnis.fehlerhaft == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,17 @@ class Mehl:
     Entspricht der JSON-Struktur in daten/mehle.json
     """
 
+    # Feste Attribute ohne __dict__ je Instanz
+    __slots__ = (
+        "id",
+        "mehlArt",
+        "mehlTyp",
+        "eigenName",
+        "empfohleneHydration",
+        "vorhanden",
+        "vorhandenGramm",
+    )
+
     def __init__(
         self,
         mehlArt: str,
@@ -1,13 +1,12 @@
 # Dieses Modul enthält das Untermenü zur Verwaltung von Mehlen.
 # Es nutzt das bestehende Menü-, Navigations- und JSON-System.
 
-import re
-
 from rich.prompt import Prompt
 
-from Klassenpakete.json_manager import JsonManager
 from Klassenpakete.mehl import Mehl
 from Klassenpakete.menu import Menu
+from Klassenpakete.services.mehlbestand_service import MEHL_ARTEN, MehlbestandService
+from Klassenpakete.speicher import SpeicherKonflikt
 
 
 class MehleMenu:
@@ -16,12 +15,7 @@ class MehleMenu:
     Anzeigen, Hinzufügen (später auch Bearbeiten/Löschen).
     """
 
-    MEHL_ARTEN: dict[str, list[str]] = {
-        "Weizen": ["405", "550", "812", "1050", "1600", "00", "Vollkorn"],
-        "Dinkel": ["630", "1050", "Vollkorn"],
-        "Roggen": ["815", "1150", "Vollkorn"],
-        "Urgetreide": ["Emmer", "Einkorn"],
-    }
+    MEHL_ARTEN: dict[str, list[str]] = MEHL_ARTEN
 
     def __init__(self) -> None:
         # Menüeinträge für die Mehlverwaltung
@@ -35,42 +29,8 @@ class MehleMenu:
 
         self.menu: Menu = Menu(menuePunkte=self.menuePunkte)
 
-        # JSON-Verwaltung für Mehle
-        self.jsonManager: JsonManager = JsonManager("daten/mehle.json")
-
-    def _slugify(self, text: str) -> str:
-        """
-        Erzeugt aus Freitext einen stabilen ASCII-Slug für IDs.
-        """
-        ersetzungen = {
-            "ä": "ae",
-            "ö": "oe",
-            "ü": "ue",
-            "ß": "ss",
-            "Ä": "ae",
-            "Ö": "oe",
-            "Ü": "ue",
-        }
-        for alt, neu in ersetzungen.items():
-            text = text.replace(alt, neu)
-
-        text = text.lower()
-        text = re.sub(r"[^a-z0-9]+", "_", text)
-        return text.strip("_")
-
-    def _generiere_mehl_id(
-        self, mehlArt: str, mehlTyp: str, vorhandeneMehle: list[Mehl]
-    ) -> str:
-        basis = self._slugify(f"mehl_{mehlArt}_{mehlTyp}") or "mehl_unbekannt"
-        vorhandeneIds: set[str] = {m.id for m in vorhandeneMehle if m.id}
-
-        if basis not in vorhandeneIds:
-            return basis
-
-        suffix: int = 2
-        while f"{basis}_{suffix}" in vorhandeneIds:
-            suffix += 1
-        return f"{basis}_{suffix}"
+        # Fachlogik (id-Vergabe, Dubletten, Bestand) liegt im Service
+        self.mehlbestandService: MehlbestandService = MehlbestandService()
 
     def mehl_per_pfeiltasten_auswaehlen(
         self, mehle: list[Mehl], navigation
@@ -134,18 +94,14 @@ class MehleMenu:
 
                 # Wenn Gramm > 0 → auf 0 setzen
                 if mehl_aktuell.vorhandenGramm > 0:
-                    mehl_aktuell.vorhandenGramm = 0
-                    mehl_aktuell.vorhanden = False
+                    self.mehlbestandService.setze_bestand(mehl_aktuell, 0)
                 else:
                     # Eingabe NACH Beenden von Live
                     neueVorhandenGramm: str = self.prompt_gramm_eingabe(0)
-
-                    if neueVorhandenGramm.isdigit() and int(neueVorhandenGramm) > 0:
-                        mehl_aktuell.vorhandenGramm = int(neueVorhandenGramm)
-                        mehl_aktuell.vorhanden = True
-                    else:
-                        mehl_aktuell.vorhandenGramm = 0
-                        mehl_aktuell.vorhanden = False
+                    self.mehlbestandService.setze_bestand(
+                        mehl_aktuell,
+                        int(neueVorhandenGramm) if neueVorhandenGramm.isdigit() else 0,
+                    )
 
                 # Nach Änderung Loop neu starten → UI bleibt sauber
                 continue
@@ -182,10 +138,7 @@ class MehleMenu:
                 return
 
     def mehle_anzeigen(self, navigation) -> None:
-        mehle: list[Mehl] = self.jsonManager.laden(Mehl)
-
-        # Filter nur vorhandene Mehle
-        mehle_vorhanden = [m for m in mehle if m.vorhanden]
+        mehle_vorhanden: list[Mehl] = self.mehlbestandService.vorhandene()
 
         def render():
             return self.renderer.baue_mehle_tabelle(
@@ -267,37 +220,23 @@ class MehleMenu:
                 with self.renderer.suspended():
                     print("Warnung: Ungültige Hydration, Wert wird ignoriert.")
 
-        # Bestehende Mehle laden
-        mehle: list[Mehl] = self.jsonManager.laden(Mehl)
+        # Dubletten prüfen (Mehlart + Mehltyp) über den Index
+        vorhandenesMehl = self.mehlbestandService.finde_dublette(mehlArt, mehlTyp)
+        if vorhandenesMehl is not None:
+            with self.renderer.suspended():
+                print("\n❌ Dieses Mehl existiert bereits!")
+                print(vorhandenesMehl.anzeigen())
+                input("\nENTER drücken, um zurückzukehren...")
+            return
 
-        # Neues Mehl-Objekt erstellen
-        neuesMehl: Mehl = Mehl(
+        # Neues Mehl anlegen und speichern
+        neuesMehl: Mehl = self.mehlbestandService.anlegen(
             mehlArt=mehlArt,
             mehlTyp=mehlTyp,
             eigenName=eigenName,
             empfohleneHydration=empfohleneHydration,
-            vorhanden=True,
-            mehlId=self._generiere_mehl_id(mehlArt, mehlTyp, mehle),
         )
 
-        # Dubletten prüfen (Mehlart + Mehltyp)
-        for vorhandenesMehl in mehle:
-            if (
-                vorhandenesMehl.mehlArt == neuesMehl.mehlArt
-                and vorhandenesMehl.mehlTyp == neuesMehl.mehlTyp
-            ):
-                with self.renderer.suspended():
-                    print("\n❌ Dieses Mehl existiert bereits!")
-                    print(vorhandenesMehl.anzeigen())
-                    input("\nENTER drücken, um zurückzukehren...")
-                return
-
-        # Neues Mehl hinzufügen
-        mehle.append(neuesMehl)
-
-        # Alles speichern
-        self.jsonManager.speichern(mehle)
-
         with self.renderer.suspended():
             print("\nMehl wurde erfolgreich gespeichert:")
             print(neuesMehl.anzeigen())
@@ -317,7 +256,7 @@ class MehleMenu:
         """
         Ermöglicht das Bearbeiten eines bestehenden Mehls.
         """
-        mehle: list[Mehl] = self.jsonManager.laden(Mehl)
+        mehle: list[Mehl] = self.mehlbestandService.alle()
 
         if not mehle:
             with self.renderer.suspended():
@@ -373,23 +312,29 @@ class MehleMenu:
                         with self.renderer.suspended():
                             print("Ungültige Grammanzahl, alter Wert bleibt erhalten.")
             elif statusEingabe == "n":
-                mehl.vorhanden = False
-                mehl.vorhandenGramm = 0
+                self.mehlbestandService.setze_bestand(mehl, 0)
 
-            self.jsonManager.speichern(mehle)
+            # Speichert auch per SPACE umgeschaltete Bestände
+            try:
+                self.mehlbestandService.speichern()
+            except SpeicherKonflikt:
+                self._melde_konflikt()
+                return
 
             with self.renderer.suspended():
                 print("\nMehl wurde aktualisiert:")
                 print(mehl.anzeigen())
                 input("\nENTER drücken, um zurückzukehren...")
         else:
+            # Ungespeicherte SPACE-Änderungen verwerfen
+            self.mehlbestandService.verwerfen()
             return
 
     def mehl_loeschen(self, navigation) -> None:
         """
         Löscht ein bestehendes Mehl nach Bestätigung.
         """
-        mehle: list[Mehl] = self.jsonManager.laden(Mehl)
+        mehle: list[Mehl] = self.mehlbestandService.alle()
 
         if not mehle:
             with self.renderer.suspended():
@@ -401,13 +346,15 @@ class MehleMenu:
 
         # Wenn kein echtes Mehl-Objekt zurückgegeben wurde → abbrechen
         if not isinstance(mehl, Mehl):
+            self.mehlbestandService.verwerfen()
             return
 
-        if mehl.vorhanden:
+        if not self.mehlbestandService.ist_loeschbar(mehl):
             with self.renderer.suspended():
                 print("\n❌ Dieses Mehl ist noch als VORHANDEN markiert.")
                 print("Es kann erst gelöscht werden, wenn es NICHT VORHANDEN ist.")
                 input("ENTER drücken, um zurückzukehren...")
+            self.mehlbestandService.verwerfen()
             return
 
         with self.renderer.suspended():
@@ -421,11 +368,27 @@ class MehleMenu:
             with self.renderer.suspended():
                 print("Löschen abgebrochen.")
                 input("ENTER drücken, um zurückzukehren...")
+            self.mehlbestandService.verwerfen()
             return
 
-        mehle.remove(mehl)
-        self.jsonManager.speichern(mehle)
+        # Entfernen schreibt auch per SPACE umgeschaltete Bestände mit
+        try:
+            self.mehlbestandService.entfernen(mehl.id)
+        except SpeicherKonflikt:
+            self._melde_konflikt()
+            return
 
         with self.renderer.suspended():
             print("\nMehl wurde gelöscht.")
             input("ENTER drücken, um zurückzukehren...")
+
+    def _melde_konflikt(self) -> None:
+        """
+        Die Mehle wurden inzwischen an einem anderen Terminal geändert.
+        Eigene Änderungen werden verworfen, damit nichts überschrieben wird.
+        """
+        self.mehlbestandService.verwerfen()
+        with self.renderer.suspended():
+            print("\n❌ Die Mehle wurden zwischenzeitlich an anderer Stelle geändert.")
+            print("Deine Änderung wurde nicht gespeichert, bitte erneut bearbeiten.")
+            input("ENTER drücken, um zurückzukehren...")
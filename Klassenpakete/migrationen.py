@@ -0,0 +1,74 @@
+# Diese Datei enthält die Schema-Migrationen der Datendateien in daten/.
+# Jede Datei hat eine Kette von Migrationsfunktionen; die n-te Funktion hebt ein
+# Dokument von schema_version n auf n + 1. Der JsonManager wendet die Kette einmal
+# beim Laden an und speichert das Ergebnis, sodass die Modelle (from_dict) nur
+# noch das aktuelle Format kennen müssen.
+
+from typing import Any, Callable
+
+from Klassenpakete import json_codec
+
+Migration = Callable[[dict[str, Any]], dict[str, Any]]
+
+
+def _backvorgaenge_v1_zu_v2(dokument: dict[str, Any]) -> dict[str, Any]:
+    # Zutatenverbrauch: früher "ingredient_id", seit Version 2 "mehl_id"
+    for backvorgang in dokument["items"]:
+        if not isinstance(backvorgang, dict):
+            continue
+        verbrauch = backvorgang.get("ingredient_usage")
+        if not isinstance(verbrauch, list):
+            continue
+        for eintrag in verbrauch:
+            if isinstance(eintrag, dict) and "ingredient_id" in eintrag:
+                alteId = eintrag.pop("ingredient_id")
+                eintrag.setdefault("mehl_id", alteId)
+    return dokument
+
+
+# Dateiname -> Migrationen ab schema_version 1 (Index 0: 1 -> 2, Index 1: 2 -> 3, ...)
+MIGRATIONEN: dict[str, tuple[Migration, ...]] = {
+    "backvorgaenge.json": (_backvorgaenge_v1_zu_v2,),
+}
+
+
+def aktuelle_version(dateiName: str) -> int:
+    """
+    Schema-Version, die der Code für diese Datei erwartet.
+    """
+    return 1 + len(MIGRATIONEN.get(dateiName, ()))
+
+
+def gespeicherte_version(dokument: dict[str, Any] | list[Any]) -> int:
+    # Reine Listen (erstes Dateiformat) zählen als Version 0
+    if not isinstance(dokument, dict):
+        return 0
+    version = dokument.get("schema_version", 1)
+    return version if isinstance(version, int) else 1
+
+
+def braucht_migration(dateiName: str, dokument: dict[str, Any] | list[Any]) -> bool:
+    return gespeicherte_version(dokument) < aktuelle_version(dateiName)
+
+
+def migriere(dateiName: str, dokument: dict[str, Any] | list[Any]) -> dict[str, Any]:
+    """
+    Hebt ein Dokument auf die aktuelle Version. Das übergebene Dokument wird
+    nicht verändert (es kann aus dem geteilten Cache stammen).
+    Neuere Versionen als die aktuelle bleiben unverändert.
+    """
+    version = gespeicherte_version(dokument)
+    # Unabhängige Kopie, die die Migrationen frei verändern dürfen
+    ergebnis = json_codec.loads(json_codec.dumps_zeile(dokument))
+
+    if isinstance(ergebnis, list):
+        ergebnis = {"schema_version": 1, "items": ergebnis}
+    version = max(version, 1)
+    if not isinstance(ergebnis.get("items"), list):
+        ergebnis["items"] = []
+
+    for migration in MIGRATIONEN.get(dateiName, ())[version - 1 :]:
+        ergebnis = migration(ergebnis)
+        version += 1
+        ergebnis["schema_version"] = version
+    return ergebnis
@@ -1,16 +1,51 @@
 # Diese Datei kapselt die komplette Tastatur-Navigation im Terminal.
 # Sie verwendet readchar, um Pfeiltasten, ENTER und ESC zu erkennen.
 # Andere Klassen (z. B. Menu) sollen NICHT direkt mit readchar arbeiten.
-
+#
+# Schleifen, die oft mit Timeout lesen (Timer, Hintergrund-Fortschritt), öffnen
+# mit eingabe_sitzung() einmal den CBreak-Modus, statt ihn für jede Taste neu zu
+# setzen. Gelesene Bytes landen in einem Puffer, damit unvollständige
+# Escape-Sequenzen und schnell getippte Tasten zwischen zwei Aufrufen nicht
+# verloren gehen. Für input() schaltet eingabe_pausiert() kurz zurück.
+
+import codecs
+import os
 import select
 import sys
 import termios
+import time
 import tty
-import os
+from contextlib import contextmanager
+from typing import Iterator
 
 import readchar
 from readchar import key
 
+# So lange wird nach einem einzelnen ESC auf den Rest einer Pfeiltasten-Sequenz gewartet
+ESC_WARTEZEIT_SEKUNDEN: float = 0.05
+
+
+def tasten_laenge(puffer: str) -> int:
+    """
+    Länge der ersten vollständigen Taste im Puffer; 0, wenn sie noch unvollständig ist
+    (auch ein einzelnes ESC, das noch der Anfang einer Sequenz sein kann).
+    """
+    if not puffer:
+        return 0
+    if puffer[0] != "\x1b":
+        return 1
+    if len(puffer) == 1:
+        return 0
+    if puffer[1] == "O":  # SS3, z. B. Pfeiltasten im Anwendungsmodus
+        return 3 if len(puffer) >= 3 else 0
+    if puffer[1] != "[":  # ESC + Zeichen (Alt-Taste) zählt als ESC
+        return 2
+    # CSI: Parameter bis zum Endbyte 0x40-0x7E
+    for position in range(2, len(puffer)):
+        if "\x40" <= puffer[position] <= "\x7e":
+            return position + 1
+    return 0
+
 
 class Navigation:
     """
@@ -18,6 +53,14 @@ class Navigation:
     Sie stellt einfache, verständliche Methoden für die Menü-Navigation bereit.
     """
 
+    def __init__(self) -> None:
+        # Gelesene, noch nicht abgegebene Zeichen der Eingabe-Sitzung
+        self._puffer: str = ""
+        self._dekodierer = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        self._sitzung_aktiv: bool = False
+        # Terminal-Einstellungen vor der Sitzung; None, wenn stdin kein Terminal ist
+        self._alte_einstellungen: list | None = None
+
     def _interpretiere_taste(self, gedrueckteTaste: str) -> str:
         if gedrueckteTaste == key.UP or gedrueckteTaste == "\x1b[A":
             return "UP"
@@ -53,43 +96,104 @@ class Navigation:
         Liest genau eine Taste von der Tastatur ein und gibt sie zurück.
         Rückgabewerte sind symbolische Konstanten (z. B. 'UP', 'DOWN', 'ENTER', 'ESC').
         """
+        if self._sitzung_aktiv or self._puffer:
+            taste = self.lese_taste_mit_timeout(None)
+            if taste is not None:
+                return taste
 
         gedrueckteTaste: str = readchar.readkey()
         return self._interpretiere_taste(gedrueckteTaste)
 
-    def lese_taste_mit_timeout(self, timeout_sekunden: float) -> str | None:
+    def lese_taste_mit_timeout(self, timeout_sekunden: float | None) -> str | None:
         """
-        Liest eine Taste mit Timeout.
+        Liest eine Taste mit Timeout (None = ohne Timeout).
         - Taste gefunden: normaler Rueckgabewert wie in lese_taste()
         - Keine Taste innerhalb Timeout: None
+        Ohne offene eingabe_sitzung() wird sie nur für diesen Aufruf geöffnet.
+        """
+        frist = (
+            None
+            if timeout_sekunden is None
+            else time.monotonic() + max(0.0, float(timeout_sekunden))
+        )
+        with self.eingabe_sitzung():
+            while True:
+                laenge = tasten_laenge(self._puffer)
+                if laenge == 0 and self._puffer == "\x1b":
+                    # Einzelnes ESC: kommt der Rest einer Sequenz nicht gleich, ist es ESC
+                    if not self._lies_verfuegbare(ESC_WARTEZEIT_SEKUNDEN):
+                        laenge = 1
+                if laenge:
+                    taste = self._puffer[:laenge]
+                    self._puffer = self._puffer[laenge:]
+                    return self._interpretiere_taste(taste)
+
+                rest = None if frist is None else max(0.0, frist - time.monotonic())
+                if not self._lies_verfuegbare(rest):
+                    # Eine unvollständige Sequenz bleibt für den nächsten Aufruf im Puffer
+                    return None
+
+    @contextmanager
+    def eingabe_sitzung(self) -> Iterator[None]:
+        """
+        Hält das Terminal im CBreak-Modus (Zeichen sofort, ohne ENTER), bis der
+        Block endet. Verschachtelte Sitzungen nutzen die äußere mit.
+        """
+        if self._sitzung_aktiv:
+            yield
+            return
+
+        fd = sys.stdin.fileno()
+        try:
+            self._alte_einstellungen = termios.tcgetattr(fd)
+        except termios.error:
+            self._alte_einstellungen = None  # z. B. umgeleitete Eingabe
+        self._setze_cbreak(fd)
+        self._sitzung_aktiv = True
+        try:
+            yield
+        finally:
+            self._sitzung_aktiv = False
+            self._stelle_wieder_her(fd)
+
+    @contextmanager
+    def eingabe_pausiert(self) -> Iterator[None]:
+        """
+        Stellt während einer offenen Sitzung kurz den normalen Modus her (für input()).
         """
-        timeout = max(0.0, float(timeout_sekunden))
+        if not self._sitzung_aktiv:
+            yield
+            return
+
         fd = sys.stdin.fileno()
-        alte_einstellungen = termios.tcgetattr(fd)
+        self._stelle_wieder_her(fd)
+        self._sitzung_aktiv = False
         try:
-            # CBreak: Zeichen kommen sofort (kein ENTER noetig), aber ohne Voll-Raw
-            tty.setcbreak(fd)
-            ready, _, _ = select.select([fd], [], [], timeout)
-            if not ready:
-                return None
-
-            taste = os.read(fd, 1).decode(errors="ignore")
-            if not taste:
-                return None
-
-            if taste == "\x1b":
-                # Restliche Bytes (z. B. Pfeiltasten-Sequenzen) einsammeln
-                sequenz = [taste]
-                while True:
-                    more, _, _ = select.select([fd], [], [], 0)
-                    if not more:
-                        break
-                    teil = os.read(fd, 1).decode(errors="ignore")
-                    if not teil:
-                        break
-                    sequenz.append(teil)
-                taste = "".join(sequenz)
-
-            return self._interpretiere_taste(taste)
+            yield
         finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, alte_einstellungen)
+            self._setze_cbreak(fd)
+            self._sitzung_aktiv = True
+
+    def _setze_cbreak(self, fd: int) -> None:
+        # TCSANOW: nicht auf die Ausgabe warten und keine getippten Zeichen verwerfen
+        if self._alte_einstellungen is not None:
+            tty.setcbreak(fd, termios.TCSANOW)
+
+    def _stelle_wieder_her(self, fd: int) -> None:
+        if self._alte_einstellungen is not None:
+            termios.tcsetattr(fd, termios.TCSANOW, self._alte_einstellungen)
+
+    def _lies_verfuegbare(self, timeout: float | None) -> bool:
+        """
+        Wartet bis zu timeout Sekunden auf Eingabe und hängt alle verfügbaren
+        Zeichen an den Puffer an. False bei Timeout oder Ende der Eingabe.
+        """
+        fd = sys.stdin.fileno()
+        bereit, _, _ = select.select([fd], [], [], timeout)
+        if not bereit:
+            return False
+        daten = os.read(fd, 64)
+        if not daten:
+            return False
+        self._puffer += self._dekodierer.decode(daten)
+        return True
@@ -0,0 +1,270 @@
+# Diese Datei enthält die Repository-Schicht über den Datenablagen.
+# Ein Repository hält alle Objekte einer Datei im Speicher und pflegt
+# Primär- (id) und Sekundärindizes, die bei upsert/entfernen inkrementell
+# nachgezogen werden. Alle Menüs teilen sich dieselben Repository-Instanzen.
+# Gesamtspeicherungen sind gegen parallele Änderungen anderer Prozesse
+# abgesichert (SpeicherKonflikt), Einzeländerungen werden eintragsweise gemischt.
+
+from __future__ import annotations
+
+from typing import Any, Callable, Generic, Iterable, Type, TypeVar
+
+from Klassenpakete.backvorgang import Backvorgang, BackvorgangAnsicht, BackvorgangIndexEintrag
+from Klassenpakete.brot_rezept import BrotRezept
+from Klassenpakete.mehl import Mehl
+from Klassenpakete.shard_manager import ShardManager
+from Klassenpakete.speicher import Datenspeicher, Schreibergebnis, erzeuge_manager
+
+T = TypeVar("T")
+
+
+class Repository(Generic[T]):
+    """
+    Hält die Objekte einer Ablage samt Indizes.
+
+    Die gelieferten Objekte werden zwischen allen Menüs geteilt. Wer ein Objekt
+    verändert, muss es per upsert() speichern oder per neu_laden() verwerfen,
+    sonst passen Indizes und Datei nicht mehr zum Objekt.
+    """
+
+    # Name des Sekundärindex -> Funktion, die den Indexwert eines Objekts liefert
+    SEKUNDAER_INDIZES: dict[str, Callable[[Any], Any]] = {}
+
+    def __init__(self, manager: Datenspeicher, klasse: Type[T]) -> None:
+        self.manager: Datenspeicher = manager
+        self.klasse: Type[T] = klasse
+
+        self._objekte: dict[str, T] = {}
+        self._positionen: dict[str, int] = {}
+        self._naechste_position: int = 0
+        self._indizes: dict[str, dict[Any, set[str]]] = {}
+        self._indexwerte: dict[str, dict[str, Any]] = {}
+        self._stand: Any = None
+        self._version: str | None = None
+
+    def alle(self) -> list[T]:
+        self._aktualisiere_bei_bedarf()
+        return list(self._objekte.values())
+
+    def anzahl(self) -> int:
+        if self._ist_aktuell():
+            return len(self._objekte)
+        return self.manager.anzahl_eintraege()
+
+    def ausschnitt(self, start: int, stop: int) -> list[T]:
+        """
+        Objekte start..stop-1 in gespeicherter Reihenfolge, für reine Anzeigen.
+        Ist das Repository nicht geladen, werden nur diese Einträge gelesen
+        (frische Objekte, die nicht in die Indizes übernommen werden).
+        """
+        if self._ist_aktuell():
+            return list(self._objekte.values())[start:stop]
+        return self.manager.eintraege_bereich(self.klasse, start, stop)
+
+    def get(self, objektId: str) -> T | None:
+        self._aktualisiere_bei_bedarf()
+        return self._objekte.get(objektId)
+
+    def finde(self, index: str, *werte: Any) -> list[T]:
+        """
+        Liefert alle Objekte, deren Indexwert einem der Werte entspricht,
+        in gespeicherter Reihenfolge.
+        """
+        self._aktualisiere_bei_bedarf()
+        treffer: set[str] = set()
+        for wert in werte:
+            treffer |= self._indizes[index].get(wert, set())
+        return [
+            self._objekte[objektId]
+            for objektId in sorted(treffer, key=self._positionen.__getitem__)
+        ]
+
+    def upsert(self, objekt: T) -> None:
+        """
+        Speichert ein neues oder geändertes Objekt und zieht die Indizes nach.
+        """
+        self._aktualisiere_bei_bedarf()
+        gespeichert = self.manager.eintrag_speichern(objekt)
+        self._indexiere(objekt)
+        self._merke_stand(gespeichert)
+
+    def aktualisieren(self, objektId: str, aenderung: Callable[[T], None]) -> T | None:
+        """
+        Wendet aenderung unter der Sperre der Ablage auf den frisch gelesenen
+        Stand des Objekts an und speichert es. Für relative Änderungen (z. B.
+        Bestand abziehen), die nicht auf einem veralteten Stand beruhen dürfen.
+        """
+        self._aktualisiere_bei_bedarf()
+        objekt = self.manager.aktualisieren(self.klasse, objektId, aenderung)
+        if objekt is not None:
+            self._indexiere(objekt)
+        self._version = self.manager.version()
+        self._stand = self.manager.stand()
+        return objekt
+
+    def entfernen(self, objektId: str) -> None:
+        self._aktualisiere_bei_bedarf()
+        if objektId not in self._objekte:
+            return
+        self._entferne_aus_indizes(objektId)
+        del self._objekte[objektId]
+        del self._positionen[objektId]
+        self.speichern()
+
+    def speichern(self, geaendert: Iterable[str] | None = None) -> None:
+        """
+        Schreibt alle Objekte des Repositorys zurück. Mit geaendert (ids) werden
+        nur diese Objekte neu serialisiert, ohne wird jedes mit dem Dateistand verglichen.
+
+        Hat ein anderer Prozess die Ablage seit dem Laden geändert, wird
+        SpeicherKonflikt ausgelöst; danach neu_laden() und die Änderung wiederholen.
+        """
+        gespeichert = self.manager.speichern(
+            list(self._objekte.values()),
+            geaendert=geaendert,
+            basisVersion=self._version,
+        )
+        for objekt in self._objekte.values():
+            self._indexiere(objekt)
+        self._merke_stand(gespeichert)
+
+    def neu_laden(self) -> None:
+        """
+        Verwirft alle Objekte (auch ungespeicherte Änderungen) und lädt neu.
+        """
+        self._objekte = {}
+        self._positionen = {}
+        self._naechste_position = 0
+        self._indizes = {name: {} for name in self.SEKUNDAER_INDIZES}
+        self._indexwerte = {}
+
+        # Version vor dem Laden: ändert sich die Datei dazwischen, meldet
+        # speichern() im Zweifel einen Konflikt statt Änderungen zu überschreiben
+        self._version = self.manager.version()
+        self._stand = self.manager.stand()
+        for objekt in self.manager.laden(self.klasse):
+            self._indexiere(objekt)
+
+    def _merke_stand(self, gespeichert: Schreibergebnis) -> None:
+        # Stand aus dem Schreibvorgang selbst: ein danach gelesener stand() könnte
+        # schon die Änderung eines anderen Prozesses enthalten, die dann nie geladen würde
+        self._version = gespeichert.version
+        self._stand = gespeichert.stand
+
+    def _aktualisiere_bei_bedarf(self) -> None:
+        if not self._ist_aktuell():
+            self.neu_laden()
+
+    def _ist_aktuell(self) -> bool:
+        # Günstige Prüfung (stat bzw. Revisionszähler), ob jemand anderes geschrieben hat
+        return self._stand is not None and self._stand == self.manager.stand()
+
+    def _indexiere(self, objekt: T) -> None:
+        objektId = getattr(objekt, "id")
+        if objektId in self._objekte:
+            self._entferne_aus_indizes(objektId)
+        else:
+            self._positionen[objektId] = self._naechste_position
+            self._naechste_position += 1
+
+        self._objekte[objektId] = objekt
+        werte = {name: funktion(objekt) for name, funktion in self.SEKUNDAER_INDIZES.items()}
+        self._indexwerte[objektId] = werte
+        for name, wert in werte.items():
+            self._indizes[name].setdefault(wert, set()).add(objektId)
+
+    def _entferne_aus_indizes(self, objektId: str) -> None:
+        for name, wert in self._indexwerte.pop(objektId, {}).items():
+            bucket = self._indizes[name].get(wert)
+            if bucket is None:
+                continue
+            bucket.discard(objektId)
+            if not bucket:
+                del self._indizes[name][wert]
+
+
+class BackvorgangRepository(Repository[Backvorgang]):
+    SEKUNDAER_INDIZES = {
+        "status": lambda backvorgang: backvorgang.status,
+        "recipe_id": lambda backvorgang: backvorgang.recipe_id,
+        "planned_bake_date": lambda backvorgang: backvorgang.planned_bake_date,
+    }
+
+    def get(self, objektId: str) -> Backvorgang | None:
+        """
+        Einzelner Backvorgang: aus der geladenen Historie, falls sie aktuell ist,
+        sonst direkt aus der Ablage (bei der aufgeteilten Historie nur aus seinem
+        Monat bzw. Archiv), ohne die gesamte Historie zu laden.
+        """
+        if self._ist_aktuell() and objektId in self._objekte:
+            return self._objekte[objektId]
+        return self.manager.get(Backvorgang, objektId)
+
+    def upsert(self, objekt: Backvorgang) -> None:
+        """
+        Speichert eintragsweise, ohne die Historie zu laden. Ist sie per
+        alle()/finde() geladen und aktuell, werden Objekte und Indizes wie in
+        Repository.upsert() nachgezogen, sonst beim nächsten Zugriff neu geladen.
+        """
+        geladen = self._ist_aktuell()
+        gespeichert = self.manager.eintrag_speichern(objekt)
+        if geladen:
+            self._indexiere(objekt)
+            self._merke_stand(gespeichert)
+
+    def uebersicht(self, *status: str) -> list[BackvorgangIndexEintrag]:
+        """
+        Einträge für Listen (optional nach Status gefiltert), ohne die vollständigen
+        Objekte. Die aufgeteilte Ablage liest dafür nur ihr Manifest, andere
+        Ablagen streamen die Einträge.
+        """
+        predicate = (lambda daten: daten.get("status") in status) if status else None
+        if isinstance(self.manager, ShardManager):
+            return self.manager.uebersicht(predicate)
+        return [
+            BackvorgangIndexEintrag.aus_ansicht(ansicht)
+            for ansicht in self.manager.iter_items(BackvorgangAnsicht, predicate)
+        ]
+
+
+class RezeptRepository(Repository[BrotRezept]):
+    SEKUNDAER_INDIZES = {
+        "status": lambda rezept: rezept.status,
+    }
+
+
+class MehlRepository(Repository[Mehl]):
+    SEKUNDAER_INDIZES = {
+        "art_typ": lambda mehl: (mehl.mehlArt, mehl.mehlTyp),
+    }
+
+
+# Prozessweit geteilte Instanzen, damit nicht jedes Menü eigene Indizes aufbaut
+_repositories: dict[str, Repository[Any]] = {}
+
+
+def backvorgang_repository() -> BackvorgangRepository:
+    if "backvorgaenge" not in _repositories:
+        _repositories["backvorgaenge"] = BackvorgangRepository(
+            erzeuge_manager("daten/backvorgaenge.json", journal=True),
+            Backvorgang,
+        )
+    return _repositories["backvorgaenge"]  # type: ignore[return-value]
+
+
+def rezept_repository() -> RezeptRepository:
+    if "rezepte" not in _repositories:
+        _repositories["rezepte"] = RezeptRepository(
+            erzeuge_manager("daten/brote.json"),
+            BrotRezept,
+        )
+    return _repositories["rezepte"]  # type: ignore[return-value]
+
+
+def mehl_repository() -> MehlRepository:
+    if "mehle" not in _repositories:
+        _repositories["mehle"] = MehlRepository(
+            erzeuge_manager("daten/mehle.json"),
+            Mehl,
+        )
+    return _repositories["mehle"]  # type: ignore[return-value]
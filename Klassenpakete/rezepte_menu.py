@@ -1,10 +1,9 @@
 from __future__ import annotations
 
-from datetime import datetime
-
 from Klassenpakete.brot_rezept import BrotRezept
-from Klassenpakete.json_manager import JsonManager
 from Klassenpakete.menu import Menu
+from Klassenpakete.repository import RezeptRepository
+from Klassenpakete.services.rezept_service import REZEPT_STATUS, RezeptService
 from Klassenpakete.zeiten import BackProfilPhase, ProzessSchritt
 from Klassenpakete.ui_layout import MAX_ZEILEN_STANDARD, baue_standard_tabelle, kuerze_text
 
@@ -21,7 +20,9 @@ class RezepteMenu:
             "Zurueck",
         ]
         self.menu: Menu = Menu(menuePunkte=self.menuePunkte)
-        self.rezeptManager: JsonManager = JsonManager("daten/brote.json")
+        self.rezeptService: RezeptService = RezeptService()
+        # Für die seitenweise Anzeige (anzahl/ausschnitt) direkt aufs Repository
+        self.rezeptRepository: RezeptRepository = self.rezeptService.rezeptRepository
 
     def starten(self, navigation, renderer) -> None:
         self.renderer = renderer
@@ -44,7 +45,9 @@ class RezepteMenu:
                 return
 
     def rezepte_anzeigen(self, navigation) -> None:
-        rezepte = self.rezeptManager.laden(BrotRezept)
+        # Nur die sichtbaren Zeilen lesen, nicht den ganzen Rezeptbestand
+        anzahl = self.rezeptRepository.anzahl()
+        rezepte = self.rezeptRepository.ausschnitt(0, MAX_ZEILEN_STANDARD)
 
         def render():
             tabelle = baue_standard_tabelle(
@@ -74,8 +77,7 @@ class RezepteMenu:
                 tabelle.add_row("-", "Keine Rezepte vorhanden", "-", "-", "-", "-")
                 return tabelle
 
-            sichtbare = rezepte[:MAX_ZEILEN_STANDARD]
-            for index, rezept in enumerate(sichtbare, start=1):
+            for index, rezept in enumerate(rezepte, start=1):
                 hydration = f"{rezept.targets.hydration_percent:.1f}"
                 wasser = f"{rezept.formula.water_g:.1f}"
                 tabelle.add_row(
@@ -87,8 +89,8 @@ class RezepteMenu:
                     wasser,
                 )
 
-            if len(rezepte) > MAX_ZEILEN_STANDARD:
-                rest = len(rezepte) - MAX_ZEILEN_STANDARD
+            if anzahl > MAX_ZEILEN_STANDARD:
+                rest = anzahl - MAX_ZEILEN_STANDARD
                 tabelle.add_row("...", f"... {rest} weitere", "-", "-", "-", "-")
 
             return tabelle
@@ -101,7 +103,7 @@ class RezepteMenu:
         self.renderer.render_loop(render, navigation, input_handler)
 
     def rezept_bearbeiten(self, navigation) -> None:
-        rezepte = self.rezeptManager.laden(BrotRezept)
+        rezepte = self.rezeptService.alle()
         if not rezepte:
             with self.renderer.suspended():
                 print("\nKeine Rezepte zum Bearbeiten vorhanden.")
@@ -145,7 +147,7 @@ class RezepteMenu:
         if beschreibung:
             rezept.description = beschreibung
         if status:
-            if status in ("active", "archived"):
+            if status in REZEPT_STATUS:
                 rezept.status = status
             else:
                 with self.renderer.suspended():
@@ -192,10 +194,7 @@ class RezepteMenu:
         if backprofil_bearbeiten in ("j", "ja", "y", "yes"):
             self._bearbeite_backprofil(rezept)
 
-        rezept.version = max(1, rezept.version) + 1
-        rezept.updated_at = datetime.now().astimezone().isoformat(timespec="seconds")
-
-        self.rezeptManager.speichern(rezepte)
+        self.rezeptService.neue_version_speichern(rezept)
 
         with self.renderer.suspended():
             print("\nRezept aktualisiert.")
@@ -250,23 +249,12 @@ class RezepteMenu:
             dauer_roh = input("Dauer in Minuten: ").strip()
             temp_roh = input("Zieltemperatur C (optional): ").strip()
 
-        dauer = self._parse_int_oder_none(dauer_roh)
-        if dauer is None or dauer <= 0:
-            dauer = 1
-
-        target_temp = self._parse_float_oder_none(temp_roh)
-        if not key:
-            key = f"schritt_{len(rezept.process_template) + 1}"
-        if not label:
-            label = key
-
-        rezept.process_template.append(
-            ProzessSchritt(
-                key=key,
-                label=label,
-                duration_min=dauer,
-                target_temp_c=target_temp,
-            )
+        self.rezeptService.prozessschritt_anlegen(
+            rezept,
+            key=key,
+            label=label,
+            duration_min=self._parse_int_oder_none(dauer_roh),
+            target_temp_c=self._parse_float_oder_none(temp_roh),
         )
 
     def _prozessschritt_bearbeiten(self, rezept: BrotRezept) -> None:
@@ -343,24 +331,12 @@ class RezepteMenu:
             temp_roh = input("Temperatur in C: ").strip()
             steam_roh = input("Dampf? (j/n) [n]: ").strip().lower()
 
-        dauer = self._parse_int_oder_none(dauer_roh)
-        if dauer is None or dauer <= 0:
-            dauer = 1
-
-        temp = self._parse_float_oder_none(temp_roh)
-        if temp is None:
-            temp = 0.0
-
-        if not phase:
-            phase = f"phase_{len(rezept.bake_profile) + 1}"
-
-        rezept.bake_profile.append(
-            BackProfilPhase(
-                phase=phase,
-                duration_min=dauer,
-                temp_c=temp,
-                steam=steam_roh in ("j", "ja", "y", "yes"),
-            )
+        self.rezeptService.backprofil_phase_anlegen(
+            rezept,
+            phase=phase,
+            duration_min=self._parse_int_oder_none(dauer_roh),
+            temp_c=self._parse_float_oder_none(temp_roh),
+            steam=steam_roh in ("j", "ja", "y", "yes"),
         )
 
     def _backprofil_bearbeiten(self, rezept: BrotRezept) -> None:
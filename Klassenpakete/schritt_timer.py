@@ -0,0 +1,57 @@
+# Diese Datei enthält den Countdown für einen laufenden Prozessschritt.
+# Statt alle 0,25 s abzufragen, rechnet der Timer aus, wann sich die angezeigte
+# Restzeit (ganze Sekunden) das nächste Mal ändert. Bis dahin kann der Aufrufer
+# blockierend auf eine Taste warten (select mit Timeout) und muss nur neu
+# zeichnen, wenn sich die Anzeige ändert oder eine Taste kam.
+
+import math
+import time
+from typing import Callable
+
+# Kleiner Vorlauf, damit nach dem Aufwachen die neue Sekunde sicher erreicht ist
+AUFWACH_PUFFER_SEKUNDEN: float = 0.002
+
+
+def sekunden_bis_anzeigewechsel(rest: float) -> float:
+    """
+    Wartezeit, bis sich die aufgerundete Restzeit rest ändert (0 wenn abgelaufen).
+    """
+    if rest <= 0.0:
+        return 0.0
+    return rest - (math.ceil(rest) - 1) + AUFWACH_PUFFER_SEKUNDEN
+
+
+class SchrittTimer:
+    """
+    Countdown auf Basis von time.monotonic(). bereits_vergangen_sekunden zählt
+    Zeit mit, die vor dem Anlegen des Timers schon abgelaufen ist.
+    """
+
+    def __init__(
+        self,
+        dauer_sekunden: float,
+        bereits_vergangen_sekunden: float = 0.0,
+        uhr: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.uhr: Callable[[], float] = uhr
+        self.endzeit: float = (
+            uhr() + max(0.0, dauer_sekunden) - max(0.0, bereits_vergangen_sekunden)
+        )
+
+    def rest(self) -> float:
+        return max(0.0, self.endzeit - self.uhr())
+
+    def restsekunden(self) -> int:
+        """
+        Angezeigte Restzeit: aufgerundet, damit 00:00 erst beim Ablauf erscheint.
+        """
+        return math.ceil(self.rest())
+
+    def ist_abgelaufen(self) -> bool:
+        return self.rest() <= 0.0
+
+    def sekunden_bis_zur_naechsten_anzeige(self) -> float:
+        """
+        Wartezeit, bis sich restsekunden() ändert (0 bei abgelaufenem Timer).
+        """
+        return sekunden_bis_anzeigewechsel(self.rest())
@@ -0,0 +1,23 @@
+# Fachlogik ohne Terminal-Oberfläche. Die Menüs und die Kommandozeile
+# (python3 -m Klassenpakete) nutzen dieselben Dienste; beim Import werden
+# weder rich noch readchar noch google.genai geladen.
+
+from Klassenpakete.services.backvorgang_service import BackvorgangService
+from Klassenpakete.services.ki_service import KiFehler, KiReviewService
+from Klassenpakete.services.mehlbestand_service import (
+    Abbuchung,
+    Bestandsaenderung,
+    MehlbestandService,
+)
+from Klassenpakete.services.rezept_service import RezeptService, SkaliertesRezept
+
+__all__ = [
+    "Abbuchung",
+    "BackvorgangService",
+    "Bestandsaenderung",
+    "KiFehler",
+    "KiReviewService",
+    "MehlbestandService",
+    "RezeptService",
+    "SkaliertesRezept",
+]
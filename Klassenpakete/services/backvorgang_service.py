@@ -0,0 +1,425 @@
+# Backvorgänge ohne Terminal-Oberfläche: aus einem Rezept anlegen, Schritte
+# starten und abschließen, Zutaten pflegen, pausieren, abbrechen oder als
+# abgeschlossen markieren, Ergebnis erfassen und den Mehlbestand abbuchen.
+# Eingaben und Ausgaben bleiben beim Aufrufer (Menü oder Kommandozeile).
+
+from __future__ import annotations
+
+import re
+from datetime import datetime, timedelta
+
+from Klassenpakete.backvorgang import (
+    BackErgebnis,
+    Backvorgang,
+    BackZiel,
+    RezeptSnapshot,
+    SchrittDurchlauf,
+    ZutatenVerbrauch,
+)
+from Klassenpakete.brot_rezept import BrotRezept
+from Klassenpakete.id_vergabe import naechster_wert
+from Klassenpakete.repository import BackvorgangRepository, backvorgang_repository
+from Klassenpakete.services.mehlbestand_service import Abbuchung, MehlbestandService
+from Klassenpakete.services.rezept_service import RezeptService
+
+
+class BackvorgangService:
+    def __init__(
+        self,
+        backvorgangRepository: BackvorgangRepository | None = None,
+        rezeptService: RezeptService | None = None,
+        mehlbestandService: MehlbestandService | None = None,
+    ) -> None:
+        self.backvorgangRepository: BackvorgangRepository = (
+            backvorgangRepository or backvorgang_repository()
+        )
+        self.rezeptService: RezeptService = rezeptService or RezeptService()
+        self.mehlbestandService: MehlbestandService = (
+            mehlbestandService or MehlbestandService()
+        )
+
+    def hole(self, backvorgangId: str) -> Backvorgang | None:
+        return self.backvorgangRepository.get(backvorgangId)
+
+    def speichern(self, backvorgang: Backvorgang) -> None:
+        # Die ID erst beim ersten Speichern vergeben, damit verworfene Entwürfe
+        # keine Nummer des Tages verbrauchen
+        if not backvorgang.id:
+            backvorgang.id = self.generiere_id()
+        backvorgang.updated_at = self.jetzt_iso()
+        self.backvorgangRepository.upsert(backvorgang)
+
+    def baue_backvorgang(
+        self,
+        rezept: BrotRezept,
+        scale_factor: float,
+        planned_bake_date: str,
+    ) -> Backvorgang:
+        """
+        Neuer (noch nicht gespeicherter) Backvorgang mit skalierten Mehlmengen,
+        Wasser aus der Hydration und je einem Schritt pro Prozessschritt des Rezepts.
+        Die ID bleibt leer und wird erst von speichern() vergeben.
+        """
+        ingredient_usage: list[ZutatenVerbrauch] = [
+            ZutatenVerbrauch(
+                mehl_id=anteil.mehl_id,
+                planned_g=round(anteil.amount_g * scale_factor, 3),
+                actual_g=0.0,
+                stock_deducted_g=0.0,
+            )
+            for anteil in rezept.formula.flours
+        ]
+        gesamt_mehl_g = self.rezeptService.gesamt_mehlmenge_g(rezept, scale_factor)
+        wasser_aus_hydration_g = self.rezeptService.wasser_aus_hydration_g(
+            rezept,
+            scale_factor,
+            gesamt_mehl_g,
+        )
+        if wasser_aus_hydration_g > 0:
+            ingredient_usage.append(
+                ZutatenVerbrauch(
+                    mehl_id="wasser",
+                    planned_g=wasser_aus_hydration_g,
+                    actual_g=0.0,
+                    stock_deducted_g=0.0,
+                )
+            )
+
+        step_runs: list[SchrittDurchlauf] = [
+            SchrittDurchlauf(
+                key=schritt.key,
+                label=schritt.label,
+                planned_duration_min=schritt.duration_min,
+                actual_start_at=None,
+                actual_end_at=None,
+                actual_duration_min=None,
+                avg_temp_c=None,
+                note="",
+            )
+            for schritt in rezept.process_template
+        ]
+
+        zielgewicht = round(rezept.yield_data.target_dough_weight_g * scale_factor, 3)
+
+        return Backvorgang(
+            id="",
+            recipe_id=rezept.id,
+            recipe_version=rezept.version,
+            recipe_snapshot=RezeptSnapshot(
+                name=rezept.name,
+                hydration_percent=rezept.targets.hydration_percent,
+            ),
+            status="planned",
+            planned_bake_date=planned_bake_date,
+            started_at=None,
+            ended_at=None,
+            scale_factor=scale_factor,
+            target=BackZiel(
+                loaf_count=self.rezeptService.loaf_count(rezept, scale_factor),
+                target_dough_weight_g=zielgewicht,
+            ),
+            ingredient_usage=ingredient_usage,
+            step_runs=step_runs,
+            measurements=[],
+            outcome=BackErgebnis(),
+            issues=[],
+            notes="",
+            attachments=[],
+            custom={
+                "hydration_percent_used": rezept.targets.hydration_percent,
+                "flour_total_planned_g": gesamt_mehl_g,
+                "hydration_water_planned_g": wasser_aus_hydration_g,
+            },
+        )
+
+    def anlegen(
+        self,
+        rezept: BrotRezept,
+        scale_factor: float = 1.0,
+        planned_bake_date: str | None = None,
+    ) -> Backvorgang:
+        """
+        Baut einen Backvorgang (Status planned) und speichert ihn sofort.
+        """
+        if scale_factor <= 0:
+            raise ValueError("Scale-Faktor muss groesser als 0 sein.")
+        backvorgang = self.baue_backvorgang(
+            rezept=rezept,
+            scale_factor=scale_factor,
+            planned_bake_date=planned_bake_date or datetime.now().date().isoformat(),
+        )
+        backvorgang.created_at = self.jetzt_iso()
+        self.speichern(backvorgang)
+        return backvorgang
+
+    def generiere_id(self) -> str:
+        datumsteil = datetime.now().strftime("%Y_%m_%d")
+        praefix = f"bv_{datumsteil}_"
+
+        def startwert() -> int:
+            # Nur beim ersten Backvorgang des Tages: höchsten vorhandenen Index übernehmen
+            regex = re.compile(rf"^{re.escape(praefix)}(\d{{3}})$")
+            hoechste_id = self.backvorgangRepository.manager.hoechste_id(praefix)
+            match = regex.match(hoechste_id or "")
+            return int(match.group(1)) if match else 0
+
+        index = naechster_wert(
+            praefix,
+            startwert=startwert,
+            ist_vergeben=lambda wert: (
+                self.backvorgangRepository.get(f"{praefix}{wert:03d}") is not None
+            ),
+        )
+        return f"{praefix}{index:03d}"
+
+    def offene_schritte(self, backvorgang: Backvorgang) -> list[SchrittDurchlauf]:
+        return [
+            schritt
+            for schritt in backvorgang.step_runs
+            if schritt.actual_end_at is None and schritt.actual_duration_min is None
+        ]
+
+    def finde_schritt(
+        self, backvorgang: Backvorgang, schrittKey: str | None = None
+    ) -> SchrittDurchlauf | None:
+        """
+        Schritt mit diesem key, ohne key der erste offene Schritt.
+        """
+        if schrittKey is None:
+            offene = self.offene_schritte(backvorgang)
+            return offene[0] if offene else None
+        for schritt in backvorgang.step_runs:
+            if schritt.key == schrittKey:
+                return schritt
+        return None
+
+    def starte_schritt(
+        self,
+        backvorgang: Backvorgang,
+        schritt: SchrittDurchlauf,
+        start: datetime | None = None,
+    ) -> None:
+        start = start or datetime.now().astimezone()
+        if backvorgang.started_at is None:
+            backvorgang.started_at = start.isoformat(timespec="seconds")
+        backvorgang.status = "running"
+        schritt.actual_start_at = start.isoformat(timespec="seconds")
+
+    def vergangene_sekunden(
+        self, schritt: SchrittDurchlauf, jetzt: datetime | None = None
+    ) -> float:
+        """
+        Sekunden seit actual_start_at (Wanduhr), 0 für nie gestartete Schritte.
+        """
+        start = self._parse_zeitpunkt(schritt.actual_start_at)
+        if start is None:
+            return 0.0
+        jetzt = jetzt or datetime.now().astimezone()
+        return max(0.0, (jetzt - start).total_seconds())
+
+    def schliesse_schritt_ab(
+        self,
+        backvorgang: Backvorgang,
+        schritt: SchrittDurchlauf,
+        ende: datetime | None = None,
+        avg_temp_c: float | None = None,
+        note: str = "",
+        dauer_min: int | None = None,
+    ) -> None:
+        """
+        Setzt Ende und Dauer (mindestens 1 Minute) eines Schritts. Ein nie
+        gestarteter Schritt gilt als dauer_min (sonst geplante Dauer) vor ende gestartet.
+        """
+        ende = ende or datetime.now().astimezone()
+        start = self._parse_zeitpunkt(schritt.actual_start_at)
+        if start is None:
+            minuten = dauer_min if dauer_min is not None else schritt.planned_duration_min
+            start = ende - timedelta(minutes=max(0, minuten))
+            self.starte_schritt(backvorgang, schritt, start)
+
+        schritt.actual_end_at = ende.isoformat(timespec="seconds")
+        if dauer_min is None:
+            dauer_min = int(round((ende - start).total_seconds() / 60))
+        schritt.actual_duration_min = max(1, dauer_min)
+
+        schritt.avg_temp_c = avg_temp_c
+        if note:
+            schritt.note = note
+
+    def zutat_hinzufuegen(
+        self,
+        backvorgang: Backvorgang,
+        mehl_id: str,
+        planned_g: float | None = None,
+        actual_g: float | None = None,
+        stock_deducted_g: float | None = None,
+    ) -> ZutatenVerbrauch:
+        """
+        Hängt eine Zutat an ingredient_usage an. Mengen werden auf 0 begrenzt,
+        ohne Abzugsmenge wird der Ist-Verbrauch abgebucht.
+        """
+        if not mehl_id:
+            raise ValueError("Zutat-ID fehlt.")
+        ist_g = self._gramm(actual_g if actual_g is not None else 0.0)
+        eintrag = ZutatenVerbrauch(
+            mehl_id=mehl_id,
+            planned_g=self._gramm(planned_g if planned_g is not None else 0.0),
+            actual_g=ist_g,
+            stock_deducted_g=(
+                self._gramm(stock_deducted_g) if stock_deducted_g is not None else ist_g
+            ),
+        )
+        backvorgang.ingredient_usage.append(eintrag)
+        return eintrag
+
+    def zutat_aendern(
+        self,
+        eintrag: ZutatenVerbrauch,
+        mehl_id: str = "",
+        planned_g: float | None = None,
+        actual_g: float | None = None,
+        stock_deducted_g: float | None = None,
+    ) -> None:
+        # Leere bzw. fehlende Werte lassen das Feld unverändert
+        if mehl_id:
+            eintrag.mehl_id = mehl_id
+        if planned_g is not None:
+            eintrag.planned_g = self._gramm(planned_g)
+        if actual_g is not None:
+            eintrag.actual_g = self._gramm(actual_g)
+        if stock_deducted_g is not None:
+            eintrag.stock_deducted_g = self._gramm(stock_deducted_g)
+
+    def zutat_entfernen(self, backvorgang: Backvorgang, position: int) -> bool:
+        """
+        Entfernt die Zutat an position (ab 1); False, wenn es sie nicht gibt.
+        """
+        if not (1 <= position <= len(backvorgang.ingredient_usage)):
+            return False
+        del backvorgang.ingredient_usage[position - 1]
+        return True
+
+    def synchronisiere_zutaten_summen(self, backvorgang: Backvorgang) -> None:
+        # Nach Änderungen an den Zutaten die geplanten Summen in custom nachziehen
+        flour_total = round(
+            sum(
+                max(0.0, eintrag.planned_g)
+                for eintrag in backvorgang.ingredient_usage
+                if (eintrag.mehl_id or "").lower() != "wasser"
+            ),
+            3,
+        )
+        water = round(self.geplante_wassermenge_g(backvorgang), 3)
+        backvorgang.custom["flour_total_planned_g"] = flour_total
+        backvorgang.custom["hydration_water_planned_g"] = water
+
+    def geplante_wassermenge_g(self, backvorgang: Backvorgang) -> float:
+        for eintrag in backvorgang.ingredient_usage:
+            if (eintrag.mehl_id or "").lower() == "wasser":
+                return round(max(0.0, eintrag.planned_g), 3)
+
+        # Fallback fuer Altbestaende, falls Wasser noch nicht als Zutat gepflegt wurde
+        wasser_custom = backvorgang.custom.get("hydration_water_planned_g")
+        if isinstance(wasser_custom, (int, float)):
+            return round(max(0.0, float(wasser_custom)), 3)
+
+        hydration = backvorgang.recipe_snapshot.hydration_percent
+        mehl_summe = sum(
+            max(0.0, eintrag.planned_g)
+            for eintrag in backvorgang.ingredient_usage
+            if (eintrag.mehl_id or "").lower() != "wasser"
+        )
+        if hydration is not None and hydration > 0 and mehl_summe > 0:
+            return round(mehl_summe * (hydration / 100.0), 3)
+        return 0.0
+
+    def uebernehme_soll_als_ist(self, backvorgang: Backvorgang) -> None:
+        for eintrag in backvorgang.ingredient_usage:
+            eintrag.actual_g = round(max(0.0, eintrag.planned_g), 3)
+            eintrag.stock_deducted_g = round(max(0.0, eintrag.actual_g), 3)
+
+    def setze_ist_verbrauch(
+        self, eintrag: ZutatenVerbrauch, actual_g: float | None
+    ) -> None:
+        """
+        Ist-Verbrauch einer Zutat (ohne Wert die Soll-Menge); abgebucht wird
+        dieselbe Menge.
+        """
+        eintrag.actual_g = round(actual_g if actual_g is not None else eintrag.planned_g, 3)
+        eintrag.stock_deducted_g = round(eintrag.actual_g, 3)
+
+    def pausieren(self, backvorgang: Backvorgang) -> None:
+        # Ein nie gestarteter Backvorgang bleibt geplant
+        backvorgang.status = "paused" if backvorgang.started_at is not None else "planned"
+
+    def abbrechen(self, backvorgang: Backvorgang, grund: str = "") -> None:
+        """
+        Setzt den Status aborted (und ended_at, falls schon gestartet) und
+        hängt den Abbruchgrund an die Notizen an. Gespeichert wird mit speichern().
+        """
+        if backvorgang.started_at is not None:
+            backvorgang.ended_at = self.jetzt_iso()
+        backvorgang.status = "aborted"
+
+        if grund:
+            if backvorgang.notes:
+                backvorgang.notes += f"\nAbbruch: {grund}"
+            else:
+                backvorgang.notes = f"Abbruch: {grund}"
+
+    def markiere_abgeschlossen(self, backvorgang: Backvorgang) -> None:
+        backvorgang.status = "completed"
+        if backvorgang.started_at is None:
+            backvorgang.started_at = self.jetzt_iso()
+        backvorgang.ended_at = self.jetzt_iso()
+
+    def erfasse_ergebnis(
+        self,
+        backvorgang: Backvorgang,
+        rating: int | None = None,
+        crumb: str = "",
+        crust: str = "",
+        volume: str = "",
+        taste_note: str = "",
+        notes: str = "",
+    ) -> None:
+        """
+        Übernimmt die Abschlussdaten; leere Felder bleiben unverändert.
+        Löst ValueError aus, wenn die Bewertung nicht zwischen 1 und 5 liegt.
+        """
+        if rating is not None:
+            if not 1 <= rating <= 5:
+                raise ValueError("Bewertung muss zwischen 1 und 5 liegen.")
+            backvorgang.outcome.rating = rating
+
+        if crumb:
+            backvorgang.outcome.crumb = crumb
+        if crust:
+            backvorgang.outcome.crust = crust
+        if volume:
+            backvorgang.outcome.volume = volume
+        if taste_note:
+            backvorgang.outcome.taste_note = taste_note
+        if notes:
+            backvorgang.notes = notes
+
+    def ziehe_bestand_ab(self, backvorgang: Backvorgang) -> Abbuchung:
+        return self.mehlbestandService.ziehe_backvorgang_ab(backvorgang)
+
+    @staticmethod
+    def _gramm(wert: float) -> float:
+        return round(max(0.0, float(wert)), 3)
+
+    @staticmethod
+    def jetzt_iso() -> str:
+        return datetime.now().astimezone().isoformat(timespec="seconds")
+
+    def _parse_zeitpunkt(self, zeitstempel: str | None) -> datetime | None:
+        if not zeitstempel:
+            return None
+        try:
+            zeitpunkt = datetime.fromisoformat(zeitstempel)
+        except ValueError:
+            return None
+        # Ohne Zeitzone gespeicherte Zeitpunkte als lokale Zeit lesen
+        return zeitpunkt if zeitpunkt.tzinfo else zeitpunkt.astimezone()
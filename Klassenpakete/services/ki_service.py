@@ -0,0 +1,632 @@
+# KI-Bewertung von Backvorgängen ohne Terminal-Oberfläche: API-Key aus Umgebung
+# oder .env, Anfrage an Google GenAI, Lesen und Normalisieren der JSON-Antwort,
+# Übernahme der Mengenvorschläge in ingredient_usage, Speichern im Backvorgang
+# und im KI-Verlauf (daten/ki_anfragen.json).
+# google.genai wird erst beim ersten Client importiert.
+
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from uuid import uuid4
+
+from Klassenpakete.backvorgang import Backvorgang, ZutatenVerbrauch
+from Klassenpakete.brot_rezept import BrotRezept
+from Klassenpakete.ki_verlauf import KiVerlaufEintrag
+from Klassenpakete.speicher import Datenspeicher, erzeuge_manager
+
+if TYPE_CHECKING:
+    from google import genai
+
+STANDARD_MODELL: str = "gemini-2.5-flash-lite"
+
+
+def als_float_oder_none(value: Any) -> float | None:
+    # Zahlen aus der KI-Antwort kommen als Zahl oder Text ("12,5")
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        text = value.strip().replace(",", ".")
+        if not text:
+            return None
+        try:
+            return float(text)
+        except ValueError:
+            return None
+    return None
+
+
+class KiFehler(Exception):
+    """
+    Die KI-Anfrage ist nicht möglich oder fehlgeschlagen. rohantwort enthält
+    den Antworttext, falls er nicht als JSON gelesen werden konnte.
+    """
+
+    def __init__(self, meldung: str, rohantwort: str | None = None) -> None:
+        super().__init__(meldung)
+        self.rohantwort: str | None = rohantwort
+
+
+class KiReviewService:
+    def __init__(
+        self,
+        envDatei: Path | None = None,
+        kiVerlaufManager: Datenspeicher | None = None,
+    ) -> None:
+        self.envDatei: Path = envDatei or Path(__file__).parent.parent.parent / ".env"
+        self.kiVerlaufManager: Datenspeicher = kiVerlaufManager or erzeuge_manager(
+            "daten/ki_anfragen.json"
+        )
+        self.modellName: str = (
+            os.getenv("GOOGLE_MODEL")
+            or self.lade_wert_aus_env_datei("GOOGLE_MODEL")
+            or STANDARD_MODELL
+        )
+        self._client: genai.Client | None = None
+
+    def hole_client(self) -> genai.Client:
+        """
+        Client für Google GenAI. Löst KiFehler aus, wenn kein API-Key gesetzt
+        ist oder das Paket google-genai fehlt.
+        """
+        if self._client is not None:
+            return self._client
+
+        key = self.hole_api_key()
+        if not key:
+            raise KiFehler("GOOGLE_API_KEY ist nicht gesetzt.")
+
+        try:
+            from google import genai
+        except ImportError as exc:
+            raise KiFehler(
+                "Paket google-genai ist nicht installiert (pip install google-genai)."
+            ) from exc
+
+        try:
+            self._client = genai.Client(api_key=key)
+        except Exception as exc:  # pragma: no cover - defensive
+            raise KiFehler(f"KI-Client konnte nicht erstellt werden: {exc}") from exc
+        return self._client
+
+    def hole_api_key(self) -> str | None:
+        key = os.getenv("GOOGLE_API_KEY")
+        if key:
+            return key.strip() or None
+
+        key_aus_datei = self.lade_wert_aus_env_datei("GOOGLE_API_KEY")
+        if key_aus_datei:
+            # Fuer die laufende Session verfuegbar machen.
+            os.environ["GOOGLE_API_KEY"] = key_aus_datei
+            return key_aus_datei
+        return None
+
+    def setze_api_key(self, key: str | None) -> None:
+        """
+        Speichert den Key in .env und in der laufenden Umgebung; None entfernt ihn.
+        """
+        self.schreibe_env_wert("GOOGLE_API_KEY", key)
+        if key is None:
+            os.environ.pop("GOOGLE_API_KEY", None)
+        else:
+            os.environ["GOOGLE_API_KEY"] = key
+        self._client = None
+
+    def lade_wert_aus_env_datei(self, key: str) -> str | None:
+        if not self.envDatei.exists():
+            return None
+
+        try:
+            zeilen = self.envDatei.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return None
+
+        praefix = f"{key}="
+        for zeile in zeilen:
+            text = zeile.strip()
+            if not text or text.startswith("#") or "=" not in text:
+                continue
+            if not text.startswith(praefix):
+                continue
+
+            roh = text[len(praefix) :].strip()
+            if not roh:
+                return None
+            if (roh.startswith('"') and roh.endswith('"')) or (
+                roh.startswith("'") and roh.endswith("'")
+            ):
+                roh = roh[1:-1]
+                roh = roh.replace('\\"', '"').replace("\\\\", "\\")
+            return roh.strip() or None
+        return None
+
+    def schreibe_env_wert(self, key: str, value: str | None) -> None:
+        bestehend: list[str] = []
+        if self.envDatei.exists():
+            try:
+                bestehend = self.envDatei.read_text(encoding="utf-8").splitlines()
+            except OSError:
+                bestehend = []
+
+        praefix = f"{key}="
+        neue_zeilen: list[str] = []
+        ersetzt = False
+        for zeile in bestehend:
+            stripped = zeile.strip()
+            if stripped.startswith(praefix):
+                ersetzt = True
+                if value is not None:
+                    neue_zeilen.append(f'{key}="{self._escape_env_value(value)}"')
+                continue
+            neue_zeilen.append(zeile)
+
+        if not ersetzt and value is not None:
+            neue_zeilen.append(f'{key}="{self._escape_env_value(value)}"')
+
+        inhalt = "\n".join(neue_zeilen).rstrip() + "\n"
+        self.envDatei.write_text(inhalt, encoding="utf-8")
+
+    def modelle(self) -> list[str]:
+        client = self.hole_client()
+        modellnamen: list[str] = []
+        try:
+            for model in client.models.list():
+                name = getattr(model, "name", None)
+                if isinstance(name, str) and name:
+                    modellnamen.append(name)
+        except Exception as exc:
+            raise KiFehler(f"Modelle konnten nicht geladen werden: {exc}") from exc
+        return modellnamen
+
+    def frage_meisterbaecker(
+        self,
+        backvorgang: Backvorgang,
+        rezept: BrotRezept | None,
+        zusatzfrage: str = "",
+    ) -> dict[str, Any]:
+        """
+        Bewertung des Backvorgangs als normalisiertes Review-JSON.
+        Löst KiFehler aus, wenn die Anfrage scheitert oder die Antwort kein JSON ist.
+        """
+        client = self.hole_client()
+
+        backvorgang_json = json.dumps(
+            backvorgang.to_dict(),
+            ensure_ascii=False,
+            indent=2,
+        )
+        rezept_json = json.dumps(
+            rezept.to_dict() if rezept is not None else {},
+            ensure_ascii=False,
+            indent=2,
+        )
+
+        prompt = f"""
+Du bist ein deutscher Meisterbaecker mit hoher Praxiserfahrung.
+Analysiere den Backvorgang kritisch und gib konkrete Verbesserungen.
+Antworte AUSSCHLIESSLICH als valides JSON (kein Markdown, kein Freitext davor/danach).
+
+JSON-Struktur (genau diese Top-Level-Keys verwenden):
+{{
+  "persona": "meisterbaecker",
+  "overall_rating_1_10": 0,
+  "summary": "",
+  "strengths": ["", ""],
+  "issues": [
+    {{"topic": "", "severity": "low|medium|high", "details": ""}}
+  ],
+  "missing_data_suggestions": [
+    {{"field": "", "reason": "", "suggested_value": "", "confidence": "low|medium|high"}}
+  ],
+  "ingredient_usage_suggestions": [
+    {{"ingredient_id": "", "planned_g": 0, "actual_g": 0, "note": ""}}
+  ],
+  "next_actions": ["", ""]
+}}
+
+Regeln:
+- Wenn Daten fehlen, liefere sinnvolle Vorschlaege in "missing_data_suggestions".
+- Nutze nur plausible Baeckerlogik, keine Fantasie.
+- "overall_rating_1_10" ist ganzzahlig zwischen 1 und 10.
+- Antworte kompakt: max 3 "strengths", max 6 "issues", max 5 "missing_data_suggestions", max 5 "next_actions".
+- Jede "issues.details" kurz halten (max ~220 Zeichen).
+
+BACKVORGANG_JSON:
+{backvorgang_json}
+
+REZEPT_JSON:
+{rezept_json}
+
+ZUSATZFRAGE:
+{zusatzfrage or "-"}
+"""
+
+        try:
+            response = client.models.generate_content(
+                model=self.modellName,
+                contents=prompt,
+                config={
+                    "temperature": 0.2,
+                    "max_output_tokens": 1600,
+                    "response_mime_type": "application/json",
+                },
+            )
+        except Exception as exc:
+            raise KiFehler(f"KI-Anfrage fehlgeschlagen: {exc}") from exc
+
+        daten = response.parsed if isinstance(response.parsed, dict) else None
+        text = getattr(response, "text", None)
+
+        if daten is None and isinstance(text, str) and text.strip():
+            daten = self.parse_json_antwort(text)
+
+        if daten is None and isinstance(text, str) and text.strip():
+            daten = self._repariere_json_antwort(client, text)
+
+        if daten is None:
+            raise KiFehler(
+                "KI-Antwort konnte nicht als JSON gelesen werden.",
+                rohantwort=text if isinstance(text, str) else None,
+            )
+
+        return self.normalisiere_review(daten)
+
+    def parse_json_antwort(self, text: str) -> dict[str, Any] | None:
+        kandidaten: list[str] = []
+        roh = text.strip()
+        kandidaten.append(roh)
+
+        if roh.startswith("```"):
+            ohne_start = roh.replace("```json", "", 1).replace("```", "").strip()
+            kandidaten.append(ohne_start)
+
+        extrahiert = self._extrahiere_erstes_json_objekt(roh)
+        if extrahiert:
+            kandidaten.append(extrahiert)
+
+        for kandidat in kandidaten:
+            try:
+                daten = json.loads(kandidat)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(daten, dict):
+                return daten
+
+        return None
+
+    def normalisiere_review(self, daten: dict[str, Any]) -> dict[str, Any]:
+        rating = daten.get("overall_rating_1_10")
+        try:
+            rating_int = int(rating)
+        except (TypeError, ValueError):
+            rating_int = 0
+        rating_int = max(1, min(10, rating_int)) if rating_int else 0
+
+        def as_list_text(key: str) -> list[str]:
+            rohwert = daten.get(key, [])
+            if not isinstance(rohwert, list):
+                return []
+            return [str(eintrag) for eintrag in rohwert if str(eintrag).strip()]
+
+        def as_list_dict(key: str) -> list[dict[str, Any]]:
+            rohwert = daten.get(key, [])
+            if not isinstance(rohwert, list):
+                return []
+            return [eintrag for eintrag in rohwert if isinstance(eintrag, dict)]
+
+        return {
+            "persona": "meisterbaecker",
+            "overall_rating_1_10": rating_int,
+            "summary": str(daten.get("summary", "")).strip(),
+            "strengths": as_list_text("strengths"),
+            "issues": as_list_dict("issues"),
+            "missing_data_suggestions": as_list_dict("missing_data_suggestions"),
+            "ingredient_usage_suggestions": as_list_dict("ingredient_usage_suggestions"),
+            "next_actions": as_list_text("next_actions"),
+        }
+
+    def speichere_review(self, ziel: Backvorgang, review: dict[str, Any]) -> None:
+        """
+        Hängt das Review an custom["ki_reviews"] an; speichern muss der Aufrufer.
+        """
+        review_eintrag = {
+            "created_at": datetime.now().astimezone().isoformat(timespec="seconds"),
+            "model": self.modellName,
+            "review": review,
+        }
+        bestehend = ziel.custom.get("ki_reviews")
+        if isinstance(bestehend, list):
+            bestehend.append(review_eintrag)
+        else:
+            ziel.custom["ki_reviews"] = [review_eintrag]
+
+    def speichere_verlauf(
+        self,
+        backvorgang: Backvorgang,
+        review: dict[str, Any],
+        user_question: str,
+        ingredient_changes_applied: int,
+        review_in_backvorgang_saved: bool,
+    ) -> KiVerlaufEintrag:
+        rating = review.get("overall_rating_1_10")
+        try:
+            rating_int = int(rating)
+        except (TypeError, ValueError):
+            rating_int = 0
+        rating_int = max(0, min(10, rating_int))
+
+        eintrag = KiVerlaufEintrag(
+            id=f"ki_{uuid4().hex[:12]}",
+            created_at=datetime.now().astimezone().isoformat(timespec="seconds"),
+            backvorgang_id=backvorgang.id,
+            recipe_id=backvorgang.recipe_id,
+            recipe_name=backvorgang.recipe_snapshot.name or backvorgang.recipe_id,
+            model=self.modellName,
+            status_snapshot=backvorgang.status,
+            user_question=user_question,
+            overall_rating_1_10=rating_int,
+            summary=str(review.get("summary", "")).strip(),
+            review=review,
+            ingredient_changes_applied=max(0, int(ingredient_changes_applied)),
+            review_in_backvorgang_saved=review_in_backvorgang_saved,
+        )
+        # Neue id: wird ans Ende des Verlaufs angehängt, ohne ihn ganz zu laden
+        self.kiVerlaufManager.eintrag_speichern(eintrag)
+        return eintrag
+
+    def extrahiere_zutaten_vorschlaege(
+        self, review: dict[str, Any]
+    ) -> list[dict[str, Any]]:
+        """
+        Sammelt Mengenvorschläge aus ingredient_usage_suggestions und aus
+        missing_data_suggestions mit field ingredient_usage.
+        """
+        gesammelt: list[dict[str, Any]] = []
+
+        direkte = review.get("ingredient_usage_suggestions", [])
+        if isinstance(direkte, list):
+            for eintrag in direkte:
+                if not isinstance(eintrag, dict):
+                    continue
+                gesammelt.append(
+                    {
+                        "ingredient_id": str(
+                            eintrag.get("ingredient_id")
+                            or eintrag.get("mehl_id")
+                            or ""
+                        ).strip(),
+                        "planned_g": eintrag.get("planned_g"),
+                        "actual_g": eintrag.get("actual_g"),
+                        "note": str(eintrag.get("note", "")).strip(),
+                    }
+                )
+
+        missing = review.get("missing_data_suggestions", [])
+        if isinstance(missing, list):
+            for eintrag in missing:
+                if not isinstance(eintrag, dict):
+                    continue
+                feld = str(eintrag.get("field", "")).strip().lower()
+                if feld != "ingredient_usage":
+                    continue
+                sv = eintrag.get("suggested_value")
+                if not isinstance(sv, list):
+                    continue
+                for kandidat in sv:
+                    if not isinstance(kandidat, dict):
+                        continue
+                    gesammelt.append(
+                        {
+                            "ingredient_id": str(
+                                kandidat.get("ingredient_id")
+                                or kandidat.get("mehl_id")
+                                or ""
+                            ).strip(),
+                            "planned_g": kandidat.get("planned_g"),
+                            "actual_g": kandidat.get("actual_g"),
+                            "note": str(kandidat.get("note", "")).strip(),
+                        }
+                    )
+
+        return gesammelt
+
+    def ermittle_zutaten_aenderungen(
+        self,
+        backvorgang: Backvorgang,
+        review: dict[str, Any],
+    ) -> list[dict[str, Any]]:
+        """
+        Vergleicht die Vorschläge der KI mit ingredient_usage: je Zutat ein
+        Eintrag mit mode add/update und alten/neuen Soll- und Ist-Mengen,
+        unveränderte Zutaten fallen weg.
+        """
+        vorschlaege = self.extrahiere_zutaten_vorschlaege(review)
+        if not vorschlaege:
+            return []
+
+        bestehend_index = {
+            (eintrag.mehl_id or "").lower(): eintrag
+            for eintrag in backvorgang.ingredient_usage
+        }
+        gesammelt: dict[str, dict[str, Any]] = {}
+
+        for vorschlag in vorschlaege:
+            ingredient_id = (vorschlag.get("ingredient_id") or "").strip()
+            if not ingredient_id:
+                continue
+
+            key = ingredient_id.lower()
+            planned = als_float_oder_none(vorschlag.get("planned_g"))
+            actual = als_float_oder_none(vorschlag.get("actual_g"))
+
+            if key not in gesammelt:
+                alt = bestehend_index.get(key)
+                old_planned = alt.planned_g if alt is not None else None
+                old_actual = alt.actual_g if alt is not None else None
+                gesammelt[key] = {
+                    "ingredient_id": alt.mehl_id if alt is not None else ingredient_id,
+                    "mode": "update" if alt is not None else "add",
+                    "old_planned_g": old_planned,
+                    "new_planned_g": (
+                        round(max(0.0, old_planned), 3) if old_planned is not None else 0.0
+                    ),
+                    "old_actual_g": old_actual,
+                    "new_actual_g": (
+                        round(max(0.0, old_actual), 3) if old_actual is not None else 0.0
+                    ),
+                }
+
+            if planned is not None:
+                gesammelt[key]["new_planned_g"] = round(max(0.0, planned), 3)
+            if actual is not None:
+                gesammelt[key]["new_actual_g"] = round(max(0.0, actual), 3)
+
+        aenderungen: list[dict[str, Any]] = []
+        for eintrag in gesammelt.values():
+            old_planned = eintrag.get("old_planned_g")
+            old_actual = eintrag.get("old_actual_g")
+            if eintrag["mode"] == "add":
+                aenderungen.append(eintrag)
+                continue
+
+            planned_changed = (
+                old_planned is None or round(float(old_planned), 3) != eintrag["new_planned_g"]
+            )
+            actual_changed = (
+                old_actual is None or round(float(old_actual), 3) != eintrag["new_actual_g"]
+            )
+            if planned_changed or actual_changed:
+                aenderungen.append(eintrag)
+
+        return sorted(aenderungen, key=lambda x: str(x.get("ingredient_id", "")).lower())
+
+    def wende_zutaten_aenderungen_an(
+        self,
+        backvorgang: Backvorgang,
+        aenderungen: list[dict[str, Any]],
+    ) -> int:
+        """
+        Übernimmt die Änderungen aus ermittle_zutaten_aenderungen() in den
+        Backvorgang und gibt die Zahl der geänderten Zutaten zurück.
+        """
+        if not aenderungen:
+            return 0
+
+        index = {
+            (eintrag.mehl_id or "").lower(): eintrag
+            for eintrag in backvorgang.ingredient_usage
+        }
+        anzahl = 0
+
+        for aenderung in aenderungen:
+            ingredient_id = str(aenderung.get("ingredient_id", "")).strip()
+            if not ingredient_id:
+                continue
+
+            planned = als_float_oder_none(aenderung.get("new_planned_g"))
+            actual = als_float_oder_none(aenderung.get("new_actual_g"))
+
+            ziel = index.get(ingredient_id.lower())
+            if ziel is None:
+                ziel = ZutatenVerbrauch(
+                    mehl_id=ingredient_id,
+                    planned_g=max(0.0, planned) if planned is not None else 0.0,
+                    actual_g=max(0.0, actual) if actual is not None else 0.0,
+                    stock_deducted_g=max(0.0, actual) if actual is not None else 0.0,
+                )
+                backvorgang.ingredient_usage.append(ziel)
+                index[ingredient_id.lower()] = ziel
+                anzahl += 1
+                continue
+
+            geaendert = False
+            if planned is not None:
+                ziel.planned_g = round(max(0.0, planned), 3)
+                geaendert = True
+            if actual is not None:
+                ziel.actual_g = round(max(0.0, actual), 3)
+                ziel.stock_deducted_g = round(max(0.0, actual), 3)
+                geaendert = True
+            if geaendert:
+                anzahl += 1
+
+        return anzahl
+
+    def _escape_env_value(self, value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"')
+
+    def _extrahiere_erstes_json_objekt(self, text: str) -> str | None:
+        start = text.find("{")
+        if start < 0:
+            return None
+
+        tiefe = 0
+        in_string = False
+        escaped = False
+        for index in range(start, len(text)):
+            zeichen = text[index]
+
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif zeichen == "\\":
+                    escaped = True
+                elif zeichen == '"':
+                    in_string = False
+                continue
+
+            if zeichen == '"':
+                in_string = True
+                continue
+
+            if zeichen == "{":
+                tiefe += 1
+            elif zeichen == "}":
+                tiefe -= 1
+                if tiefe == 0:
+                    return text[start : index + 1]
+
+        return None
+
+    def _repariere_json_antwort(
+        self,
+        client: genai.Client,
+        rohantwort: str,
+    ) -> dict[str, Any] | None:
+        prompt = f"""
+Konvertiere die folgende KI-Rohantwort in EIN valides JSON-Objekt.
+Entferne Markdown-Fences und unvollstaendige Fragmente.
+Nutze diese Top-Level-Keys:
+persona, overall_rating_1_10, summary, strengths, issues,
+missing_data_suggestions, ingredient_usage_suggestions, next_actions.
+Wenn ein Bereich fehlt, nutze leere Standardwerte.
+Antworte nur mit JSON.
+
+ROHANTWORT:
+{rohantwort}
+"""
+        try:
+            response = client.models.generate_content(
+                model=self.modellName,
+                contents=prompt,
+                config={
+                    "temperature": 0.0,
+                    "max_output_tokens": 1400,
+                    "response_mime_type": "application/json",
+                },
+            )
+        except Exception:
+            return None
+
+        if isinstance(response.parsed, dict):
+            return response.parsed
+
+        text = getattr(response, "text", None)
+        if isinstance(text, str) and text.strip():
+            return self.parse_json_antwort(text)
+        return None
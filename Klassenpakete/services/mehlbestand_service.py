@@ -0,0 +1,234 @@
+# Mehlbestand ohne Terminal-Oberfläche: Mehle anlegen (mit id-Vergabe und
+# Dublettenprüfung), Bestand setzen, löschen, Abbuchungen einzelner Mehle und der
+# Verbrauch eines abgeschlossenen Backvorgangs. Abgebucht wird über
+# MehlRepository.aktualisieren(), also immer auf dem frisch gelesenen Stand.
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from Klassenpakete.backvorgang import Backvorgang
+from Klassenpakete.id_vergabe import naechster_wert
+from Klassenpakete.mehl import Mehl
+from Klassenpakete.repository import MehlRepository, mehl_repository
+
+# Zutaten im ingredient_usage, die nicht im Mehlbestand geführt werden
+NICHT_GEFUEHRT: tuple[str, ...] = ("wasser",)
+
+# Mehlart -> bekannte Mehltypen
+MEHL_ARTEN: dict[str, list[str]] = {
+    "Weizen": ["405", "550", "812", "1050", "1600", "00", "Vollkorn"],
+    "Dinkel": ["630", "1050", "Vollkorn"],
+    "Roggen": ["815", "1150", "Vollkorn"],
+    "Urgetreide": ["Emmer", "Einkorn"],
+}
+
+
+@dataclass(slots=True)
+class Bestandsaenderung:
+    mehl_id: str
+    alt_g: int
+    neu_g: int
+    abgezogen_g: int
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "mehl_id": self.mehl_id,
+            "alt_g": self.alt_g,
+            "neu_g": self.neu_g,
+            "abgezogen_g": self.abgezogen_g,
+        }
+
+
+@dataclass(slots=True)
+class Abbuchung:
+    """
+    Ergebnis der Abbuchung eines Backvorgangs.
+    """
+
+    aenderungen: list[Bestandsaenderung] = field(default_factory=list)
+    fehlende_ids: list[str] = field(default_factory=list)
+    bereits_abgebucht: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "aenderungen": [aenderung.to_dict() for aenderung in self.aenderungen],
+            "fehlende_ids": self.fehlende_ids,
+            "bereits_abgebucht": self.bereits_abgebucht,
+        }
+
+
+class MehlbestandService:
+    def __init__(self, mehlRepository: MehlRepository | None = None) -> None:
+        self.mehlRepository: MehlRepository = mehlRepository or mehl_repository()
+
+    def alle(self) -> list[Mehl]:
+        return self.mehlRepository.alle()
+
+    def vorhandene(self) -> list[Mehl]:
+        return [mehl for mehl in self.mehlRepository.alle() if mehl.vorhanden]
+
+    def finde_dublette(self, mehlArt: str, mehlTyp: str) -> Mehl | None:
+        treffer = self.mehlRepository.finde("art_typ", (mehlArt, mehlTyp))
+        return treffer[0] if treffer else None
+
+    def anlegen(
+        self,
+        mehlArt: str,
+        mehlTyp: str,
+        eigenName: str = "",
+        empfohleneHydration: int | None = None,
+    ) -> Mehl:
+        """
+        Legt ein neues (als vorhanden markiertes) Mehl an und speichert es.
+        Löst ValueError aus, wenn es Mehlart und Mehltyp schon gibt.
+        """
+        if self.finde_dublette(mehlArt, mehlTyp) is not None:
+            raise ValueError(f"Mehl {mehlArt} {mehlTyp} existiert bereits.")
+
+        neuesMehl = Mehl(
+            mehlArt=mehlArt,
+            mehlTyp=mehlTyp,
+            eigenName=eigenName,
+            empfohleneHydration=empfohleneHydration,
+            vorhanden=True,
+            mehlId=self.generiere_mehl_id(mehlArt, mehlTyp),
+        )
+        self.mehlRepository.upsert(neuesMehl)
+        return neuesMehl
+
+    def generiere_mehl_id(self, mehlArt: str, mehlTyp: str) -> str:
+        basis = self._slugify(f"mehl_{mehlArt}_{mehlTyp}") or "mehl_unbekannt"
+
+        def mehl_id(nummer: int) -> str:
+            # 1 = Basis-ID ohne Suffix, danach basis_2, basis_3, ...
+            return basis if nummer == 1 else f"{basis}_{nummer}"
+
+        nummer = naechster_wert(
+            f"mehl:{basis}",
+            ist_vergeben=lambda wert: self.mehlRepository.get(mehl_id(wert)) is not None,
+        )
+        return mehl_id(nummer)
+
+    def setze_bestand(self, mehl: Mehl, gramm: int) -> None:
+        """
+        Setzt den Bestand im Objekt (nicht unter 0); vorhanden folgt dem Bestand.
+        Gespeichert wird mit speichern().
+        """
+        mehl.vorhandenGramm = max(0, int(gramm))
+        mehl.vorhanden = mehl.vorhandenGramm > 0
+
+    def ist_loeschbar(self, mehl: Mehl) -> bool:
+        # Als vorhanden markierte Mehle werden nicht gelöscht
+        return not mehl.vorhanden
+
+    def entfernen(self, mehlId: str) -> None:
+        """
+        Entfernt ein Mehl; löst SpeicherKonflikt aus, wenn die Mehle
+        inzwischen an anderer Stelle geändert wurden.
+        """
+        self.mehlRepository.entfernen(mehlId)
+
+    def speichern(self) -> None:
+        """
+        Schreibt alle geänderten Mehle (SpeicherKonflikt wie bei entfernen()).
+        """
+        self.mehlRepository.speichern()
+
+    def verwerfen(self) -> None:
+        # Ungespeicherte Änderungen an den geteilten Mehl-Objekten verwerfen
+        self.mehlRepository.neu_laden()
+
+    def buche_ab(self, mehlId: str, gramm: int) -> Bestandsaenderung | None:
+        """
+        Zieht gramm vom Bestand eines Mehls ab (nicht unter 0).
+        None, wenn das Mehl nicht im Bestand geführt wird.
+        """
+        abzuziehen = max(0, int(gramm))
+        bestand: dict[str, int] = {}
+
+        def abbuchen(mehl: Mehl) -> None:
+            # Läuft auf dem frisch gelesenen Stand, damit parallele Abbuchungen
+            # anderer Terminals nicht überschrieben werden
+            bestand["alt"] = mehl.vorhandenGramm
+            mehl.vorhandenGramm = max(0, mehl.vorhandenGramm - abzuziehen)
+            mehl.vorhanden = mehl.vorhandenGramm > 0
+
+        mehl = self.mehlRepository.aktualisieren(mehlId, abbuchen)
+        if mehl is None:
+            return None
+        return Bestandsaenderung(
+            mehl_id=mehl.id,
+            alt_g=bestand["alt"],
+            neu_g=mehl.vorhandenGramm,
+            abgezogen_g=abzuziehen,
+        )
+
+    def ziehe_backvorgang_ab(self, backvorgang: Backvorgang) -> Abbuchung:
+        """
+        Bucht den Ist-Verbrauch (bzw. stock_deducted_g) aller Mehle eines
+        Backvorgangs ab und vermerkt das in backvorgang.custom. Ein bereits
+        abgebuchter Backvorgang wird nicht ein zweites Mal abgezogen.
+        Den Backvorgang speichert der Aufrufer.
+        """
+        if backvorgang.custom.get("stock_deducted") is True:
+            return Abbuchung(bereits_abgebucht=True)
+
+        ergebnis = Abbuchung()
+        for eintrag in backvorgang.ingredient_usage:
+            mehl = self.mehlRepository.get(eintrag.mehl_id) if eintrag.mehl_id else None
+            if mehl is None:
+                if eintrag.mehl_id and eintrag.mehl_id not in NICHT_GEFUEHRT:
+                    ergebnis.fehlende_ids.append(eintrag.mehl_id)
+                continue
+
+            zielmenge = (
+                eintrag.stock_deducted_g
+                if eintrag.stock_deducted_g > 0
+                else eintrag.actual_g
+            )
+            abzuziehen = int(round(max(0.0, zielmenge)))
+            if abzuziehen <= 0:
+                continue
+
+            aenderung = self.buche_ab(eintrag.mehl_id, abzuziehen)
+            if aenderung is None:
+                ergebnis.fehlende_ids.append(eintrag.mehl_id)
+                continue
+            ergebnis.aenderungen.append(aenderung)
+
+        ergebnis.fehlende_ids = sorted(set(ergebnis.fehlende_ids))
+        if ergebnis.aenderungen:
+            backvorgang.custom["stock_deducted"] = True
+            backvorgang.custom["stock_deducted_at"] = (
+                datetime.now().astimezone().isoformat(timespec="seconds")
+            )
+        else:
+            backvorgang.custom["stock_deducted"] = False
+
+        if ergebnis.fehlende_ids:
+            backvorgang.custom["stock_missing_ids"] = ergebnis.fehlende_ids
+        return ergebnis
+
+    def _slugify(self, text: str) -> str:
+        """
+        Erzeugt aus Freitext einen stabilen ASCII-Slug für IDs.
+        """
+        ersetzungen = {
+            "ä": "ae",
+            "ö": "oe",
+            "ü": "ue",
+            "ß": "ss",
+            "Ä": "ae",
+            "Ö": "oe",
+            "Ü": "ue",
+        }
+        for alt, neu in ersetzungen.items():
+            text = text.replace(alt, neu)
+
+        text = text.lower()
+        text = re.sub(r"[^a-z0-9]+", "_", text)
+        return text.strip("_")
@@ -0,0 +1,181 @@
+# Rezept-Operationen ohne Terminal-Oberfläche: Rezepte holen, für einen
+# Backvorgang skalieren (Mehlsumme, Wasser aus der Hydration, Ausbeute),
+# Prozessschritte und Backprofil-Phasen anlegen und als neue Version speichern.
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from Klassenpakete.brot_rezept import BrotRezept
+from Klassenpakete.repository import RezeptRepository, rezept_repository
+from Klassenpakete.zeiten import BackProfilPhase, ProzessSchritt
+
+REZEPT_STATUS: tuple[str, ...] = ("active", "archived")
+AKTIVE_REZEPT_STATUS: tuple[str, ...] = tuple(
+    status for status in REZEPT_STATUS if status != "archived"
+)
+
+
+@dataclass(slots=True)
+class SkaliertesRezept:
+    """
+    Mengen eines Rezepts für einen Scale-Faktor (1.0 = Original).
+    """
+
+    rezept_id: str
+    name: str
+    scale_factor: float
+    hydration_percent: float
+    flours: list[dict[str, Any]] = field(default_factory=list)
+    flour_total_g: float = 0.0
+    water_g: float = 0.0
+    salt_g: float = 0.0
+    starter_g: float = 0.0
+    additional_ingredients: list[dict[str, Any]] = field(default_factory=list)
+    loaf_count: int = 1
+    target_dough_weight_g: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "recipe_id": self.rezept_id,
+            "name": self.name,
+            "scale_factor": self.scale_factor,
+            "hydration_percent": self.hydration_percent,
+            "flours": self.flours,
+            "flour_total_g": self.flour_total_g,
+            "water_g": self.water_g,
+            "salt_g": self.salt_g,
+            "starter_g": self.starter_g,
+            "additional_ingredients": self.additional_ingredients,
+            "loaf_count": self.loaf_count,
+            "target_dough_weight_g": self.target_dough_weight_g,
+        }
+
+
+class RezeptService:
+    def __init__(self, rezeptRepository: RezeptRepository | None = None) -> None:
+        self.rezeptRepository: RezeptRepository = rezeptRepository or rezept_repository()
+
+    def hole(self, rezeptId: str) -> BrotRezept | None:
+        return self.rezeptRepository.get(rezeptId)
+
+    def aktive_rezepte(self) -> list[BrotRezept]:
+        return self.rezeptRepository.finde("status", *AKTIVE_REZEPT_STATUS)
+
+    def alle(self) -> list[BrotRezept]:
+        return self.rezeptRepository.alle()
+
+    def neue_version_speichern(self, rezept: BrotRezept) -> None:
+        # Jede Bearbeitung erhöht die Version; Backvorgänge merken sich ihre Version
+        rezept.version = max(1, rezept.version) + 1
+        rezept.updated_at = datetime.now().astimezone().isoformat(timespec="seconds")
+        self.rezeptRepository.upsert(rezept)
+
+    def prozessschritt_anlegen(
+        self,
+        rezept: BrotRezept,
+        key: str = "",
+        label: str = "",
+        duration_min: int | None = None,
+        target_temp_c: float | None = None,
+    ) -> ProzessSchritt:
+        """
+        Hängt einen Prozessschritt an. Ohne key wird schritt_<Nr.> vergeben,
+        ohne gültige Dauer gilt 1 Minute.
+        """
+        key = key.strip().lower().replace(" ", "_") or (
+            f"schritt_{len(rezept.process_template) + 1}"
+        )
+        schritt = ProzessSchritt(
+            key=key,
+            label=label or key,
+            duration_min=duration_min if duration_min and duration_min > 0 else 1,
+            target_temp_c=target_temp_c,
+        )
+        rezept.process_template.append(schritt)
+        return schritt
+
+    def backprofil_phase_anlegen(
+        self,
+        rezept: BrotRezept,
+        phase: str = "",
+        duration_min: int | None = None,
+        temp_c: float | None = None,
+        steam: bool = False,
+    ) -> BackProfilPhase:
+        """
+        Hängt eine Backprofil-Phase an (ohne Namen phase_<Nr.>, ohne gültige
+        Dauer 1 Minute, ohne Temperatur 0 C).
+        """
+        neuePhase = BackProfilPhase(
+            phase=phase or f"phase_{len(rezept.bake_profile) + 1}",
+            duration_min=duration_min if duration_min and duration_min > 0 else 1,
+            temp_c=temp_c if temp_c is not None else 0.0,
+            steam=steam,
+        )
+        rezept.bake_profile.append(neuePhase)
+        return neuePhase
+
+    def gesamt_mehlmenge_g(self, rezept: BrotRezept, scale_factor: float) -> float:
+        return round(
+            sum(max(0.0, anteil.amount_g) * scale_factor for anteil in rezept.formula.flours),
+            3,
+        )
+
+    def wasser_aus_hydration_g(
+        self,
+        rezept: BrotRezept,
+        scale_factor: float,
+        gesamt_mehl_g: float,
+    ) -> float:
+        hydration = rezept.targets.hydration_percent
+        if hydration > 0 and gesamt_mehl_g > 0:
+            return round(gesamt_mehl_g * (hydration / 100.0), 3)
+
+        # Fallback fuer Rezepte ohne valide Hydration
+        return round(max(0.0, rezept.formula.water_g) * scale_factor, 3)
+
+    def loaf_count(self, rezept: BrotRezept, scale_factor: float) -> int:
+        return max(1, int(round(rezept.yield_data.loaf_count_default * scale_factor)))
+
+    def skalieren(self, rezept: BrotRezept, scale_factor: float) -> SkaliertesRezept:
+        """
+        Alle Mengen des Rezepts mit scale_factor multipliziert.
+        Löst ValueError aus, wenn scale_factor nicht größer als 0 ist.
+        """
+        if scale_factor <= 0:
+            raise ValueError("Scale-Faktor muss groesser als 0 sein.")
+
+        gesamt_mehl_g = self.gesamt_mehlmenge_g(rezept, scale_factor)
+        starter = rezept.formula.starter
+        return SkaliertesRezept(
+            rezept_id=rezept.id,
+            name=rezept.name,
+            scale_factor=scale_factor,
+            hydration_percent=rezept.targets.hydration_percent,
+            flours=[
+                {
+                    "mehl_id": anteil.mehl_id,
+                    "amount_g": round(anteil.amount_g * scale_factor, 3),
+                }
+                for anteil in rezept.formula.flours
+            ],
+            flour_total_g=gesamt_mehl_g,
+            water_g=self.wasser_aus_hydration_g(rezept, scale_factor, gesamt_mehl_g),
+            salt_g=round(rezept.formula.salt_g * scale_factor, 3),
+            starter_g=round(starter.amount_g * scale_factor, 3) if starter else 0.0,
+            additional_ingredients=[
+                {
+                    "name": zusatz.name,
+                    "amount_g": round(zusatz.amount_g * scale_factor, 3),
+                    "unit": zusatz.unit or "g",
+                }
+                for zusatz in rezept.formula.additional_ingredients
+            ],
+            loaf_count=self.loaf_count(rezept, scale_factor),
+            target_dough_weight_g=round(
+                rezept.yield_data.target_dough_weight_g * scale_factor, 3
+            ),
+        )
@@ -0,0 +1,452 @@
+# Diese Datei verteilt eine wachsende Datenart (die Backhistorie) auf mehrere JSON-Dateien.
+# Jede Datei (Shard, z. B. daten/backvorgaenge/2024-06.json) wird von einem eigenen
+# JsonManager verwaltet. Ein kleines Manifest (manifest.json im selben Ordner) hält je
+# Eintrag den Shard und die Felder für Übersichtslisten: Listen lesen nur das Manifest,
+# eine Änderung schreibt nur ihren Shard und eine Zeile im Manifest-Journal.
+# Selten gebrauchte Einträge (z. B. beendete Backvorgänge) lassen sich mit archivieren()
+# in gzip-komprimierte Archiv-Shards (archiv/2024-06.json.gz) verschieben; sie bleiben
+# über das Manifest auffindbar und werden erst beim Zugriff entpackt. laden() liest das
+# Archiv nur auf Wunsch (mitArchiv), get(), iter_items() und Exporte immer.
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Generic, Iterable, Iterator, List, Type, TypeVar
+
+from Klassenpakete import json_codec, migrationen
+from Klassenpakete.json_manager import (
+    GzipJsonManager,
+    JsonManager,
+    Schreibergebnis,
+    SpeicherKonflikt,
+)
+
+T = TypeVar("T")
+I = TypeVar("I")
+
+
+@dataclass(slots=True)
+class _Rohdaten:
+    # Bereits serialisierter Eintrag, z. B. beim Aufteilen der bisherigen Datei
+    id: str
+    daten: dict[str, Any]
+
+    def to_dict(self) -> dict[str, Any]:
+        return self.daten
+
+
+class ShardManager(Generic[I]):
+    """
+    Ablage mit derselben Schnittstelle wie der JsonManager, aufgeteilt auf
+    mehrere Dateien.
+
+    indexKlasse beschreibt die Manifest-Einträge (id, shard, revision und
+    Listenfelder; aus_eintrag()/from_dict()/to_dict()). shardVon() bestimmt
+    den Shard eines neuen Eintrags aus seinen Rohdaten; danach bleibt er dort.
+    Eine bisherige Einzeldatei wird nur auf ausdrücklichen Aufruf von
+    aufteilen() übernommen.
+    """
+
+    MANIFEST_DATEI: str = "manifest.json"
+    # Shard-Namen mit diesem Präfix liegen komprimiert im Archiv-Unterordner
+    ARCHIV_PRAEFIX: str = "archiv/"
+
+    def __init__(
+        self,
+        verzeichnis: str,
+        indexKlasse: Type[I],
+        shardVon: Callable[[dict[str, Any]], str],
+        journal: bool = False,
+        schema: str | None = None,
+    ) -> None:
+        self.verzeichnis: str = verzeichnis.rstrip("/")
+        self.indexKlasse: Type[I] = indexKlasse
+        self.shardVon: Callable[[dict[str, Any]], str] = shardVon
+        self.journalAktiv: bool = journal
+        self.schemaName: str = schema or f"{Path(self.verzeichnis).name}.json"
+
+        self._shards: dict[str, JsonManager] = {}
+        # Das Manifest ändert sich mit jedem Schreibvorgang, daher im Journal-Modus
+        self._manifest: JsonManager = JsonManager(
+            f"{self.verzeichnis}/{self.MANIFEST_DATEI}", journal=True
+        )
+
+    def laden(self, klasse: Type[T], mitArchiv: bool = False) -> List[T]:
+        """
+        Lädt alle Einträge der aktiven Shards, mit mitArchiv=True auch die des
+        Archivs (in Shard-Reihenfolge, also chronologisch).
+        Die Objekte sind frisch erzeugt und dürfen verändert werden.
+        """
+        objekte: List[T] = []
+        for shard in self._shard_namen(mitArchiv):
+            objekte.extend(self._shard(shard).laden(klasse))
+        return objekte
+
+    def laden_nur_lesen(self, klasse: Type[T], mitArchiv: bool = False) -> List[T]:
+        objekte: List[T] = []
+        for shard in self._shard_namen(mitArchiv):
+            objekte.extend(self._shard(shard).laden_nur_lesen(klasse))
+        return objekte
+
+    def iter_items(
+        self,
+        klasse: Type[T],
+        predicate: Callable[[dict[str, Any]], bool] | None = None,
+    ) -> Iterator[T]:
+        # Archiv-Shards werden erst entpackt, wenn der Durchlauf sie erreicht
+        for shard in self._shard_namen(mitArchiv=True):
+            yield from self._shard(shard).iter_items(klasse, predicate)
+
+    def anzahl_eintraege(self) -> int:
+        # Wie laden(): ohne Archiv
+        return sum(self._anzahl_je_shard().values())
+
+    def eintraege_bereich(self, klasse: Type[T], start: int, stop: int) -> List[T]:
+        """
+        Einträge start..stop-1 in der Reihenfolge von laden(). Die Anzahl je
+        Shard steht im Manifest, gelesen werden nur die betroffenen Shards.
+        """
+        proShard = self._anzahl_je_shard()
+        bereich = range(sum(proShard.values()))[start:stop]
+
+        objekte: List[T] = []
+        beginn = 0
+        for shard in self._shard_namen():
+            ende = beginn + proShard[shard]
+            if bereich and beginn < bereich.stop and ende > bereich.start:
+                objekte.extend(
+                    self._shard(shard).eintraege_bereich(
+                        klasse, max(bereich.start - beginn, 0), bereich.stop - beginn
+                    )
+                )
+            beginn = ende
+        return objekte
+
+    def uebersicht(
+        self, predicate: Callable[[dict[str, Any]], bool] | None = None
+    ) -> list[I]:
+        """
+        Manifest-Einträge (optional gefiltert), ohne einen Shard zu lesen.
+        """
+        return list(self._manifest.iter_items(self.indexKlasse, predicate))
+
+    def rohe_eintraege(self) -> list[Any]:
+        """
+        Rohe Einträge aller Shards (z. B. für den SQLite-Import). Nur lesen!
+        """
+        eintraege: list[Any] = []
+        for shard in self._shard_namen(mitArchiv=True):
+            eintraege.extend(self._shard(shard).rohe_eintraege())
+        return eintraege
+
+    def get(self, klasse: Type[T], objektId: str) -> T | None:
+        indexEintrag = self._manifest.get(self.indexKlasse, objektId)
+        if indexEintrag is None:
+            return None
+        return self._shard(indexEintrag.shard).get(klasse, objektId)
+
+    def query(
+        self,
+        klasse: Type[T],
+        status: str | tuple[str, ...] | None = None,
+        recipe_id: str | None = None,
+    ) -> List[T]:
+        """
+        Wie JsonManager.query; gelesen werden nur Shards mit Treffern im Manifest.
+        """
+        shards = {
+            indexEintrag.shard
+            for indexEintrag in self._manifest.query(self.indexKlasse, status, recipe_id)
+        }
+        treffer: List[T] = []
+        for shard in sorted(shards):
+            treffer.extend(self._shard(shard).query(klasse, status, recipe_id))
+        return treffer
+
+    def hoechste_id(self, praefix: str) -> str | None:
+        return self._manifest.hoechste_id(praefix)
+
+    def stand(self) -> tuple[int, int, int, int]:
+        # Jede Änderung an einem Shard schreibt auch das Manifest (revision)
+        return self._manifest.stand()
+
+    def version(self) -> str:
+        return self._manifest.version()
+
+    def speichern(
+        self,
+        objekte: List[T],
+        geaendert: Iterable[str] | None = None,
+        basisVersion: str | None = None,
+    ) -> Schreibergebnis:
+        """
+        Ersetzt den gesamten Bestand (siehe JsonManager.speichern). Geschrieben
+        werden nur Shards mit geänderten, neuen oder entfernten Einträgen.
+        """
+        with self._manifest.sperre():
+            if basisVersion is not None and self.version() != basisVersion:
+                raise SpeicherKonflikt(f"{self.verzeichnis} wurde zwischenzeitlich geändert")
+
+            bisherigerIndex = {
+                indexEintrag.id: indexEintrag
+                for indexEintrag in self._manifest.laden_nur_lesen(self.indexKlasse)
+            }
+            geaenderteIds = set(geaendert) if geaendert is not None else None
+
+            proShard: dict[str, list[T]] = {}
+            neuerIndex: list[I] = []
+            for objekt in objekte:
+                bisher = bisherigerIndex.get(objekt.id)
+                unveraendert = geaenderteIds is not None and objekt.id not in geaenderteIds
+                if bisher is not None and unveraendert:
+                    proShard.setdefault(bisher.shard, []).append(objekt)
+                    neuerIndex.append(bisher)
+                    continue
+
+                daten = objekt.to_dict()
+                shard = bisher.shard if bisher is not None else self.shardVon(daten)
+                proShard.setdefault(shard, []).append(objekt)
+                indexEintrag = self.indexKlasse.aus_eintrag(
+                    daten, shard, bisher.revision if bisher is not None else 0
+                )
+                if indexEintrag != bisher:
+                    indexEintrag.revision += 1
+                neuerIndex.append(indexEintrag)
+
+            neueIds = {objekt.id for objekt in objekte}
+            # Shards, aus denen Einträge entfernt wurden, müssen ebenfalls geschrieben werden
+            mitEntfernten = {
+                indexEintrag.shard
+                for indexEintrag in bisherigerIndex.values()
+                if indexEintrag.id not in neueIds
+            }
+            for shard in sorted(set(proShard) | mitEntfernten):
+                liste = proShard.get(shard, [])
+                betroffen = shard in mitEntfernten or geaenderteIds is None or any(
+                    objekt.id in geaenderteIds or objekt.id not in bisherigerIndex
+                    for objekt in liste
+                )
+                if betroffen:
+                    self._shard(shard).speichern(liste, geaendert=geaendert)
+
+            return self._manifest.speichern(neuerIndex)
+
+    def eintrag_speichern(self, objekt: T) -> Schreibergebnis:
+        """
+        Schreibt den Eintrag in seinen Shard und aktualisiert das Manifest.
+        """
+        with self._manifest.sperre():
+            daten = objekt.to_dict()
+            bisher = self._manifest.get(self.indexKlasse, daten.get("id"))
+            shard = bisher.shard if bisher is not None else self.shardVon(daten)
+
+            shardManager = self._shard(shard)
+            shardVorher = shardManager.version()
+            gespeichert = shardManager.eintrag_speichern(objekt)
+            if gespeichert.version == shardVorher and bisher is not None:
+                return Schreibergebnis(self.version(), self.stand())
+
+            revision = bisher.revision + 1 if bisher is not None else 1
+            return self._manifest.eintrag_speichern(
+                self.indexKlasse.aus_eintrag(daten, shard, revision)
+            )
+
+    # Gleicher Name wie beim SqliteManager
+    upsert = eintrag_speichern
+
+    def eintraege_speichern(self, objekte: Iterable[T]) -> Schreibergebnis:
+        """
+        Wie eintrag_speichern() für mehrere Objekte: je betroffenem Shard und
+        für das Manifest ein Schreibvorgang (z. B. Massenimport).
+        """
+        with self._manifest.sperre():
+            bisherigerIndex = {
+                indexEintrag.id: indexEintrag
+                for indexEintrag in self._manifest.laden_nur_lesen(self.indexKlasse)
+            }
+            proShard: dict[str, dict[str, _Rohdaten]] = {}
+            neuerIndex: dict[str, I] = {}
+            for objekt in objekte:
+                daten = objekt.to_dict()
+                objektId = str(daten.get("id", ""))
+                bisher = neuerIndex.get(objektId) or bisherigerIndex.get(objektId)
+                shard = bisher.shard if bisher is not None else self.shardVon(daten)
+                proShard.setdefault(shard, {})[objektId] = _Rohdaten(objektId, daten)
+
+                indexEintrag = self.indexKlasse.aus_eintrag(
+                    daten, shard, bisher.revision if bisher is not None else 0
+                )
+                if indexEintrag != bisher:
+                    indexEintrag.revision += 1
+                    neuerIndex[objektId] = indexEintrag
+
+            for shard, eintraege in sorted(proShard.items()):
+                self._shard(shard).eintraege_speichern(eintraege.values())
+            if not neuerIndex:
+                return Schreibergebnis(self.version(), self.stand())
+            return self._manifest.eintraege_speichern(neuerIndex.values())
+
+    def aktualisieren(
+        self, klasse: Type[T], objektId: str, aenderung: Callable[[T], None]
+    ) -> T | None:
+        with self._manifest.sperre():
+            objekt = self.get(klasse, objektId)
+            if objekt is None:
+                return None
+            aenderung(objekt)
+            self.eintrag_speichern(objekt)
+            return objekt
+
+    def exportieren(self, zielPfad: Path, lesbar: bool = True) -> int:
+        """
+        Schreibt alle Shards zusammen als ein Dokument (Format wie die frühere
+        Einzeldatei). Gibt die Anzahl exportierter Einträge zurück.
+        """
+        eintraege = self.rohe_eintraege()
+        dokument = {
+            "schema_version": migrationen.aktuelle_version(self.schemaName),
+            "items": eintraege,
+        }
+        zielPfad.parent.mkdir(parents=True, exist_ok=True)
+        zielPfad.write_bytes(json_codec.dumps(dokument, lesbar=lesbar))
+        return len(eintraege)
+
+    def archivieren(self, auswahl: Callable[[I], bool]) -> int:
+        """
+        Verschiebt alle Einträge, deren Manifest-Eintrag auswahl() erfüllt, aus
+        den aktiven Shards in die Archiv-Shards desselben Monats. Gibt die Anzahl
+        verschobener Einträge zurück. Aktive Shards, die dabei leer werden, werden
+        gelöscht.
+        """
+        if not self._archiv_kandidaten(auswahl):
+            # Häufigster Fall, ohne die Sperre zu nehmen
+            return 0
+
+        with self._manifest.sperre():
+            kandidaten = self._archiv_kandidaten(auswahl)
+            if not kandidaten:
+                return 0
+
+            proShard: dict[str, set[str]] = {}
+            for indexEintrag in kandidaten:
+                proShard.setdefault(indexEintrag.shard, set()).add(indexEintrag.id)
+
+            leer: list[str] = []
+            for shard, ids in sorted(proShard.items()):
+                verbleibend: list[_Rohdaten] = []
+                verschoben: dict[str, _Rohdaten] = {}
+                for daten in self._shard(shard).rohe_eintraege():
+                    if not isinstance(daten, dict):
+                        continue
+                    eintrag = _Rohdaten(str(daten.get("id", "")), daten)
+                    if eintrag.id in ids:
+                        verschoben[eintrag.id] = eintrag
+                    else:
+                        verbleibend.append(eintrag)
+
+                # Erst das Archiv schreiben: bricht der Vorgang danach ab, steht ein
+                # Eintrag höchstens doppelt da (das Manifest zeigt weiter auf den
+                # aktiven Shard) und der nächste Lauf ersetzt ihn im Archiv
+                archiv = self._shard(self.ARCHIV_PRAEFIX + shard)
+                bisherigeArchivEintraege = [
+                    _Rohdaten(str(daten.get("id", "")), daten)
+                    for daten in archiv.rohe_eintraege()
+                    if isinstance(daten, dict) and daten.get("id") not in verschoben
+                ]
+                archiv.speichern(bisherigeArchivEintraege + list(verschoben.values()))
+                if verbleibend:
+                    self._shard(shard).speichern(verbleibend)
+                else:
+                    leer.append(shard)
+
+            neuerIndex: list[I] = []
+            for indexEintrag in self._manifest.laden(self.indexKlasse):
+                if indexEintrag.id in proShard.get(indexEintrag.shard, ()):
+                    indexEintrag.shard = self.ARCHIV_PRAEFIX + indexEintrag.shard
+                    indexEintrag.revision += 1
+                neuerIndex.append(indexEintrag)
+            self._manifest.speichern(neuerIndex)
+
+            # Erst nach dem Manifest: bis dahin zeigt es noch auf diese Shards
+            for shard in leer:
+                self._shards.pop(shard).loeschen()
+            return len(kandidaten)
+
+    def _archiv_kandidaten(self, auswahl: Callable[[I], bool]) -> list[I]:
+        return [
+            indexEintrag
+            for indexEintrag in self._manifest.laden_nur_lesen(self.indexKlasse)
+            if not indexEintrag.shard.startswith(self.ARCHIV_PRAEFIX) and auswahl(indexEintrag)
+        ]
+
+    def _shard_namen(self, mitArchiv: bool = False) -> list[str]:
+        # Chronologisch; archivierte Einträge eines Monats nach den aktiven
+        return sorted(
+            {
+                indexEintrag.shard
+                for indexEintrag in self._manifest.laden_nur_lesen(self.indexKlasse)
+                if mitArchiv or not indexEintrag.shard.startswith(self.ARCHIV_PRAEFIX)
+            },
+            key=lambda name: (name.removeprefix(self.ARCHIV_PRAEFIX), name),
+        )
+
+    def _anzahl_je_shard(self) -> dict[str, int]:
+        # Aktive Shards -> Anzahl Einträge, aus dem Manifest
+        proShard: dict[str, int] = {}
+        for indexEintrag in self._manifest.laden_nur_lesen(self.indexKlasse):
+            if not indexEintrag.shard.startswith(self.ARCHIV_PRAEFIX):
+                proShard[indexEintrag.shard] = proShard.get(indexEintrag.shard, 0) + 1
+        return proShard
+
+    def _shard(self, name: str) -> JsonManager:
+        manager = self._shards.get(name)
+        if manager is None:
+            if name.startswith(self.ARCHIV_PRAEFIX):
+                # Archiv: komprimiert, ohne Journal (Änderungen sind selten)
+                manager = GzipJsonManager(
+                    f"{self.verzeichnis}/{name}.json.gz", schema=self.schemaName
+                )
+            else:
+                manager = JsonManager(
+                    f"{self.verzeichnis}/{name}.json",
+                    journal=self.journalAktiv,
+                    schema=self.schemaName,
+                )
+            self._shards[name] = manager
+        return manager
+
+    def aufteilen(self, altdatei: str) -> int:
+        """
+        Einmalige Umstellung: verteilt die bisherige Einzeldatei (samt Journal) auf
+        die Shards und hebt sie danach als *.vor_aufteilung auf. Die Einzeldatei wird
+        erst nach Shards und Manifest umbenannt; bricht der Vorgang vorher ab,
+        wiederholt ein neuer Aufruf ihn vollständig. Gibt die Anzahl übernommener
+        Einträge zurück (0, wenn es die Einzeldatei nicht gibt).
+        """
+        altPfad = JsonManager.pfad_im_datenordner(altdatei)
+        if not altPfad.exists():
+            return 0
+
+        alt = JsonManager(altdatei, journal=True)
+        with alt.sperre(), self._manifest.sperre():
+            if not altPfad.exists():
+                # Ein anderer Prozess war schneller
+                return 0
+
+            proShard: dict[str, list[_Rohdaten]] = {}
+            index: list[I] = []
+            for daten in alt.rohe_eintraege():
+                if not isinstance(daten, dict):
+                    continue
+                shard = self.shardVon(daten)
+                proShard.setdefault(shard, []).append(_Rohdaten(str(daten.get("id", "")), daten))
+                index.append(self.indexKlasse.aus_eintrag(daten, shard, 1))
+
+            for shard, eintraege in proShard.items():
+                self._shard(shard).speichern(eintraege)
+            self._manifest.speichern(index)
+
+            # Die Einzeldatei zuerst: ohne sie gilt die Umstellung als erledigt
+            for pfad in (altPfad, alt.journalPfad):
+                if pfad.exists():
+                    pfad.rename(pfad.with_name(f"{pfad.name}.vor_aufteilung"))
+            return len(index)
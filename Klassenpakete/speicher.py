@@ -0,0 +1,151 @@
+# Diese Datei wählt die Datenablage (JSON-Dateien oder SQLite) für alle Menüs aus.
+# Gesteuert wird über die Umgebungsvariable BROT_BACKER_SPEICHER ("json" oder "sqlite").
+#
+# Die Aufteilung der Backhistorie nach Monaten ist ein einmaliger, ausdrücklicher Schritt
+# (bei geschlossenem Programm); bis dahin bleibt daten/backvorgaenge.json die Ablage.
+# Archiviert wird ebenfalls nur auf Aufruf (z. B. täglich per cron); ohne Angabe gilt
+# BROT_BACKER_ARCHIV_TAGE (Standard 30, "aus" schaltet das Archivieren ab):
+#
+#   python3 -m Klassenpakete.speicher aufteilen
+#   python3 -m Klassenpakete.speicher archivieren [TAGE]
+
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from Klassenpakete.backvorgang import (
+    BackvorgangIndexEintrag,
+    backvorgang_archivierbar,
+    backvorgang_monat,
+)
+from Klassenpakete.json_manager import JsonManager, Schreibergebnis, SpeicherKonflikt
+from Klassenpakete.shard_manager import ShardManager
+from Klassenpakete.sqlite_manager import SqliteManager
+
+# Gemeinsame Schnittstelle: laden, laden_nur_lesen, iter_items, speichern,
+# eintrag_speichern, eintraege_speichern, aktualisieren, get, query, hoechste_id,
+# stand, version, anzahl_eintraege, eintraege_bereich. Die Schreibmethoden liefern
+# ein Schreibergebnis (neue Version und Stand).
+Datenspeicher = JsonManager | SqliteManager | ShardManager
+
+__all__ = [
+    "Datenspeicher",
+    "Schreibergebnis",
+    "SpeicherKonflikt",
+    "archiv_tage",
+    "backhistorie_archivieren",
+    "backhistorie_aufgeteilt",
+    "backhistorie_aufteilen",
+    "erzeuge_manager",
+    "json_ablage",
+    "speicher_art",
+]
+
+
+def speicher_art() -> str:
+    return os.getenv("BROT_BACKER_SPEICHER", "json").strip().lower() or "json"
+
+
+def archiv_tage() -> int | None:
+    """
+    Alter in Tagen, ab dem beendete Backvorgänge archiviert werden; None = nie.
+    """
+    wert = os.getenv("BROT_BACKER_ARCHIV_TAGE", "30").strip().lower()
+    if wert in ("aus", "nie", "off"):
+        return None
+    try:
+        return max(int(wert), 0)
+    except ValueError:
+        return 30
+
+
+def erzeuge_manager(dateiPfad: str, journal: bool = False) -> Datenspeicher:
+    """
+    Erzeugt die konfigurierte Ablage für eine Datendatei.
+    journal wirkt nur bei der JSON-Ablage (siehe JsonManager).
+    """
+    if speicher_art() == "sqlite":
+        return SqliteManager(dateiPfad)
+    return json_ablage(dateiPfad, journal=journal)
+
+
+def json_ablage(dateiPfad: str, journal: bool = False) -> JsonManager | ShardManager:
+    """
+    JSON-Ablage einer Datendatei. Die Backhistorie liegt nach backhistorie_aufteilen()
+    nach Monaten aufgeteilt unter daten/backvorgaenge/, alle anderen Daten (und die
+    Backhistorie vor der Aufteilung) in je einer Datei. Die Ablage zu erzeugen
+    verändert keine Dateien (siehe backhistorie_archivieren()).
+    """
+    if Path(dateiPfad).name == "backvorgaenge.json" and backhistorie_aufgeteilt(dateiPfad):
+        return _backhistorie(dateiPfad, journal)
+    return JsonManager(dateiPfad, journal=journal)
+
+
+def backhistorie_aufgeteilt(dateiPfad: str = "daten/backvorgaenge.json") -> bool:
+    # Die Einzeldatei wird bei der Aufteilung als Letztes umbenannt
+    return not JsonManager.pfad_im_datenordner(dateiPfad).exists()
+
+
+def backhistorie_aufteilen(dateiPfad: str = "daten/backvorgaenge.json") -> int:
+    """
+    Verteilt eine vorhandene backvorgaenge.json einmalig auf die Monatsdateien
+    (siehe ShardManager.aufteilen). Gibt die Anzahl übernommener Backvorgänge zurück.
+    """
+    return _backhistorie(dateiPfad, journal=True).aufteilen(dateiPfad)
+
+
+def backhistorie_archivieren(
+    tage: int | None = None, dateiPfad: str = "daten/backvorgaenge.json"
+) -> int:
+    """
+    Verschiebt beendete Backvorgänge, die älter als tage (Standard: archiv_tage())
+    sind, ins komprimierte Archiv. Gibt die Anzahl verschobener Backvorgänge zurück;
+    0, wenn das Archivieren abgeschaltet ist. Setzt die aufgeteilte Backhistorie voraus.
+    """
+    if tage is None:
+        tage = archiv_tage()
+        if tage is None:
+            return 0
+    if not backhistorie_aufgeteilt(dateiPfad):
+        raise ValueError(
+            "Das Archiv setzt die aufgeteilte Backhistorie voraus "
+            "(python3 -m Klassenpakete.speicher aufteilen)."
+        )
+    grenze = datetime.now().astimezone() - timedelta(days=tage)
+    return _backhistorie(dateiPfad, journal=True).archivieren(
+        lambda eintrag: backvorgang_archivierbar(eintrag, grenze)
+    )
+
+
+def _backhistorie(dateiPfad: str, journal: bool) -> ShardManager:
+    return ShardManager(
+        str(Path(dateiPfad).with_suffix("")),
+        BackvorgangIndexEintrag,
+        shardVon=backvorgang_monat,
+        journal=journal,
+        schema="backvorgaenge.json",
+    )
+
+
+if __name__ == "__main__":
+    import sys
+
+    argumente = sys.argv[1:]
+    if argumente == ["aufteilen"]:
+        if backhistorie_aufgeteilt():
+            print("Die Backhistorie ist bereits aufgeteilt.")
+            sys.exit(0)
+        anzahl = backhistorie_aufteilen()
+        print(f"backvorgaenge.json: {anzahl} Backvorgaenge nach daten/backvorgaenge/ aufgeteilt")
+    elif argumente[:1] == ["archivieren"] and len(argumente) <= 2 and (
+        len(argumente) == 1 or argumente[1].isdigit()
+    ):
+        try:
+            anzahl = backhistorie_archivieren(int(argumente[1]) if len(argumente) == 2 else None)
+        except ValueError as fehler:
+            print(f"Fehler: {fehler}", file=sys.stderr)
+            sys.exit(1)
+        print(f"backvorgaenge: {anzahl} Backvorgaenge archiviert")
+    else:
+        print("Aufruf: python3 -m Klassenpakete.speicher aufteilen | archivieren [TAGE]")
+        sys.exit(2)
@@ -0,0 +1,486 @@
+# Diese Datei stellt eine SQLite-Ablage mit derselben Schnittstelle wie der JsonManager bereit.
+# Jede JSON-Datei aus daten/ wird zu einer Tabelle; die Objekte liegen dort als JSON,
+# häufig gefilterte Felder zusätzlich als indizierte Spalten.
+
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, List, Type, TypeVar
+
+from Klassenpakete import json_codec, migrationen
+from Klassenpakete.json_manager import Schreibergebnis, SpeicherKonflikt
+
+T = TypeVar("T")
+
+STANDARD_DATENBANK = "brot_backer.sqlite3"
+
+
+class SqliteManager:
+    """
+    Drop-in-Ersatz für den JsonManager auf Basis von SQLite.
+
+    Neben laden()/speichern() gibt es Schlüsselzugriffe (get, upsert) und
+    Abfragen über indizierte Spalten (query), die bei wachsender Historie
+    nicht mehr die komplette Datenmenge durchsuchen müssen.
+    """
+
+    # Aus dem JSON-Objekt gespiegelte Spalten, jeweils mit eigenem Index
+    INDEX_SPALTEN: tuple[str, ...] = (
+        "status",
+        "recipe_id",
+        "created_at",
+        "planned_bake_date",
+    )
+
+    def __init__(self, dateiPfad: str, datenbank: str = STANDARD_DATENBANK) -> None:
+        projektPfad = Path(__file__).parent.parent
+        datenOrdner = projektPfad / "daten"
+        datenOrdner.mkdir(parents=True, exist_ok=True)
+        self.datenbankPfad: Path = datenOrdner / Path(datenbank).name
+
+        # Tabellenname aus dem Dateinamen, z. B. daten/backvorgaenge.json -> backvorgaenge
+        tabelle = re.sub(r"[^a-z0-9_]", "_", Path(dateiPfad).stem.lower())
+        self.tabelle: str = tabelle or "items"
+        self.dateiName: str = Path(dateiPfad).name
+
+        self._lege_schema_an()
+        self._migriere_bei_bedarf()
+
+    def laden(self, klasse: Type[T]) -> List[T]:
+        """
+        Lädt alle Objekte der Tabelle in gespeicherter Reihenfolge.
+        """
+        with self._verbindung() as verbindung:
+            zeilen = verbindung.execute(
+                f'SELECT daten FROM "{self.tabelle}" ORDER BY position'
+            ).fetchall()
+        return [klasse.from_dict(json_codec.loads(zeile[0])) for zeile in zeilen]
+
+    def laden_nur_lesen(self, klasse: Type[T]) -> List[T]:
+        # SQLite liefert ohnehin frische Objekte, es gibt keinen geteilten Cache
+        return self.laden(klasse)
+
+    def speichern(
+        self,
+        objekte: List[T],
+        geaendert: Iterable[str] | None = None,
+        basisVersion: str | None = None,
+    ) -> Schreibergebnis:
+        """
+        Ersetzt den kompletten Tabelleninhalt durch die übergebenen Objekte.
+        Mit geaendert (ids) werden nur diese und neue Zeilen geschrieben, bei
+        den übrigen nur die Position; fehlende Objekte werden gelöscht.
+
+        Wie beim JsonManager: weicht die Revision von basisVersion ab, wird
+        SpeicherKonflikt ausgelöst. Rückgabe: neue Version und Stand.
+        """
+        with self._verbindung(schreiben=True) as verbindung:
+            if basisVersion is not None and self._version(verbindung) != basisVersion:
+                raise SpeicherKonflikt(f"Tabelle {self.tabelle} wurde zwischenzeitlich geändert")
+
+            if geaendert is None:
+                verbindung.execute(f'DELETE FROM "{self.tabelle}"')
+                verbindung.executemany(
+                    self._einfuege_sql(),
+                    [
+                        self._zeile(objekt.to_dict(), position)
+                        for position, objekt in enumerate(objekte)
+                    ],
+                )
+                self._markiere_geaendert(verbindung)
+                return self._schreibergebnis(verbindung)
+
+            geaenderteIds = set(geaendert)
+            vorhandene = {
+                zeile[0] for zeile in verbindung.execute(f'SELECT id FROM "{self.tabelle}"')
+            }
+            neueIds = {str(objekt.id) for objekt in objekte}
+            verbindung.executemany(
+                f'DELETE FROM "{self.tabelle}" WHERE id = ?',
+                [(objektId,) for objektId in vorhandene - neueIds],
+            )
+            verbindung.executemany(
+                f'UPDATE "{self.tabelle}" SET position = ? WHERE id = ?',
+                [
+                    (position, str(objekt.id))
+                    for position, objekt in enumerate(objekte)
+                    if objekt.id not in geaenderteIds and str(objekt.id) in vorhandene
+                ],
+            )
+            verbindung.executemany(
+                self._einfuege_sql(),
+                [
+                    self._zeile(objekt.to_dict(), position)
+                    for position, objekt in enumerate(objekte)
+                    if objekt.id in geaenderteIds or str(objekt.id) not in vorhandene
+                ],
+            )
+            self._markiere_geaendert(verbindung)
+            return self._schreibergebnis(verbindung)
+
+    def anzahl_eintraege(self) -> int:
+        with self._verbindung() as verbindung:
+            return verbindung.execute(f'SELECT COUNT(*) FROM "{self.tabelle}"').fetchone()[0]
+
+    def eintraege_bereich(self, klasse: Type[T], start: int, stop: int) -> List[T]:
+        """
+        Objekte der Einträge start..stop-1 in gespeicherter Reihenfolge (wie ein Slice).
+        """
+        bereich = range(self.anzahl_eintraege())[start:stop]
+        if not bereich:
+            return []
+        with self._verbindung() as verbindung:
+            zeilen = verbindung.execute(
+                f'SELECT daten FROM "{self.tabelle}" ORDER BY position LIMIT ? OFFSET ?',
+                (len(bereich), bereich.start),
+            ).fetchall()
+        return [klasse.from_dict(json_codec.loads(zeile[0])) for zeile in zeilen]
+
+    def iter_items(
+        self,
+        klasse: Type[T],
+        predicate: Callable[[dict[str, Any]], bool] | None = None,
+    ) -> Iterator[T]:
+        """
+        Liefert die Objekte zeilenweise über den Cursor, ohne die Tabelle
+        komplett in den Speicher zu holen. predicate prüft vorab die Rohdaten.
+        """
+        with self._verbindung() as verbindung:
+            for (rohdaten,) in verbindung.execute(
+                f'SELECT daten FROM "{self.tabelle}" ORDER BY position'
+            ):
+                daten = json_codec.loads(rohdaten)
+                if predicate is None or predicate(daten):
+                    yield klasse.from_dict(daten)
+
+    def get(self, klasse: Type[T], objektId: str) -> T | None:
+        """
+        Liefert das Objekt mit der angegebenen id oder None.
+        """
+        with self._verbindung() as verbindung:
+            zeile = verbindung.execute(
+                f'SELECT daten FROM "{self.tabelle}" WHERE id = ?',
+                (objektId,),
+            ).fetchone()
+        if zeile is None:
+            return None
+        return klasse.from_dict(json_codec.loads(zeile[0]))
+
+    def upsert(self, objekt: T) -> Schreibergebnis:
+        """
+        Fügt ein Objekt ein oder ersetzt das vorhandene mit gleicher id.
+        Die bisherige Position in der Reihenfolge bleibt erhalten.
+        Rückgabe: neue Version und Stand.
+        """
+        with self._verbindung(schreiben=True) as verbindung:
+            self._upsert(verbindung, objekt)
+            return self._schreibergebnis(verbindung)
+
+    def aktualisieren(
+        self, klasse: Type[T], objektId: str, aenderung: Callable[[T], None]
+    ) -> T | None:
+        """
+        Liest ein Objekt in einer Schreibtransaktion, wendet aenderung darauf an
+        und speichert es (siehe JsonManager.aktualisieren).
+        """
+        with self._verbindung(schreiben=True) as verbindung:
+            zeile = verbindung.execute(
+                f'SELECT daten FROM "{self.tabelle}" WHERE id = ?',
+                (objektId,),
+            ).fetchone()
+            if zeile is None:
+                return None
+            objekt = klasse.from_dict(json_codec.loads(zeile[0]))
+            aenderung(objekt)
+            self._upsert(verbindung, objekt)
+            return objekt
+
+    def _upsert(self, verbindung: sqlite3.Connection, objekt: T) -> str:
+        daten = objekt.to_dict()
+        zeile = verbindung.execute(
+            f'SELECT position FROM "{self.tabelle}" WHERE id = ?',
+            (str(daten.get("id", "")),),
+        ).fetchone()
+        if zeile is None:
+            zeile = verbindung.execute(
+                f'SELECT COALESCE(MAX(position) + 1, 0) FROM "{self.tabelle}"'
+            ).fetchone()
+        verbindung.execute(self._einfuege_sql(), self._zeile(daten, zeile[0]))
+        self._markiere_geaendert(verbindung)
+        return self._version(verbindung)
+
+    # Gleicher Name wie beim JsonManager, damit die Menüs beide Ablagen nutzen können
+    eintrag_speichern = upsert
+
+    def eintraege_speichern(self, objekte: Iterable[T]) -> Schreibergebnis:
+        """
+        Wie upsert() für mehrere Objekte in einer Transaktion (z. B. Massenimport).
+        """
+        with self._verbindung(schreiben=True) as verbindung:
+            for objekt in objekte:
+                self._upsert(verbindung, objekt)
+            return self._schreibergebnis(verbindung)
+
+    def query(
+        self,
+        klasse: Type[T],
+        status: str | tuple[str, ...] | None = None,
+        recipe_id: str | None = None,
+    ) -> List[T]:
+        """
+        Liefert alle Objekte, die den Filtern entsprechen (Index-Suche).
+        status darf ein einzelner Wert oder ein Tupel erlaubter Werte sein.
+        """
+        bedingungen: list[str] = []
+        parameter: list[Any] = []
+
+        if status is not None:
+            werte = (status,) if isinstance(status, str) else tuple(status)
+            bedingungen.append(f"status IN ({', '.join('?' for _ in werte)})")
+            parameter.extend(werte)
+        if recipe_id is not None:
+            bedingungen.append("recipe_id = ?")
+            parameter.append(recipe_id)
+
+        sql = f'SELECT daten FROM "{self.tabelle}"'
+        if bedingungen:
+            sql += " WHERE " + " AND ".join(bedingungen)
+        sql += " ORDER BY position"
+
+        with self._verbindung() as verbindung:
+            zeilen = verbindung.execute(sql, parameter).fetchall()
+        return [klasse.from_dict(json_codec.loads(zeile[0])) for zeile in zeilen]
+
+    def hoechste_id(self, praefix: str) -> str | None:
+        """
+        Liefert die lexikographisch größte id mit dem angegebenen Präfix.
+        Nutzt den Primärschlüssel-Index statt alle Einträge zu prüfen.
+        """
+        with self._verbindung() as verbindung:
+            zeile = verbindung.execute(
+                f'SELECT id FROM "{self.tabelle}" WHERE id >= ? AND id < ? '
+                "ORDER BY id DESC LIMIT 1",
+                (praefix, praefix + "\U0010ffff"),
+            ).fetchone()
+        return zeile[0] if zeile else None
+
+    def stand(self) -> int:
+        """
+        Revisionszähler der Tabelle; steigt bei jedem Schreibvorgang.
+        """
+        with self._verbindung() as verbindung:
+            return self._revision(verbindung)
+
+    def version(self) -> str:
+        """
+        Versionskennung für die Konfliktprüfung in speichern() (die Revision als Text).
+        """
+        return str(self.stand())
+
+    def _revision(self, verbindung: sqlite3.Connection) -> int:
+        zeile = verbindung.execute(
+            "SELECT wert FROM meta WHERE tabelle = ? AND schluessel = 'revision'",
+            (self.tabelle,),
+        ).fetchone()
+        return int(zeile[0]) if zeile else 0
+
+    def _version(self, verbindung: sqlite3.Connection) -> str:
+        return str(self._revision(verbindung))
+
+    def _schreibergebnis(self, verbindung: sqlite3.Connection) -> Schreibergebnis:
+        # Noch in der Schreibtransaktion gelesen, siehe Schreibergebnis
+        revision = self._revision(verbindung)
+        return Schreibergebnis(str(revision), revision)
+
+    def ist_leer(self) -> bool:
+        with self._verbindung() as verbindung:
+            zeile = verbindung.execute(
+                f'SELECT 1 FROM "{self.tabelle}" LIMIT 1'
+            ).fetchone()
+        return zeile is None
+
+    def importiere_rohdaten(self, eintraege: list[dict[str, Any]]) -> int:
+        """
+        Übernimmt rohe JSON-Einträge unverändert in die Tabelle (ersetzt den Inhalt).
+        Gibt die Anzahl übernommener Einträge zurück.
+        """
+        zeilen = [
+            self._zeile(daten, position)
+            for position, daten in enumerate(eintraege)
+            if isinstance(daten, dict)
+        ]
+        with self._verbindung() as verbindung:
+            verbindung.execute(f'DELETE FROM "{self.tabelle}"')
+            verbindung.executemany(self._einfuege_sql(), zeilen)
+            # Der JsonManager liefert bereits migrierte Einträge
+            self._setze_schema_version(verbindung, migrationen.aktuelle_version(self.dateiName))
+            self._markiere_geaendert(verbindung)
+        return len(zeilen)
+
+    @contextmanager
+    def _verbindung(self, schreiben: bool = False) -> Iterator[sqlite3.Connection]:
+        verbindung = sqlite3.connect(self.datenbankPfad, timeout=10)
+        try:
+            with verbindung:
+                if schreiben:
+                    # Schreibsperre sofort holen: Lesen, Prüfen und Schreiben bilden eine Einheit
+                    verbindung.execute("BEGIN IMMEDIATE")
+                yield verbindung
+        finally:
+            verbindung.close()
+
+    def _lege_schema_an(self) -> None:
+        with self._verbindung() as verbindung:
+            # WAL: Leser blockieren Schreiber nicht (mehrere Küchenterminals)
+            verbindung.execute("PRAGMA journal_mode=WAL")
+            spalten = ", ".join(f"{spalte} TEXT" for spalte in self.INDEX_SPALTEN)
+            verbindung.execute(
+                f'CREATE TABLE IF NOT EXISTS "{self.tabelle}" ('
+                "id TEXT PRIMARY KEY, "
+                "position INTEGER NOT NULL, "
+                f"{spalten}, "
+                "daten TEXT NOT NULL)"
+            )
+            for spalte in (*self.INDEX_SPALTEN, "position"):
+                verbindung.execute(
+                    f'CREATE INDEX IF NOT EXISTS "{self.tabelle}_{spalte}" '
+                    f'ON "{self.tabelle}" ({spalte})'
+                )
+            verbindung.execute(
+                "CREATE TABLE IF NOT EXISTS meta ("
+                "tabelle TEXT NOT NULL, schluessel TEXT NOT NULL, wert TEXT, "
+                "PRIMARY KEY (tabelle, schluessel))"
+            )
+
+    def _migriere_bei_bedarf(self) -> None:
+        # Gleiche Migrationskette wie bei den JSON-Dateien (siehe migrationen),
+        # der Stand der Tabelle liegt in meta unter schema_version
+        ziel = migrationen.aktuelle_version(self.dateiName)
+        gespeichert = self._schema_version()
+        if gespeichert is not None and gespeichert >= ziel:
+            return
+
+        with self._verbindung(schreiben=True) as verbindung:
+            version = self._schema_version(verbindung)
+            if version is None:
+                # Tabellen aus der Zeit vor den Migrationen haben Version 1
+                leer = verbindung.execute(
+                    f'SELECT 1 FROM "{self.tabelle}" LIMIT 1'
+                ).fetchone() is None
+                version = ziel if leer else 1
+
+            if version < ziel:
+                zeilen = verbindung.execute(
+                    f'SELECT daten FROM "{self.tabelle}" ORDER BY position'
+                ).fetchall()
+                dokument = migrationen.migriere(
+                    self.dateiName,
+                    {
+                        "schema_version": version,
+                        "items": [json_codec.loads(zeile[0]) for zeile in zeilen],
+                    },
+                )
+                verbindung.execute(f'DELETE FROM "{self.tabelle}"')
+                verbindung.executemany(
+                    self._einfuege_sql(),
+                    [
+                        self._zeile(daten, position)
+                        for position, daten in enumerate(dokument["items"])
+                        if isinstance(daten, dict)
+                    ],
+                )
+                self._markiere_geaendert(verbindung)
+            self._setze_schema_version(verbindung, max(version, ziel))
+
+    def _schema_version(self, verbindung: sqlite3.Connection | None = None) -> int | None:
+        if verbindung is None:
+            with self._verbindung() as verbindung:
+                return self._schema_version(verbindung)
+        zeile = verbindung.execute(
+            "SELECT wert FROM meta WHERE tabelle = ? AND schluessel = 'schema_version'",
+            (self.tabelle,),
+        ).fetchone()
+        return int(zeile[0]) if zeile else None
+
+    def _setze_schema_version(self, verbindung: sqlite3.Connection, version: int) -> None:
+        verbindung.execute(
+            "INSERT OR REPLACE INTO meta (tabelle, schluessel, wert) VALUES (?, 'schema_version', ?)",
+            (self.tabelle, str(version)),
+        )
+
+    def _einfuege_sql(self) -> str:
+        spalten = ("id", "position", *self.INDEX_SPALTEN, "daten")
+        return (
+            f'INSERT OR REPLACE INTO "{self.tabelle}" ({", ".join(spalten)}) '
+            f"VALUES ({', '.join('?' for _ in spalten)})"
+        )
+
+    def _zeile(self, daten: dict[str, Any], position: int) -> tuple[Any, ...]:
+        indexwerte = []
+        for spalte in self.INDEX_SPALTEN:
+            wert = daten.get(spalte)
+            indexwerte.append(str(wert) if wert is not None else None)
+        return (
+            str(daten.get("id", "")),
+            position,
+            *indexwerte,
+            json_codec.dumps_zeile(daten).decode("utf-8"),
+        )
+
+    def _markiere_geaendert(self, verbindung: sqlite3.Connection) -> None:
+        verbindung.execute(
+            "INSERT OR REPLACE INTO meta (tabelle, schluessel, wert) VALUES (?, ?, ?)",
+            (self.tabelle, "updated_at", self._zeitstempel()),
+        )
+        verbindung.execute(
+            "INSERT INTO meta (tabelle, schluessel, wert) VALUES (?, 'revision', '1') "
+            "ON CONFLICT (tabelle, schluessel) "
+            "DO UPDATE SET wert = CAST(wert AS INTEGER) + 1",
+            (self.tabelle,),
+        )
+
+    def _zeitstempel(self) -> str:
+        return datetime.now().astimezone().isoformat(timespec="seconds")
+
+
+def importiere_json_dateien(
+    dateien: tuple[str, ...] = (
+        "daten/mehle.json",
+        "daten/brote.json",
+        "daten/backvorgaenge.json",
+        "daten/ki_anfragen.json",
+    ),
+    ueberschreiben: bool = False,
+) -> dict[str, int]:
+    """
+    Einmaliger Import der bestehenden daten/*.json in die SQLite-Datenbank.
+
+    Bereits gefüllte Tabellen werden nur mit ueberschreiben=True ersetzt.
+    Rückgabe: Anzahl importierter Einträge je Datei (-1 = übersprungen).
+    """
+    # Erst hier importiert: speicher baut auf diesem Modul auf
+    from Klassenpakete.speicher import json_ablage
+
+    ergebnis: dict[str, int] = {}
+    for datei in dateien:
+        ziel = SqliteManager(datei)
+        if not ueberschreiben and not ziel.ist_leer():
+            ergebnis[datei] = -1
+            continue
+        # Über die JSON-Ablage, damit auch die aufgeteilte Backhistorie gelesen wird
+        ergebnis[datei] = ziel.importiere_rohdaten(json_ablage(datei).rohe_eintraege())
+    return ergebnis
+
+
+if __name__ == "__main__":
+    import sys
+
+    for datei, anzahl in importiere_json_dateien(
+        ueberschreiben="--ueberschreiben" in sys.argv[1:]
+    ).items():
+        if anzahl < 0:
+            print(f"{datei}: Tabelle bereits gefuellt, uebersprungen (--ueberschreiben)")
+        else:
+            print(f"{datei}: {anzahl} Eintraege importiert")
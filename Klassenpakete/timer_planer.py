@@ -0,0 +1,245 @@
+# Diese Datei enthält den Zeitplaner für mehrere gleichzeitig laufende Backvorgänge.
+# Jeder gestartete Prozessschritt bekommt einen Timer mit Fälligkeit (Wanduhr, damit
+# er einen Neustart übersteht); ein Min-Heap liefert immer den als Nächstes fälligen.
+# Die Timer liegen in daten/timer.json, der Alarm je Timer wird nur einmal ausgelöst.
+# Timer oder Schritte mit unlesbarem Zeitpunkt werden protokolliert und übersprungen.
+
+from __future__ import annotations
+
+import heapq
+import logging
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+from Klassenpakete.backvorgang import Backvorgang, SchrittDurchlauf
+from Klassenpakete.schritt_timer import sekunden_bis_anzeigewechsel
+from Klassenpakete.speicher import Datenspeicher, erzeuge_manager
+
+TIMER_DATEI = "daten/timer.json"
+
+_log = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class LaufenderTimer:
+    id: str  # <backvorgang_id>:<schritt_key>
+    backvorgang_id: str
+    schritt_key: str
+    label: str
+    gestartet_um: str
+    faellig_um: str
+    alarm_gesendet: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "backvorgang_id": self.backvorgang_id,
+            "schritt_key": self.schritt_key,
+            "label": self.label,
+            "gestartet_um": self.gestartet_um,
+            "faellig_um": self.faellig_um,
+            "alarm_gesendet": self.alarm_gesendet,
+        }
+
+    @classmethod
+    def from_dict(cls, daten: dict[str, Any]) -> "LaufenderTimer":
+        return cls(
+            id=str(daten.get("id", "")),
+            backvorgang_id=str(daten.get("backvorgang_id", "")),
+            schritt_key=str(daten.get("schritt_key", "")),
+            label=str(daten.get("label", "")),
+            gestartet_um=str(daten.get("gestartet_um", "")),
+            faellig_um=str(daten.get("faellig_um", "")),
+            alarm_gesendet=bool(daten.get("alarm_gesendet", False)),
+        )
+
+    def faellig_zeitstempel(self) -> float:
+        # Der TimerPlaner hält nur Timer mit lesbarer Fälligkeit
+        zeitpunkt = _parse_zeitpunkt(self.faellig_um)
+        return zeitpunkt.timestamp() if zeitpunkt else math.inf
+
+
+def timer_id(backvorgangId: str, schrittKey: str) -> str:
+    return f"{backvorgangId}:{schrittKey}"
+
+
+def _parse_zeitpunkt(zeitstempel: str | None) -> datetime | None:
+    if not zeitstempel:
+        return None
+    try:
+        zeitpunkt = datetime.fromisoformat(zeitstempel)
+    except ValueError:
+        return None
+    # Ohne Zeitzone gespeicherte Zeitpunkte als lokale Zeit lesen
+    return zeitpunkt if zeitpunkt.tzinfo else zeitpunkt.astimezone()
+
+
+class TimerPlaner:
+    """
+    Hält die Timer aller laufenden Schritte. Der Heap enthält (Fälligkeit, id)
+    der Timer, deren Alarm noch aussteht; entfernte oder neu geplante Timer
+    bleiben als veraltete Heap-Einträge liegen und werden beim Lesen übersprungen.
+    """
+
+    def __init__(
+        self,
+        timerManager: Datenspeicher | None = None,
+        uhr: Callable[[], float] = time.time,
+    ) -> None:
+        self.timerManager: Datenspeicher = timerManager or erzeuge_manager(
+            TIMER_DATEI, journal=True
+        )
+        self.uhr: Callable[[], float] = uhr
+        self._timer: dict[str, LaufenderTimer] = {}
+        self._heap: list[tuple[float, str]] = []
+        self.neu_laden()
+
+    def neu_laden(self) -> None:
+        self._timer = {}
+        for timer in self.timerManager.laden(LaufenderTimer):
+            if _parse_zeitpunkt(timer.faellig_um) is None:
+                # Fällt beim nächsten Speichern weg; abgleichen() plant den Schritt neu
+                _log.warning(
+                    "Timer %s mit ungueltiger Faelligkeit %r uebersprungen",
+                    timer.id,
+                    timer.faellig_um,
+                )
+                continue
+            self._timer[timer.id] = timer
+        self._heap = [
+            (timer.faellig_zeitstempel(), timer.id)
+            for timer in self._timer.values()
+            if not timer.alarm_gesendet
+        ]
+        heapq.heapify(self._heap)
+
+    def planen(self, backvorgang: Backvorgang, schritt: SchrittDurchlauf) -> LaufenderTimer:
+        """
+        Timer für einen gestarteten Schritt: fällig actual_start_at + geplante Dauer.
+        """
+        if not schritt.actual_start_at:
+            raise ValueError(f"Schritt {schritt.key} ist nicht gestartet.")
+        start = _parse_zeitpunkt(schritt.actual_start_at)
+        if start is None:
+            raise ValueError(
+                f"Schritt {schritt.key} hat einen ungueltigen Startzeitpunkt: "
+                f"{schritt.actual_start_at!r}"
+            )
+        faellig = start + timedelta(minutes=max(0, schritt.planned_duration_min))
+
+        timer = LaufenderTimer(
+            id=timer_id(backvorgang.id, schritt.key),
+            backvorgang_id=backvorgang.id,
+            schritt_key=schritt.key,
+            label=f"{backvorgang.recipe_snapshot.name or backvorgang.recipe_id} | "
+            f"{schritt.label or schritt.key}",
+            gestartet_um=schritt.actual_start_at,
+            faellig_um=faellig.isoformat(timespec="seconds"),
+            alarm_gesendet=False,
+        )
+        self._timer[timer.id] = timer
+        heapq.heappush(self._heap, (timer.faellig_zeitstempel(), timer.id))
+        self.timerManager.eintrag_speichern(timer)
+        return timer
+
+    def abgleichen(self, backvorgaenge: list[Backvorgang]) -> None:
+        """
+        Gleicht die Timer mit den laufenden Backvorgängen ab: gestartete, offene
+        Schritte ohne Timer werden geplant (etwa aus einem anderen Terminal oder
+        der Kommandozeile), Timer beendeter oder pausierter Schritte entfernt.
+        """
+        erwartet: dict[str, tuple[Backvorgang, SchrittDurchlauf]] = {}
+        for backvorgang in backvorgaenge:
+            for schritt in backvorgang.step_runs:
+                if (
+                    schritt.actual_start_at
+                    and schritt.actual_end_at is None
+                    and schritt.actual_duration_min is None
+                ):
+                    erwartet[timer_id(backvorgang.id, schritt.key)] = (backvorgang, schritt)
+
+        veraltet = [timerId for timerId in self._timer if timerId not in erwartet]
+        for timerId in veraltet:
+            del self._timer[timerId]
+        if veraltet:
+            self.timerManager.speichern(list(self._timer.values()))
+
+        for timerId, (backvorgang, schritt) in erwartet.items():
+            vorhanden = self._timer.get(timerId)
+            if vorhanden is None or vorhanden.gestartet_um != schritt.actual_start_at:
+                try:
+                    self.planen(backvorgang, schritt)
+                except ValueError as fehler:
+                    _log.warning("Backvorgang %s: %s", backvorgang.id, fehler)
+
+    def entfernen(self, timerId: str) -> None:
+        if self._timer.pop(timerId, None) is None:
+            return
+        self.timerManager.speichern(list(self._timer.values()))
+
+    def get(self, timerId: str) -> LaufenderTimer | None:
+        return self._timer.get(timerId)
+
+    def alle(self) -> list[LaufenderTimer]:
+        """
+        Alle Timer, der als Nächstes fällige zuerst.
+        """
+        return sorted(self._timer.values(), key=LaufenderTimer.faellig_zeitstempel)
+
+    def naechster(self) -> LaufenderTimer | None:
+        # Als Nächstes fälliger Timer, dessen Alarm noch aussteht
+        self._entferne_veraltete()
+        return self._timer[self._heap[0][1]] if self._heap else None
+
+    def restsekunden(self, timer: LaufenderTimer) -> int:
+        return max(0, math.ceil(timer.faellig_zeitstempel() - self.uhr()))
+
+    def faellige(self) -> list[LaufenderTimer]:
+        """
+        Fällige Timer, deren Alarm noch nicht ausgelöst wurde. Sie werden als
+        alarmiert gespeichert und bleiben bis zum Abschluss des Schritts bestehen.
+        """
+        jetzt = self.uhr()
+        neu_faellig: list[LaufenderTimer] = []
+        while True:
+            self._entferne_veraltete()
+            if not self._heap or self._heap[0][0] > jetzt:
+                break
+            _, timerId = heapq.heappop(self._heap)
+            timer = self._timer[timerId]
+            timer.alarm_gesendet = True
+            neu_faellig.append(timer)
+
+        if neu_faellig:
+            self.timerManager.eintraege_speichern(neu_faellig)
+        return neu_faellig
+
+    def sekunden_bis_zum_naechsten_ereignis(self) -> float | None:
+        """
+        Wartezeit, bis sich eine angezeigte Restzeit ändert oder ein Timer
+        fällig wird; None ohne laufende Timer.
+        """
+        jetzt = self.uhr()
+        wartezeiten = [
+            sekunden_bis_anzeigewechsel(timer.faellig_zeitstempel() - jetzt)
+            for timer in self._timer.values()
+            if timer.faellig_zeitstempel() > jetzt
+        ]
+        if wartezeiten:
+            return min(wartezeiten)
+        return None
+
+    def _entferne_veraltete(self) -> None:
+        while self._heap:
+            faellig, timerId = self._heap[0]
+            timer = self._timer.get(timerId)
+            if (
+                timer is not None
+                and not timer.alarm_gesendet
+                and timer.faellig_zeitstempel() == faellig
+            ):
+                return
+            heapq.heappop(self._heap)
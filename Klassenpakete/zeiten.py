@@ -20,7 +20,7 @@ def _to_float_or_none(value: Any) -> float | None:
         return None
 
 
-@dataclass
+@dataclass(slots=True)
 class ProzessSchritt:
     """
     Geplanter Prozessschritt im Rezept-Template.
@@ -49,7 +49,7 @@ class ProzessSchritt:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class BackProfilPhase:
     """
     Einzelne Backphase mit Temperatur und Dampf.
@@ -27,7 +27,7 @@ def _normalize_number(value: float) -> int | float:
     return round(float(value), 3)
 
 
-@dataclass
+@dataclass(slots=True)
 class Zusatz:
     """
     Zusatzzutat in Rezepten, z. B. Saaten, Oel oder Gewuerze.
@@ -0,0 +1,101 @@
+# Lade- und Speicherzeiten der JSON-Varianten für die Backhistorie als ein Dokument
+# (so groß wie früher daten/backvorgaenge.json).
+#
+# Vergleicht das bisherige Format (json, indent=4) mit dem kompakten Format,
+# jeweils mit der Standardbibliothek und (falls installiert) mit orjson,
+# bei 1-, 10- und 100-facher Größe der echten Datei.
+#
+# Aufruf aus dem Projektordner:
+#   python3 benchmarks/json_codec.py
+#   python3 benchmarks/json_codec.py --faktoren 1 10 --wiederholungen 3
+
+import argparse
+import json
+import statistics
+import tempfile
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+PROJEKT_PFAD = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJEKT_PFAD))
+
+from benchmarks.speicher_modelle import beispiel_backvorgaenge  # noqa: E402
+
+
+def vervielfache(dokument: dict[str, Any], faktor: int) -> dict[str, Any]:
+    vorlagen = dokument["items"]
+    eintraege = []
+    for runde in range(faktor):
+        for eintrag in vorlagen:
+            kopie = dict(eintrag)
+            kopie["id"] = f"{eintrag['id']}_{runde:03d}"
+            eintraege.append(kopie)
+    return {**dokument, "items": eintraege}
+
+
+def varianten() -> dict[str, tuple[Callable[[Any], bytes], Callable[[bytes], Any]]]:
+    ergebnis = {
+        "json lesbar": (
+            lambda wert: json.dumps(wert, indent=4, ensure_ascii=False).encode("utf-8"),
+            lambda daten: json.loads(daten.decode("utf-8")),
+        ),
+        "json kompakt": (
+            lambda wert: json.dumps(wert, ensure_ascii=False, separators=(",", ":")).encode(
+                "utf-8"
+            ),
+            lambda daten: json.loads(daten.decode("utf-8")),
+        ),
+    }
+    if orjson is not None:
+        ergebnis["orjson kompakt"] = (orjson.dumps, orjson.loads)
+    return ergebnis
+
+
+def messe(funktion: Callable[[], Any], wiederholungen: int) -> float:
+    zeiten = []
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        funktion()
+        zeiten.append(time.perf_counter() - start)
+    return statistics.median(zeiten)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--faktoren", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--wiederholungen", type=int, default=5)
+    argumente = parser.parse_args()
+
+    original = {"schema_version": 2, "items": beispiel_backvorgaenge()}
+
+    if orjson is None:
+        print("orjson nicht installiert, nur Standardbibliothek (pip install orjson)\n")
+
+    print(f"{'Faktor':>6} {'Variante':<15} {'Groesse':>10} {'Speichern':>11} {'Laden':>9}")
+    with tempfile.TemporaryDirectory() as ordner:
+        pfad = Path(ordner) / "backvorgaenge.json"
+        for faktor in argumente.faktoren:
+            dokument = vervielfache(original, faktor)
+            for name, (kodieren, dekodieren) in varianten().items():
+                speichern = messe(
+                    lambda: pfad.write_bytes(kodieren(dokument)), argumente.wiederholungen
+                )
+                laden = messe(
+                    lambda: dekodieren(pfad.read_bytes()), argumente.wiederholungen
+                )
+                groesse = pfad.stat().st_size / 1024 / 1024
+                print(
+                    f"{faktor:>5}x {name:<15} {groesse:>7.1f} MiB "
+                    f"{speichern * 1000:>8.1f} ms {laden * 1000:>6.1f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# Speicherbedarf der Domänenmodelle bei großer Backhistorie.
+#
+# Erzeugt eine synthetische Historie (Standard: 100.000 Backvorgänge) aus den
+# Beispieldaten der Backhistorie (daten/backvorgaenge/ bzw. früher
+# daten/backvorgaenge.json) und misst mit tracemalloc, wie viel
+# Speicher die vollständig aufgebauten Backvorgang-Objekte belegen.
+#
+# Aufruf aus dem Projektordner:
+#   python3 benchmarks/speicher_modelle.py
+#   python3 benchmarks/speicher_modelle.py --anzahl 20000
+#   python3 benchmarks/speicher_modelle.py --vergleich ../brot-backer-alt
+#
+# Mit --vergleich wird dieselbe Messung zusätzlich gegen einen anderen Checkout
+# (z. B. per "git worktree add ../brot-backer-alt <commit>") ausgeführt.
+
+import argparse
+import gc
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJEKT_PFAD = Path(__file__).resolve().parent.parent
+
+
+def beispiel_backvorgaenge() -> list[dict]:
+    # Direkt aus den Dateien, damit --vergleich nicht den Code dieses Checkouts lädt
+    datenOrdner = PROJEKT_PFAD / "daten"
+    dateien = sorted((datenOrdner / "backvorgaenge").glob("[0-9]*.json"))
+    if not dateien:
+        dateien = [datenOrdner / "backvorgaenge.json"]
+
+    eintraege = []
+    for pfad in dateien:
+        with pfad.open(encoding="utf-8") as datei:
+            dokument = json.load(datei)
+        eintraege.extend(dokument["items"] if isinstance(dokument, dict) else dokument)
+    return eintraege
+
+
+def synthetische_historie(anzahl: int) -> list[dict]:
+    vorlagen = beispiel_backvorgaenge()
+
+    historie = []
+    for index in range(anzahl):
+        eintrag = json.loads(json.dumps(vorlagen[index % len(vorlagen)]))
+        eintrag["id"] = f"bv_synth_{index:06d}"
+        historie.append(eintrag)
+    return historie
+
+
+def messe(codePfad: Path, anzahl: int) -> dict:
+    sys.path.insert(0, str(codePfad))
+    from Klassenpakete.backvorgang import Backvorgang
+
+    historie = synthetische_historie(anzahl)
+    gc.collect()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    objekte = [Backvorgang.from_dict(eintrag) for eintrag in historie]
+    dauer = time.perf_counter() - start
+    belegt, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "pfad": str(codePfad),
+        "anzahl": len(objekte),
+        "mib": round(belegt / 1024 / 1024, 1),
+        "bytes_je_backvorgang": belegt // max(1, len(objekte)),
+        "aufbau_s": round(dauer, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--anzahl", type=int, default=100_000)
+    parser.add_argument("--vergleich", type=Path, default=None)
+    parser.add_argument("--pfad", type=Path, default=PROJEKT_PFAD, help=argparse.SUPPRESS)
+    parser.add_argument("--json", action="store_true", help=argparse.SUPPRESS)
+    argumente = parser.parse_args()
+
+    if argumente.json:
+        print(json.dumps(messe(argumente.pfad, argumente.anzahl)))
+        return
+
+    pfade = [PROJEKT_PFAD]
+    if argumente.vergleich is not None:
+        pfade.append(argumente.vergleich.resolve())
+
+    # Jede Messung in einem eigenen Prozess, damit sich Importe nicht mischen
+    for pfad in pfade:
+        ausgabe = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--json",
+                "--anzahl",
+                str(argumente.anzahl),
+                "--pfad",
+                str(pfad),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        ergebnis = json.loads(ausgabe)
+        print(
+            f"{ergebnis['pfad']}: {ergebnis['anzahl']} Backvorgaenge, "
+            f"{ergebnis['mib']} MiB, {ergebnis['bytes_je_backvorgang']} Bytes/Backvorgang, "
+            f"Aufbau {ergebnis['aufbau_s']} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# Startzeit: Importdauer von main.py und der Kommandozeile mit Budgetprüfung.
+#
+# Startet für jedes Ziel einen frischen Interpreter mit "python3 -X importtime"
+# und wertet die kumulierte Importzeit des Zielmoduls aus (Median über mehrere
+# Läufe, der erste Lauf erzeugt nur die .pyc-Dateien und zählt nicht). Zusätzlich
+# wird geprüft, dass Module, die erst bei Bedarf geladen werden sollen (Untermenüs,
+# google.genai, rich-Panels), beim Start nicht importiert werden.
+# Rückgabewert 1, wenn ein Budget überschritten oder ein solches Modul geladen wurde.
+#
+# Aufruf aus dem Projektordner:
+#   python3 benchmarks/startzeit.py
+#   python3 benchmarks/startzeit.py --ziele main --budget-ms 300 --wiederholungen 9
+
+import argparse
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+PROJEKT_PFAD = Path(__file__).resolve().parent.parent
+
+
+@dataclass(slots=True)
+class Ziel:
+    modul: str
+    budget_ms: float
+    # Module (samt Untermodulen), die beim Import des Ziels nicht geladen sein dürfen
+    verboten: tuple[str, ...]
+
+
+ZIELE: dict[str, Ziel] = {
+    "main": Ziel(
+        modul="main",
+        budget_ms=150.0,
+        verboten=(
+            "google.genai",
+            "rich.panel",
+            "rich.prompt",
+            "Klassenpakete.backvorgang_menu",
+            "Klassenpakete.daten_menu",
+            "Klassenpakete.ki_assistent",
+            "Klassenpakete.mehle_menu",
+            "Klassenpakete.rezepte_menu",
+            "Klassenpakete.repository",
+        ),
+    ),
+    "kommandozeile": Ziel(
+        modul="Klassenpakete.kommandozeile",
+        budget_ms=120.0,
+        verboten=("google.genai", "readchar", "rich"),
+    ),
+}
+
+
+@dataclass(slots=True)
+class Messung:
+    gesamt_us: int
+    module: dict[str, int]  # Modul -> kumulierte Importzeit in µs
+    direkte: dict[str, int]  # direkt vom Ziel importierte Module
+
+
+def importiere(modul: str) -> Messung:
+    """
+    Ein Lauf von python3 -X importtime -c "import <modul>" im Projektordner.
+    Löst RuntimeError aus, wenn der Import fehlschlägt.
+    """
+    ergebnis = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modul}"],
+        cwd=PROJEKT_PFAD,
+        capture_output=True,
+        text=True,
+    )
+    if ergebnis.returncode != 0:
+        letzteZeile = ergebnis.stderr.strip().splitlines()[-1:] or ["?"]
+        raise RuntimeError(letzteZeile[0])
+
+    # Zeilen: "import time: <self> | <kumuliert> | <Einrückung><Modul>",
+    # Kinder stehen vor ihrem Elternmodul und sind um zwei Leerzeichen tiefer eingerückt
+    module: dict[str, int] = {}
+    zeilen: list[tuple[int, str, int]] = []
+    for zeile in ergebnis.stderr.splitlines():
+        if not zeile.startswith("import time:") or "[us]" in zeile:
+            continue
+        _, kumuliert, name = zeile[len("import time:") :].split("|")
+        tiefe = len(name) - len(name.lstrip(" "))
+        name = name.strip()
+        module[name] = int(kumuliert)
+        zeilen.append((tiefe, name, int(kumuliert)))
+
+    direkte: dict[str, int] = {}
+    for position, (tiefe, name, _) in enumerate(zeilen):
+        if name != modul:
+            continue
+        # Die direkt vorausgehenden, eine Ebene tieferen Zeilen sind die Kinder
+        for kindTiefe, kindName, kindZeit in reversed(zeilen[:position]):
+            if kindTiefe <= tiefe:
+                break
+            if kindTiefe == tiefe + 2:
+                direkte[kindName] = kindZeit
+        break
+
+    if modul not in module:
+        raise RuntimeError(f"{modul} nicht in der importtime-Ausgabe")
+    return Messung(gesamt_us=module[modul], module=module, direkte=direkte)
+
+
+def geladene_verbotene(messung: Messung, verboten: tuple[str, ...]) -> list[str]:
+    return sorted(
+        name
+        for name in messung.module
+        if any(name == praefix or name.startswith(praefix + ".") for praefix in verboten)
+    )
+
+
+def pruefe(name: str, ziel: Ziel, wiederholungen: int, anzeigen: int) -> bool:
+    print(f"{name} ({ziel.modul})")
+    try:
+        importiere(ziel.modul)  # .pyc erzeugen
+        messungen = [importiere(ziel.modul) for _ in range(wiederholungen)]
+    except RuntimeError as fehler:
+        print(f"  Import fehlgeschlagen: {fehler}\n")
+        return False
+
+    median_ms = statistics.median(m.gesamt_us for m in messungen) / 1000
+    letzte = messungen[-1]
+    for kind, zeit in sorted(letzte.direkte.items(), key=lambda e: -e[1])[:anzeigen]:
+        print(f"  {zeit / 1000:>8.1f} ms  {kind}")
+
+    in_ordnung = median_ms <= ziel.budget_ms
+    print(
+        f"  Gesamt {median_ms:.1f} ms (Median aus {wiederholungen}), "
+        f"Budget {ziel.budget_ms:.0f} ms: {'ok' if in_ordnung else 'UEBER BUDGET'}"
+    )
+
+    verbotene = geladene_verbotene(letzte, ziel.verboten)
+    if verbotene:
+        in_ordnung = False
+        print(f"  Beim Start geladen, obwohl erst bei Bedarf: {', '.join(verbotene)}")
+    print()
+    return in_ordnung
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ziele", nargs="+", choices=sorted(ZIELE), default=sorted(ZIELE))
+    parser.add_argument("--wiederholungen", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, help="Budget für alle Ziele überschreiben")
+    parser.add_argument("--anzeigen", type=int, default=8, help="langsamste direkte Importe")
+    argumente = parser.parse_args()
+
+    alle_ok = True
+    for name in argumente.ziele:
+        ziel = ZIELE[name]
+        if argumente.budget_ms is not None:
+            ziel.budget_ms = argumente.budget_ms
+        alle_ok &= pruefe(name, ziel, max(1, argumente.wiederholungen), argumente.anzeigen)
+    return 0 if alle_ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,34 @@
 # Einstiegspunkt des Brot-Backer-Programms.
 # Diese Datei verbindet Menü, Navigation und Programmfluss.
 # Hier befindet sich bewusst KEINE Fachlogik (Rezepte, Mehle, etc.).
+#
+# Die Untermenüs werden erst beim ersten Aufruf importiert (siehe UNTERMENUES),
+# damit der Start nicht auf rich-Panels, Repositories oder google.genai wartet.
+# benchmarks/startzeit.py misst die Importzeit und prüft das Budget.
+
+from importlib import import_module
 
 from Klassenpakete.liveRenderer import LiveRenderer
-from Klassenpakete.backvorgang_menu import BackvorgangMenu
-from Klassenpakete.daten_menu import DatenMenu
-from Klassenpakete.ki_assistent import KiAssistentMenu
-from Klassenpakete.mehle_menu import MehleMenu
-from Klassenpakete.rezepte_menu import RezepteMenu
 from Klassenpakete.menu import Menu
 from Klassenpakete.navigation import Navigation
 
+# Menüeintrag -> (Modul, Klasse) des Untermenüs
+UNTERMENUES: dict[str, tuple[str, str]] = {
+    "Backvorgang starten": ("Klassenpakete.backvorgang_menu", "BackvorgangMenu"),
+    "Rezepte verwalten": ("Klassenpakete.rezepte_menu", "RezepteMenu"),
+    "Mehle verwalten": ("Klassenpakete.mehle_menu", "MehleMenu"),
+    "Daten anzeigen": ("Klassenpakete.daten_menu", "DatenMenu"),
+    "KI fragen": ("Klassenpakete.ki_assistent", "KiAssistentMenu"),
+}
+
+
+def erzeuge_untermenue(menuePunkt: str):
+    """
+    Importiert das Modul des Untermenüs (beim ersten Mal) und erzeugt es.
+    """
+    modulName, klassenName = UNTERMENUES[menuePunkt]
+    return getattr(import_module(modulName), klassenName)()
+
 
 def main() -> None:
     """
@@ -19,19 +37,12 @@ def main() -> None:
     """
 
     # Definition der Menüeinträge
-    menuePunkte: list[str] = [
-        "Backvorgang starten",
-        "Rezepte verwalten",
-        "Mehle verwalten",
-        "Daten anzeigen",
-        "KI fragen",
-        "Beenden",
-    ]
+    menuePunkte: list[str] = [*UNTERMENUES, "Beenden"]
 
     # Menü- und Navigationsobjekte erstellen
     menu: Menu = Menu(menuePunkte=menuePunkte)
     navigation: Navigation = Navigation()
-    renderer = LiveRenderer()
+    renderer = LiveRenderer(navigation)
 
     programmLaeuft: bool = True
     renderer.start()
@@ -48,16 +59,10 @@ def main() -> None:
             if isinstance(auswahl, int):
                 ausgewaehlterPunkt = menuePunkte[auswahl]
 
-                if ausgewaehlterPunkt == "Backvorgang starten":
-                    menu.starte_untermenue(BackvorgangMenu(), navigation, renderer)
-                elif ausgewaehlterPunkt == "Rezepte verwalten":
-                    menu.starte_untermenue(RezepteMenu(), navigation, renderer)
-                elif ausgewaehlterPunkt == "Daten anzeigen":
-                    menu.starte_untermenue(DatenMenu(), navigation, renderer)
-                elif ausgewaehlterPunkt == "Mehle verwalten":
-                    menu.starte_untermenue(MehleMenu(), navigation, renderer)
-                elif ausgewaehlterPunkt == "KI fragen":
-                    menu.starte_untermenue(KiAssistentMenu(), navigation, renderer)
+                if ausgewaehlterPunkt in UNTERMENUES:
+                    menu.starte_untermenue(
+                        erzeuge_untermenue(ausgewaehlterPunkt), navigation, renderer
+                    )
                 elif ausgewaehlterPunkt == "Beenden":
                     programmLaeuft = False
     finally:
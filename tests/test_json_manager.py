@@ -0,0 +1,32 @@
+# Diese Datei enthält Tests für das atomare Schreiben des JsonManagers
+# (Klassenpakete/json_manager.py).
+
+import os
+import stat
+
+from Klassenpakete.json_manager import JsonManager
+from Klassenpakete.mehl import Mehl
+
+
+def _rechte(pfad) -> int:
+    return stat.S_IMODE(pfad.stat().st_mode)
+
+
+def test_neue_datei_bekommt_rechte_nach_umask(tmp_path):
+    umask = os.umask(0o022)
+    os.umask(umask)
+    pfad = tmp_path / "mehle.json"
+
+    JsonManager(str(pfad)).eintrag_speichern(Mehl("Roggen", "1150", "", None, mehlId="m1"))
+
+    assert _rechte(pfad) == 0o666 & ~umask
+
+
+def test_bestehende_rechte_bleiben_erhalten(tmp_path):
+    pfad = tmp_path / "mehle.json"
+    manager = JsonManager(str(pfad))
+    os.chmod(pfad, 0o640)
+
+    manager.eintrag_speichern(Mehl("Roggen", "1150", "", None, mehlId="m1"))
+
+    assert _rechte(pfad) == 0o640
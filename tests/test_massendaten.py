@@ -0,0 +1,78 @@
+# Diese Datei enthält Tests für den Massenimport und -export (Klassenpakete/massendaten.py).
+# Die Daten liegen in einem temporären Ordner, daten/ bleibt unberührt.
+
+import json
+
+import pytest
+
+from Klassenpakete import massendaten
+from Klassenpakete.backvorgang import Backvorgang
+from Klassenpakete.mehl import Mehl
+
+
+@pytest.fixture
+def backvorgaenge(tmp_path, monkeypatch):
+    monkeypatch.setenv("BROT_BACKER_SPEICHER", "json")
+    monkeypatch.setenv("BROT_BACKER_ARCHIV_TAGE", "aus")
+    art = massendaten.Datenart(str(tmp_path / "backvorgaenge.json"), Backvorgang, journal=True)
+    monkeypatch.setitem(massendaten.DATENARTEN, "backvorgaenge", art)
+    return art
+
+
+@pytest.fixture
+def mehle(tmp_path, monkeypatch):
+    monkeypatch.setenv("BROT_BACKER_SPEICHER", "json")
+    art = massendaten.Datenart(str(tmp_path / "mehle.json"), Mehl)
+    monkeypatch.setitem(massendaten.DATENARTEN, "mehle", art)
+    return art
+
+
+def _backvorgang(verbrauch: dict) -> dict:
+    return {
+        "id": "bv_2024_06_26_001",
+        "recipe_id": "brot_buchweizen_sauerteig",
+        "status": "completed",
+        "planned_bake_date": "2024-06-26",
+        "ingredient_usage": [verbrauch],
+        "created_at": "2024-06-26T12:00:00+02:00",
+        "updated_at": "2024-06-26T12:00:00+02:00",
+    }
+
+
+def test_import_migriert_ingredient_id_aus_version_1(backvorgaenge, tmp_path):
+    quelle = tmp_path / "alt.jsonl"
+    zeile = _backvorgang({"ingredient_id": "mehl_roggen_1150", "planned_g": 500})
+    quelle.write_text(json.dumps(zeile) + "\n", encoding="utf-8")
+
+    ergebnis = massendaten.importieren("backvorgaenge", quelle)
+
+    assert (ergebnis.neu, ergebnis.fehlerhaft) == (1, 0)
+    (backvorgang,) = backvorgaenge.manager().laden(Backvorgang)
+    verbrauch = backvorgang.ingredient_usage[0]
+    assert verbrauch.mehl_id == "mehl_roggen_1150"
+    assert not verbrauch.extra_fields
+
+
+def test_import_laesst_aktuelle_zeilen_unveraendert(backvorgaenge, tmp_path):
+    quelle = tmp_path / "neu.jsonl"
+    zeile = _backvorgang({"mehl_id": "mehl_weizen_550", "planned_g": 300})
+    quelle.write_text(json.dumps(zeile) + "\n", encoding="utf-8")
+
+    massendaten.importieren("backvorgaenge", quelle)
+
+    (backvorgang,) = backvorgaenge.manager().laden(Backvorgang)
+    assert backvorgang.ingredient_usage[0].mehl_id == "mehl_weizen_550"
+
+
+def test_csv_texte_behalten_ihren_typ(mehle, tmp_path):
+    mehl = Mehl("Roggen", "1150", "null", '"70"', vorhanden=True, vorhandenGramm=250, mehlId="m1")
+    mehle.manager().eintraege_speichern([mehl])
+    datei = tmp_path / "mehle.csv"
+    massendaten.exportieren("mehle", datei)
+    mehle.manager().speichern([])
+
+    ergebnis = massendaten.importieren("mehle", datei)
+
+    assert (ergebnis.neu, ergebnis.fehlerhaft) == (1, 0)
+    (geladen,) = mehle.manager().laden(Mehl)
+    assert geladen.to_dict() == mehl.to_dict()
@@ -0,0 +1,28 @@
+# Diese Datei enthält Tests für die Repository-Schicht (Klassenpakete/repository.py),
+# insbesondere die eintragsweise gespeicherte Backhistorie.
+
+from Klassenpakete.backvorgang import Backvorgang
+from Klassenpakete.json_manager import JsonManager
+from Klassenpakete.repository import BackvorgangRepository
+
+
+def _backvorgang(backvorgangId: str, status: str) -> Backvorgang:
+    return Backvorgang.from_dict(
+        {"id": backvorgangId, "recipe_id": "brot_roggen_001", "status": status}
+    )
+
+
+def test_upsert_zieht_geladene_objekte_und_indizes_nach(tmp_path):
+    repository = BackvorgangRepository(
+        JsonManager(str(tmp_path / "backvorgaenge.json"), journal=True), Backvorgang
+    )
+    repository.upsert(_backvorgang("bv_2024_06_01_001", "running"))
+    (laufend,) = repository.finde("status", "running")
+
+    laufend.status = "completed"
+    repository.upsert(laufend)
+    repository.upsert(_backvorgang("bv_2024_06_01_002", "running"))
+
+    assert repository.get("bv_2024_06_01_001") is laufend
+    assert repository.finde("status", "completed") == [laufend]
+    assert [b.id for b in repository.finde("status", "running")] == ["bv_2024_06_01_002"]
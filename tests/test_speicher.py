@@ -0,0 +1,73 @@
+# Diese Datei enthält Tests für die Wahl der JSON-Ablage der Backhistorie
+# (Klassenpakete/speicher.py), insbesondere die ausdrückliche Aufteilung nach Monaten.
+
+import pytest
+
+from Klassenpakete import speicher
+from Klassenpakete.backvorgang import Backvorgang
+from Klassenpakete.json_manager import JsonManager
+from Klassenpakete.shard_manager import ShardManager
+
+
+@pytest.fixture
+def einzeldatei(tmp_path, monkeypatch):
+    monkeypatch.setenv("BROT_BACKER_ARCHIV_TAGE", "aus")
+    pfad = tmp_path / "backvorgaenge.json"
+    JsonManager(str(pfad), journal=True).eintraege_speichern(
+        [
+            Backvorgang.from_dict(
+                {
+                    "id": f"bv_2024_0{monat}_01_00{nummer}",
+                    "recipe_id": "brot_roggen_001",
+                    "status": status,
+                    "created_at": f"2024-0{monat}-01T08:00:00+02:00",
+                }
+            )
+            for monat, nummer, status in (
+                (6, 1, "completed"),
+                (7, 1, "completed"),
+                (7, 2, "running"),
+            )
+        ]
+    )
+    return pfad
+
+
+def test_ablage_bleibt_bis_zur_aufteilung_eine_datei(einzeldatei, tmp_path):
+    ablage = speicher.json_ablage(str(einzeldatei), journal=True)
+
+    assert isinstance(ablage, JsonManager)
+    assert len(ablage.laden(Backvorgang)) == 3
+    assert not (tmp_path / "backvorgaenge").exists()
+
+
+def test_aufteilen_verteilt_nach_monaten(einzeldatei, tmp_path):
+    assert speicher.backhistorie_aufteilen(str(einzeldatei)) == 3
+
+    assert not einzeldatei.exists()
+    assert (tmp_path / "backvorgaenge.json.vor_aufteilung").exists()
+    ablage = speicher.json_ablage(str(einzeldatei), journal=True)
+    assert isinstance(ablage, ShardManager)
+    assert sorted(eintrag.shard for eintrag in ablage.uebersicht()) == [
+        "2024-06",
+        "2024-07",
+        "2024-07",
+    ]
+    assert ablage.get(Backvorgang, "bv_2024_07_01_001") is not None
+    assert speicher.backhistorie_aufteilen(str(einzeldatei)) == 0
+
+
+def test_archiv_nur_auf_aufruf_und_ohne_leere_shards(einzeldatei, tmp_path):
+    speicher.backhistorie_aufteilen(str(einzeldatei))
+    ablage = speicher.json_ablage(str(einzeldatei), journal=True)
+    assert not (tmp_path / "backvorgaenge" / "archiv").exists()
+
+    assert speicher.backhistorie_archivieren(30, str(einzeldatei)) == 2
+
+    ordner = tmp_path / "backvorgaenge"
+    assert not (ordner / "2024-06.json").exists()
+    assert (ordner / "archiv" / "2024-06.json.gz").exists()
+    assert [backvorgang.id for backvorgang in ablage.laden(Backvorgang)] == ["bv_2024_07_01_002"]
+    assert len(ablage.laden(Backvorgang, mitArchiv=True)) == 3
+    assert ablage.anzahl_eintraege() == 1
+    assert ablage.get(Backvorgang, "bv_2024_06_01_001") is not None
@@ -0,0 +1,50 @@
+# Diese Datei enthält Tests für den Zeitplaner (Klassenpakete/timer_planer.py) mit
+# unlesbaren Zeitpunkten in daten/timer.json oder in gestarteten Schritten.
+
+import pytest
+
+from Klassenpakete.backvorgang import Backvorgang
+from Klassenpakete.json_manager import JsonManager
+from Klassenpakete.timer_planer import LaufenderTimer, TimerPlaner
+
+
+@pytest.fixture
+def timerManager(tmp_path):
+    return JsonManager(str(tmp_path / "timer.json"), journal=True)
+
+
+def _backvorgang(startzeit: str) -> Backvorgang:
+    return Backvorgang.from_dict(
+        {
+            "id": "bv_2024_06_26_001",
+            "recipe_id": "brot_buchweizen_sauerteig",
+            "status": "running",
+            "step_runs": [
+                {"key": "stockgare", "planned_duration_min": 90, "actual_start_at": startzeit}
+            ],
+        }
+    )
+
+
+def test_ungueltige_faelligkeit_wird_beim_laden_uebersprungen(timerManager):
+    kaputt = LaufenderTimer("a:x", "a", "x", "A", "2024-06-26T10:00:00+02:00", "gestern")
+    gueltig = LaufenderTimer(
+        "b:y", "b", "y", "B", "2024-06-26T10:00:00+02:00", "2024-06-26T11:00:00+02:00"
+    )
+    timerManager.eintraege_speichern([kaputt, gueltig])
+
+    planer = TimerPlaner(timerManager, uhr=lambda: 0.0)
+
+    assert [timer.id for timer in planer.alle()] == ["b:y"]
+    assert planer.naechster().id == "b:y"
+
+
+def test_abgleichen_ueberspringt_ungueltigen_start(timerManager):
+    planer = TimerPlaner(timerManager, uhr=lambda: 0.0)
+
+    planer.abgleichen([_backvorgang("kein Zeitpunkt")])
+    assert planer.alle() == []
+
+    planer.abgleichen([_backvorgang("2024-06-26T10:00:00+02:00")])
+    (timer,) = planer.alle()
+    assert timer.faellig_um == "2024-06-26T11:30:00+02:00"